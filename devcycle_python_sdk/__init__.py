@@ -4,3 +4,5 @@ from devcycle_python_sdk.options import DevCycleCloudOptions, DevCycleLocalOptio
 from devcycle_python_sdk.devcycle_client import AbstractDevCycleClient
 from devcycle_python_sdk.cloud_client import DevCycleCloudClient
 from devcycle_python_sdk.local_client import DevCycleLocalClient
+from devcycle_python_sdk.async_cloud_client import DevCycleAsyncCloudClient
+from devcycle_python_sdk.async_local_client import DevCycleAsyncLocalClient
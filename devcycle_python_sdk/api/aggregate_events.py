@@ -0,0 +1,148 @@
+import json
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from devcycle_python_sdk.models.eval_reason import EvalReasons
+
+
+def _timestamp() -> str:
+    # The date format used by the WASM event queue
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")[:-6] + "Z"
+
+
+# The aggregate event type, variable key, feature ID and variation ID that an aggregate event counts
+_EventKey = Tuple[str, str, Optional[str], Optional[str]]
+# An aggregate event's key and the evaluation reason, as each event counts its evaluations by reason
+_CountKey = Tuple[str, str, Optional[str], Optional[str], str]
+
+
+class AggregateVariableEvents:
+    """
+    Counts variable evaluations that are answered without calling the WASM module, and exports the counts as
+    aggVariableEvaluated and aggVariableDefaulted events like the ones the WASM event queue creates. Each
+    export is a payload with its own ID, so it goes through the same publish, retry and spool handling as the
+    WASM payloads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[_CountKey, int] = {}
+        # Counts in payloads that have been exported but not yet reported as sent, by payload ID
+        self._in_flight: Dict[str, Dict[_CountKey, int]] = {}
+        self._client_uuid: Optional[str] = None
+        self._platform_data: Dict[str, Any] = {}
+        self._enabled = False
+
+    def init(self, client_uuid: str, options_json: str) -> None:
+        options = json.loads(options_json)
+        self._client_uuid = client_uuid
+        self._enabled = not options.get("disableAutomaticEventLogging", False)
+
+    def set_platform_data(self, platform_json: str) -> None:
+        self._platform_data = json.loads(platform_json)
+
+    def record_defaulted(self, key: str) -> None:
+        self._record(("aggVariableDefaulted", key, None, None, EvalReasons.DEFAULT))
+
+    def record_evaluated(
+        self,
+        key: str,
+        feature_id: str,
+        variation_id: str,
+        eval_reason: str = EvalReasons.TARGETING_MATCH,
+    ) -> None:
+        self._record(
+            ("aggVariableEvaluated", key, feature_id, variation_id, eval_reason)
+        )
+
+    def _record(self, count_key: _CountKey) -> None:
+        if not self._enabled:
+            return
+        with self._lock:
+            self._counts[count_key] = self._counts.get(count_key, 0) + 1
+
+    def size(self) -> int:
+        """
+        Returns the number of events waiting to be exported
+        """
+        return len(self._counts)
+
+    def take_payload(self) -> Optional[Tuple[str, str, int]]:
+        """
+        Returns the payload ID, the JSON record and the event count of a payload with the counts recorded
+        since the last one, or None if there are none
+        """
+        with self._lock:
+            if not self._counts:
+                return None
+            counts = self._counts
+            self._counts = {}
+            payload_id = str(uuid.uuid4())
+            self._in_flight[payload_id] = counts
+
+        record = self._record_json(counts)
+        return payload_id, json.dumps(record), len(record["events"])
+
+    def on_payload_success(self, payload_id: str) -> bool:
+        """
+        Returns true if the payload was one of ours
+        """
+        with self._lock:
+            return self._in_flight.pop(payload_id, None) is not None
+
+    def on_payload_failure(self, payload_id: str, retryable: bool) -> bool:
+        """
+        Returns true if the payload was one of ours. The counts of a retryable payload are added back, so they
+        are sent with the next payload.
+        """
+        with self._lock:
+            counts = self._in_flight.pop(payload_id, None)
+            if counts is None:
+                return False
+            if retryable:
+                for count_key, count in counts.items():
+                    self._counts[count_key] = self._counts.get(count_key, 0) + count
+            return True
+
+    def _record_json(self, counts: Dict[_CountKey, int]) -> Dict[str, Any]:
+        # Aggregate events are sent for a user representing this SDK instance, the same as the WASM module does
+        now = _timestamp()
+        user_id = f"{self._client_uuid}@{self._platform_data.get('hostname')}"
+        user = {"user_id": user_id, "createdDate": now, "lastSeenDate": now}
+        user.update(
+            {
+                key: value
+                for key, value in self._platform_data.items()
+                if key != "deviceModel"
+            }
+        )
+        events: Dict[_EventKey, Dict[str, Any]] = {}
+        for count_key, count in counts.items():
+            event_type, key, feature_id, variation_id, reason = count_key
+            event_key = (event_type, key, feature_id, variation_id)
+            event = events.get(event_key)
+            if event is None:
+                if event_type == "aggVariableEvaluated":
+                    metadata: Dict[str, Any] = {
+                        "eval": {},
+                        "_feature": feature_id,
+                        "_variation": variation_id,
+                    }
+                else:
+                    metadata = {"_variation": "DEFAULT", "eval": {}}
+                event = events[event_key] = {
+                    "type": event_type,
+                    "target": key,
+                    "user_id": user_id,
+                    "date": now,
+                    "clientDate": now,
+                    "value": 0,
+                    "featureVars": {},
+                    "metaData": metadata,
+                }
+            # Each event counts the variable's evaluations with its variation, split by evaluation reason
+            event["value"] += count
+            event["metaData"]["eval"][reason] = count
+        return {"user": user, "events": list(events.values())}
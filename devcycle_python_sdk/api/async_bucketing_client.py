@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from devcycle_python_sdk.api.backoff import exponential_backoff
+from devcycle_python_sdk.api.bucketing_client import (
+    _check_response_status,
+    _parse_features,
+    _parse_variable,
+    _parse_variables,
+    _query_params,
+    _track_payload,
+)
+from devcycle_python_sdk.api.http_session import http2_available
+from devcycle_python_sdk.options import DevCycleCloudOptions
+from devcycle_python_sdk.exceptions import CloudClientError
+from devcycle_python_sdk.models.event import DevCycleEvent
+from devcycle_python_sdk.models.feature import Feature
+from devcycle_python_sdk.models.user import DevCycleUser
+from devcycle_python_sdk.models.variable import Variable
+from devcycle_python_sdk.util.strings import slash_join
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBucketingAPIClient:
+    """
+    An asyncio version of BucketingAPIClient. Requests share a pooled httpx.AsyncClient, so the client should be
+    used from a single event loop.
+    """
+
+    def __init__(self, sdk_key: str, options: DevCycleCloudOptions):
+        if httpx is None:
+            raise ImportError(
+                "DevCycle: The async cloud client requires the 'httpx' package, install it with devcycle-python-server-sdk[async]"
+            )
+
+        self.sdk_key = sdk_key
+        self.options = options
+        self.session = httpx.AsyncClient(
+            headers={
+                "Authorization": sdk_key,
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+            timeout=options.request_timeout,
+            follow_redirects=False,
+            http2=options.enable_http2 and http2_available(),
+        )
+
+    def _url(self, *path_args: str) -> str:
+        return slash_join(self.options.bucketing_api_uri, "v1", *path_args)
+
+    async def request(self, method: str, url: str, **kwargs) -> dict:
+        """
+        Sends a request to the Bucketing API, retrying server errors. If request_deadline_ms is set, the request
+        and its retries are cancelled once it has passed.
+        """
+        if self.options.request_deadline_ms is None:
+            return await self._send_request(method, url, **kwargs)
+
+        try:
+            return await asyncio.wait_for(
+                self._send_request(method, url, **kwargs),
+                self.options.request_deadline_ms / 1000.0,
+            )
+        except asyncio.TimeoutError as e:
+            raise CloudClientError(message="Request deadline exceeded", cause=e)
+
+    async def _send_request(self, method: str, url: str, **kwargs) -> dict:
+        retries_remaining = self.options.request_retries + 1
+        query_params = _query_params(self.options)
+
+        attempts = 1
+        while retries_remaining > 0:
+            request_error: Optional[Exception] = None
+            try:
+                res = await self.session.request(
+                    method, url, params=query_params, **kwargs
+                )
+                request_error = _check_response_status(res.status_code, url)
+            except httpx.HTTPError as e:
+                request_error = e
+
+            if not request_error:
+                break
+
+            logger.debug(
+                f"DevCycle cloud bucketing request failed (attempt {attempts}): {request_error}"
+            )
+            retries_remaining -= 1
+            if retries_remaining:
+                retry_delay = exponential_backoff(
+                    attempts, self.options.retry_delay / 1000.0
+                )
+                await asyncio.sleep(retry_delay)
+                attempts += 1
+                continue
+
+            raise CloudClientError(message="Retries exceeded", cause=request_error)
+
+        data: dict = res.json()
+        return data
+
+    async def variable(self, key: str, user: DevCycleUser) -> Variable:
+        data = await self.request(
+            "POST", self._url("variables", key), json=user.to_json()
+        )
+        return _parse_variable(data)
+
+    async def variables(self, user: DevCycleUser) -> Dict[str, Variable]:
+        data = await self.request("POST", self._url("variables"), json=user.to_json())
+        return _parse_variables(data)
+
+    async def features(self, user: DevCycleUser) -> Dict[str, Feature]:
+        data = await self.request("POST", self._url("features"), json=user.to_json())
+        return _parse_features(data)
+
+    async def track(self, user: DevCycleUser, events: List[DevCycleEvent]) -> str:
+        data = await self.request(
+            "POST", self._url("track"), json=_track_payload(user, events)
+        )
+        message = data.get("message", "")
+        return message
+
+    async def close(self) -> None:
+        await self.session.aclose()
@@ -1,12 +1,23 @@
+import copy
+import json
 import logging
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
 from devcycle_python_sdk.api.backoff import exponential_backoff
+from devcycle_python_sdk.api.circuit_breaker import CircuitBreaker
+from devcycle_python_sdk.api.hedging import LatencyTracker
+from devcycle_python_sdk.api.http_session import create_session, prewarm_in_background
+from devcycle_python_sdk.metrics import Counter, MetricsRegistry
 from devcycle_python_sdk.options import DevCycleCloudOptions
+from devcycle_python_sdk.managers.response_cache import ResponseCache
 from devcycle_python_sdk.exceptions import (
+    CircuitOpenError,
+    CloudClientBadRequestError,
     CloudClientError,
     NotFoundError,
     CloudClientUnauthorizedError,
@@ -20,58 +31,196 @@ from devcycle_python_sdk.util.strings import slash_join
 
 logger = logging.getLogger(__name__)
 
+# Response cache entry keys
+_ALL_VARIABLES = "variables"
+_ALL_FEATURES = "features"
+_VARIABLE_PREFIX = "variable:"
+
+# User the circuit breaker's probe requests variables for
+_PROBE_USER = {"user_id": "devcycle-circuit-breaker-probe"}
+
+# Threads sending hedged requests, which bounds the concurrent hedged requests. Each hedge holds a thread from
+# before its delay starts, and no hedge is sent while they are all busy, so hedges are never queued.
+_HEDGE_WORKERS = 32
+
 
 class BucketingAPIClient:
-    def __init__(self, sdk_key: str, options: DevCycleCloudOptions):
+    def __init__(
+        self,
+        sdk_key: str,
+        options: DevCycleCloudOptions,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
         self.sdk_key = sdk_key
         self.options = options
-        self.session = requests.Session()
-        self.session.headers = {
-            "Authorization": sdk_key,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-        self.session.max_redirects = 0
+        self.session = create_session(
+            options,
+            {
+                "Authorization": sdk_key,
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+            http2=options.enable_http2,
+        )
+        if options.http_prewarm_connections:
+            prewarm_in_background(
+                self.session,
+                options.bucketing_api_uri,
+                options.http_prewarm_connections,
+                options.request_timeout,
+            )
+
+        self._in_flight: Dict[Tuple[str, str, str], _InFlightRequest] = {}
+        self._in_flight_lock = threading.Lock()
+        self.coalesced_request_count = 0
+        self._coalesced_counter: Optional[Counter] = None
+        if metrics is not None and options.enable_request_coalescing:
+            self._coalesced_counter = metrics.counter(
+                "devcycle_bucketing_requests_coalesced",
+                "Bucketing API requests that shared the response of an identical request in flight",
+            )
+
+        self._cache: Optional[ResponseCache] = None
+        if options.enable_response_cache:
+            self._cache = ResponseCache(
+                options.response_cache_ttl_ms,
+                options.response_cache_stale_ms,
+                options.response_cache_max_users,
+                metrics,
+            )
+
+        self._breaker: Optional[CircuitBreaker] = None
+        if options.enable_circuit_breaker:
+            self._breaker = CircuitBreaker(
+                options.circuit_breaker_failure_threshold,
+                options.circuit_breaker_reset_timeout_ms,
+                options.circuit_breaker_max_fallback_entries,
+                self._probe,
+                metrics,
+            )
+
+        self._latency: Optional[LatencyTracker] = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+        self._hedge_slots = threading.BoundedSemaphore(_HEDGE_WORKERS)
+        self.hedged_request_count = 0
+        self.hedge_win_count = 0
+        self._hedged_counter: Optional[Counter] = None
+        self._hedge_win_counter: Optional[Counter] = None
+        if options.enable_request_hedging:
+            if metrics is not None:
+                self._hedged_counter = metrics.counter(
+                    "devcycle_bucketing_requests_hedged",
+                    "Bucketing API requests sent a second time because the first was slow",
+                )
+                self._hedge_win_counter = metrics.counter(
+                    "devcycle_bucketing_hedge_wins",
+                    "Hedged Bucketing API requests answered by the second request",
+                )
+            self._latency = LatencyTracker(options.request_hedging_percentile)
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=_HEDGE_WORKERS, thread_name_prefix="devcycle-hedge"
+            )
 
     def _url(self, *path_args: str) -> str:
         return slash_join(self.options.bucketing_api_uri, "v1", *path_args)
 
-    def request(self, method: str, url: str, **kwargs) -> dict:
+    def request(self, method: str, url: str, coalesce: bool = False, **kwargs) -> dict:
+        """
+        Sends a request to the Bucketing API, retrying server errors.
+
+        If coalesce is set and request coalescing is enabled, a request that is identical to one already in
+        flight waits for that request and shares its response instead of being sent again. coalesce should only be
+        set for requests that read data, as they are also the only requests guarded by the circuit breaker, falling
+        back to their last successful response while it is open. Track requests are always sent, so events aren't
+        rejected while the circuit is open.
+        """
+        if not (coalesce and self.options.enable_request_coalescing):
+            return self._guarded_request(method, url, coalesce, **kwargs)
+
+        key = (method, url, _request_body_key(kwargs.get("json")))
+        with self._in_flight_lock:
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                self.coalesced_request_count += 1
+            else:
+                leader = self._in_flight[key] = _InFlightRequest()
+
+        if in_flight is not None:
+            if self._coalesced_counter is not None:
+                self._coalesced_counter.inc()
+            return in_flight.wait()
+
+        try:
+            leader.result = self._guarded_request(method, url, coalesce, **kwargs)
+            return leader.result
+        except Exception as e:
+            leader.error = e
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+            leader.done.set()
+
+    def _guarded_request(self, method: str, url: str, read: bool, **kwargs) -> dict:
+        if self._breaker is None or not read:
+            return self._send_request(method, url, read, **kwargs)
+
+        key = (method, url, _request_body_key(kwargs.get("json")))
+        try:
+            if not self._breaker.allow_request():
+                raise CircuitOpenError("Circuit breaker is open")
+            data = self._send_request(method, url, True, **kwargs)
+        except CircuitOpenError:
+            fallback = self._breaker.fallback(key)
+            if fallback is None:
+                raise
+            return fallback
+
+        self._breaker.store(key, data)
+        return data
+
+    def _send_request(self, method: str, url: str, read: bool, **kwargs) -> dict:
+        """
+        Sends a request, retrying server errors. If request_deadline_ms is set, attempt timeouts are shortened and
+        no retry is started that would end after the deadline. Attempts at requests that read data are recorded by
+        the circuit breaker, and may be hedged.
+        """
+        breaker = self._breaker if read else None
         retries_remaining = self.options.request_retries + 1
-        timeout = self.options.request_timeout
+        deadline = None
+        if self.options.request_deadline_ms is not None:
+            deadline = time.monotonic() + self.options.request_deadline_ms / 1000.0
 
-        query_params = {}
-        if self.options.enable_edge_db:
-            query_params["enableEdgeDB"] = "true"
+        query_params = _query_params(self.options)
 
         attempts = 1
         while retries_remaining > 0:
+            timeout: float = self.options.request_timeout
+            if deadline is not None:
+                # Retries only start before the deadline, but sleeping can overshoot it slightly
+                timeout = min(timeout, max(deadline - time.monotonic(), 0.001))
+
             request_error: Optional[Exception] = None
             try:
-                res: requests.Response = self.session.request(
-                    method, url, params=query_params, timeout=timeout, **kwargs
+                res: requests.Response = self._attempt(
+                    method, url, read, params=query_params, timeout=timeout, **kwargs
                 )
-
-                if res.status_code == 401:
-                    # Not a retryable error
-                    raise CloudClientUnauthorizedError("Invalid SDK Key")
-                elif res.status_code == 404:
-                    # Not a retryable error
-                    raise NotFoundError(url)
-                elif 400 <= res.status_code < 500:
-                    # Not a retryable error
-                    raise CloudClientError(f"Bad request: HTTP {res.status_code}")
-                elif res.status_code >= 500:
-                    # Retryable error
-                    request_error = CloudClientError(
-                        f"Server error: HTTP {res.status_code}"
-                    )
             except requests.exceptions.RequestException as e:
                 request_error = e
+            else:
+                if breaker is not None and res.status_code < 500:
+                    # Client errors still show the service is up
+                    breaker.record_success()
+                request_error = _check_response_status(res.status_code, url)
 
             if not request_error:
                 break
 
+            if breaker is not None and breaker.record_failure():
+                # Stop retrying as soon as the circuit opens
+                raise CircuitOpenError("Circuit breaker is open", cause=request_error)
+
             logger.debug(
                 f"DevCycle cloud bucketing request failed (attempt {attempts}): {request_error}"
             )
@@ -80,6 +229,10 @@ class BucketingAPIClient:
                 retry_delay = exponential_backoff(
                     attempts, self.options.retry_delay / 1000.0
                 )
+                if deadline is not None and time.monotonic() + retry_delay >= deadline:
+                    raise CloudClientError(
+                        message="Request deadline exceeded", cause=request_error
+                    )
                 time.sleep(retry_delay)
                 attempts += 1
                 continue
@@ -89,69 +242,345 @@ class BucketingAPIClient:
         data: dict = res.json()
         return data
 
+    def _attempt(
+        self, method: str, url: str, read: bool, **kwargs
+    ) -> requests.Response:
+        # Only requests that read data are safe to send twice
+        if self._latency is None or not read:
+            return self.session.request(method, url, **kwargs)
+
+        start = time.monotonic()
+        hedge_delay = self._latency.value()
+        if hedge_delay is None or hedge_delay >= kwargs["timeout"]:
+            res = self.session.request(method, url, **kwargs)
+        else:
+            res = self._hedged_attempt(hedge_delay, method, url, **kwargs)
+        if res.status_code < 500:
+            self._latency.record(time.monotonic() - start)
+        return res
+
+    def _hedged_attempt(
+        self, hedge_delay: float, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """
+        Sends a request on the calling thread, and sends it again from the hedge executor if there is no response
+        after hedge_delay. If the first request fails with a server or connection error, the hedge's response is
+        used instead. No hedge is sent while _HEDGE_WORKERS hedges are already pending.
+        """
+        assert self._hedge_executor is not None
+        if not self._hedge_slots.acquire(blocking=False):
+            return self.session.request(method, url, **kwargs)
+        hedge = _Hedge()
+        try:
+            self._hedge_executor.submit(
+                self._send_hedge, hedge, hedge_delay, method, url, kwargs
+            )
+        except RuntimeError:
+            # The client was closed
+            self._hedge_slots.release()
+            return self.session.request(method, url, **kwargs)
+
+        try:
+            res = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            if not hedge.primary_done():
+                raise
+            hedge_res = hedge.wait()
+            if hedge_res is None:
+                raise
+            self._record_hedge_win()
+            return hedge_res
+
+        if not hedge.primary_done() or res.status_code < 500:
+            return res
+        hedge_res = hedge.wait()
+        if hedge_res is None or hedge_res.status_code >= 500:
+            return res
+        self._record_hedge_win()
+        return hedge_res
+
+    def _send_hedge(
+        self, hedge: "_Hedge", hedge_delay: float, method: str, url: str, kwargs: dict
+    ) -> None:
+        try:
+            if not hedge.start(hedge_delay):
+                return
+            with self._hedge_lock:
+                self.hedged_request_count += 1
+            if self._hedged_counter is not None:
+                self._hedged_counter.inc()
+            try:
+                hedge.response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                logger.debug(f"DevCycle: Hedged Bucketing API request failed: {e}")
+            finally:
+                hedge.done.set()
+        finally:
+            self._hedge_slots.release()
+
+    def _record_hedge_win(self) -> None:
+        with self._hedge_lock:
+            self.hedge_win_count += 1
+        if self._hedge_win_counter is not None:
+            self._hedge_win_counter.inc()
+
+    def _probe(self) -> None:
+        # A single variables request for a placeholder user, to test whether the service has recovered. It only
+        # reads data, so the probe never repeats a request that has side effects.
+        res = self.session.request(
+            "POST",
+            self._url("variables"),
+            params=_query_params(self.options),
+            timeout=self.options.request_timeout,
+            json=_PROBE_USER,
+        )
+        if res.status_code >= 500:
+            raise CloudClientError(f"Server error: HTTP {res.status_code}")
+
     def variable(self, key: str, user: DevCycleUser) -> Variable:
-        data = self.request("POST", self._url("variables", key), json=user.to_json())
-
-        eval_data = data.get("eval")
-        eval_reason = None
-        if eval_data is not None and isinstance(eval_data, dict):
-            eval_reason = EvalReason.from_json(eval_data)
-
-        return Variable(
-            _id=data.get("_id"),
-            key=data.get("key", ""),
-            type=data.get("type", ""),
-            value=data.get("value"),
-            eval=eval_reason,
+        user_json = user.to_json()
+        if self._cache is None:
+            return self._fetch_variable(key, user_json)
+
+        fingerprint = _request_body_key(user_json)
+        # A fresh all variables response for the user already answers the request
+        cached, variable = self._cache.get_fresh_item(fingerprint, _ALL_VARIABLES, key)
+        if cached:
+            if variable is None:
+                raise NotFoundError(self._url("variables", key))
+            return variable
+
+        return self._cache.get_or_fetch(
+            fingerprint,
+            _VARIABLE_PREFIX + key,
+            lambda: self._fetch_variable(key, user_json),
         )
 
     def variables(self, user: DevCycleUser) -> Dict[str, Variable]:
-        data = self.request("POST", self._url("variables"), json=user.to_json())
-
-        result: Dict[str, Variable] = {}
-        for key, value in data.items():
-            result[key] = Variable(
-                _id=str(value.get("_id")),
-                key=str(value.get("key")),
-                type=str(value.get("type")),
-                value=value.get("value"),
-                isDefaulted=None,
-                eval=(
-                    EvalReason.from_json(value.get("eval"))
-                    if value.get("eval")
-                    else None
-                ),
-            )
+        user_json = user.to_json()
+        if self._cache is None:
+            return self._fetch_variables(user_json)
 
-        return result
+        return self._cache.get_or_fetch(
+            _request_body_key(user_json),
+            _ALL_VARIABLES,
+            lambda: self._fetch_variables(user_json),
+        )
 
     def features(self, user: DevCycleUser) -> Dict[str, Feature]:
-        data = self.request("POST", self._url("features"), json=user.to_json())
-
-        result: Dict[str, Feature] = {}
-        for key, value in data.items():
-            result[key] = Feature(
-                _id=value.get("_id"),
-                key=value.get("key"),
-                type=value.get("type"),
-                _variation=value.get("_variation"),
-                variationKey=value.get("variationKey"),
-                variationName=value.get("variationName"),
-                evalReason=value.get("evalReason"),
-            )
+        user_json = user.to_json()
+        if self._cache is None:
+            return self._fetch_features(user_json)
 
-        return result
+        return self._cache.get_or_fetch(
+            _request_body_key(user_json),
+            _ALL_FEATURES,
+            lambda: self._fetch_features(user_json),
+        )
+
+    def _fetch_variable(self, key: str, user_json: dict) -> Variable:
+        data = self.request(
+            "POST", self._url("variables", key), coalesce=True, json=user_json
+        )
+        return _parse_variable(data)
+
+    def _fetch_variables(self, user_json: dict) -> Dict[str, Variable]:
+        data = self.request(
+            "POST", self._url("variables"), coalesce=True, json=user_json
+        )
+        return _parse_variables(data)
+
+    def _fetch_features(self, user_json: dict) -> Dict[str, Feature]:
+        data = self.request(
+            "POST", self._url("features"), coalesce=True, json=user_json
+        )
+        return _parse_features(data)
 
     def track(self, user: DevCycleUser, events: List[DevCycleEvent]) -> str:
+        data = self.request(
+            "POST", self._url("track"), json=_track_payload(user, events)
+        )
+        message = data.get("message", "")
+        return message
+
+    def track_json(self, user_json: dict, events_json: List[dict]) -> str:
+        """
+        Tracks events for a user that have already been serialized in the Bucketing API format
+        """
         data = self.request(
             "POST",
             self._url("track"),
-            json={
-                "user": user.to_json(),
-                "events": [
-                    event.to_json(use_bucketing_api_format=True) for event in events
-                ],
-            },
+            json={"user": user_json, "events": events_json},
         )
         message = data.get("message", "")
         return message
+
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Returns the response cache's size and hit counts, or None if the cache is disabled
+        """
+        return self._cache.stats() if self._cache is not None else None
+
+    def circuit_breaker_metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the circuit breaker's state and counters, or None if the circuit breaker is disabled
+        """
+        return self._breaker.metrics() if self._breaker is not None else None
+
+    def close(self) -> None:
+        if self._cache is not None:
+            self._cache.close()
+        if self._breaker is not None:
+            self._breaker.close()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self.session.close()
+
+
+class _InFlightRequest:
+    """
+    A request being sent on behalf of every caller that asked for it while it was in flight
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: dict = {}
+        self.error: Optional[Exception] = None
+
+    def wait(self) -> dict:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        # Each caller gets its own copy, as variable values can be mutable JSON objects
+        return copy.deepcopy(self.result)
+
+
+class _Hedge:
+    """
+    A hedged request, sent if the first request hasn't finished by the time the hedge delay has passed
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._primary_finished = threading.Event()
+        self._sent = False
+        self.done = threading.Event()
+        self.response: Optional[requests.Response] = None
+
+    def start(self, hedge_delay: float) -> bool:
+        """
+        Waits for hedge_delay, and returns True if the hedge should be sent because the first request is still
+        in flight
+        """
+        self._primary_finished.wait(hedge_delay)
+        with self._lock:
+            self._sent = not self._primary_finished.is_set()
+            return self._sent
+
+    def primary_done(self) -> bool:
+        """
+        Records that the first request finished, and returns True if the hedge was sent
+        """
+        with self._lock:
+            self._primary_finished.set()
+            return self._sent
+
+    def wait(self) -> Optional[requests.Response]:
+        """
+        Waits for the hedge's response, returning None if it failed
+        """
+        self.done.wait()
+        return self.response
+
+
+def _request_body_key(body: Any) -> str:
+    # createdDate and lastSeenDate are set when a DevCycleUser is constructed, so they differ between
+    # otherwise identical requests for the same user
+    if isinstance(body, dict):
+        body = {
+            key: value
+            for key, value in body.items()
+            if key not in ("createdDate", "lastSeenDate")
+        }
+    return json.dumps(body, sort_keys=True, default=str)
+
+
+def _query_params(options: DevCycleCloudOptions) -> Dict[str, str]:
+    query_params = {}
+    if options.enable_edge_db:
+        query_params["enableEdgeDB"] = "true"
+    return query_params
+
+
+def _check_response_status(status_code: int, url: str) -> Optional[Exception]:
+    """
+    Raises the error for a response status that should not be retried.
+
+    :return: The error for a retryable response status, or None if the request succeeded
+    """
+    if status_code == 401:
+        # Not a retryable error
+        raise CloudClientUnauthorizedError("Invalid SDK Key")
+    elif status_code == 404:
+        # Not a retryable error
+        raise NotFoundError(url)
+    elif 400 <= status_code < 500:
+        # Not a retryable error
+        raise CloudClientBadRequestError(f"Bad request: HTTP {status_code}")
+    elif status_code >= 500:
+        # Retryable error
+        return CloudClientError(f"Server error: HTTP {status_code}")
+    return None
+
+
+def _parse_variable(data: dict) -> Variable:
+    eval_data = data.get("eval")
+    eval_reason = None
+    if eval_data is not None and isinstance(eval_data, dict):
+        eval_reason = EvalReason.from_json(eval_data)
+
+    return Variable(
+        _id=data.get("_id"),
+        key=data.get("key", ""),
+        type=data.get("type", ""),
+        value=data.get("value"),
+        eval=eval_reason,
+    )
+
+
+def _parse_variables(data: dict) -> Dict[str, Variable]:
+    result: Dict[str, Variable] = {}
+    for key, value in data.items():
+        result[key] = Variable(
+            _id=str(value.get("_id")),
+            key=str(value.get("key")),
+            type=str(value.get("type")),
+            value=value.get("value"),
+            isDefaulted=None,
+            eval=(
+                EvalReason.from_json(value.get("eval")) if value.get("eval") else None
+            ),
+        )
+    return result
+
+
+def _parse_features(data: dict) -> Dict[str, Feature]:
+    result: Dict[str, Feature] = {}
+    for key, value in data.items():
+        result[key] = Feature(
+            _id=value.get("_id"),
+            key=value.get("key"),
+            type=value.get("type"),
+            _variation=value.get("_variation"),
+            variationKey=value.get("variationKey"),
+            variationName=value.get("variationName"),
+            evalReason=value.get("evalReason"),
+        )
+    return result
+
+
+def _track_payload(user: DevCycleUser, events: List[DevCycleEvent]) -> dict:
+    return {
+        "user": user.to_json(),
+        "events": [event.to_json(use_bucketing_api_format=True) for event in events],
+    }
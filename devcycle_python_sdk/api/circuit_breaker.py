@@ -0,0 +1,194 @@
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from devcycle_python_sdk.metrics import Counter, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# The value of the circuit state gauge for each state
+_STATE_VALUES = {CLOSED: 0.0, HALF_OPEN: 1.0, OPEN: 2.0}
+
+
+class CircuitBreaker:
+    """
+    Stops requests to a failing service. After failure_threshold consecutive failed attempts the circuit opens and
+    requests are rejected without being sent. Once reset_timeout_ms has passed, the next rejected request starts a
+    probe in the background (half open): if it succeeds the circuit closes, otherwise it opens again. probe should
+    send a single request that only reads data, raising an exception if it fails.
+
+    While the circuit is open, callers can use the last successful response to each request, kept for up to
+    max_fallback_entries requests and evicted least recently used first.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout_ms: int,
+        max_fallback_entries: int,
+        probe: Callable[[], Any],
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout_ms / 1000.0
+        self._max_fallback_entries = max_fallback_entries
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe = probe
+        self._last_known: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._closed = False
+
+        self.open_count = 0
+        self.rejected_count = 0
+        self.fallback_count = 0
+        self.probe_count = 0
+
+        self._open_counter: Optional[Counter] = None
+        self._rejected_counter: Optional[Counter] = None
+        self._fallback_counter: Optional[Counter] = None
+        if metrics is not None:
+            metrics.gauge(
+                "devcycle_bucketing_circuit_state",
+                "Bucketing API circuit breaker state: 0 closed, 1 half open, 2 open",
+                lambda: _STATE_VALUES[self.state],
+            )
+            self._open_counter = metrics.counter(
+                "devcycle_bucketing_circuit_opened",
+                "Times the Bucketing API circuit breaker opened",
+            )
+            self._rejected_counter = metrics.counter(
+                "devcycle_bucketing_circuit_rejected_requests",
+                "Bucketing API requests rejected while the circuit was open",
+            )
+            self._fallback_counter = metrics.counter(
+                "devcycle_bucketing_circuit_fallback_responses",
+                "Rejected requests answered with their last successful response",
+            )
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Returns True if a request can be sent. Starts a background probe if the circuit is open and the reset
+        timeout has passed.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+
+            self.rejected_count += 1
+            if self._rejected_counter is not None:
+                self._rejected_counter.inc()
+            start_probe = (
+                self._state == OPEN
+                and not self._closed
+                and time.monotonic() - self._opened_at >= self._reset_timeout
+            )
+            if start_probe:
+                self._state = HALF_OPEN
+                self.probe_count += 1
+                probe = self._probe
+
+        if start_probe:
+            threading.Thread(target=self._run_probe, args=(probe,), daemon=True).start()
+        return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+
+    def record_failure(self) -> bool:
+        """
+        Records a failed attempt.
+
+        :return: True if the circuit is open
+        """
+        with self._lock:
+            self._consecutive_failures += 1
+            if (
+                self._state == CLOSED
+                and self._consecutive_failures >= self._failure_threshold
+            ):
+                self._open()
+                logger.warning(
+                    f"DevCycle: Bucketing API circuit opened after {self._consecutive_failures} consecutive failures"
+                )
+            return self._state != CLOSED
+
+    def _open(self) -> None:
+        # Must be called with the lock held
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self.open_count += 1
+        if self._open_counter is not None:
+            self._open_counter.inc()
+
+    def _run_probe(self, probe: Callable[[], Any]) -> None:
+        try:
+            probe()
+        except Exception as e:
+            logger.debug(f"DevCycle: Bucketing API circuit probe failed: {e}")
+            with self._lock:
+                self._open()
+            return
+
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+        logger.info("DevCycle: Bucketing API circuit closed")
+
+    def store(self, key: Hashable, value: Any) -> None:
+        """
+        Keeps the last successful response to a request, to fall back to while the circuit is open
+        """
+        with self._lock:
+            self._last_known[key] = value
+            self._last_known.move_to_end(key)
+            while len(self._last_known) > self._max_fallback_entries:
+                self._last_known.popitem(last=False)
+
+    def fallback(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns a copy of the last successful response to a request, or None if there isn't one
+        """
+        with self._lock:
+            value = self._last_known.get(key)
+            if value is None:
+                return None
+            self._last_known.move_to_end(key)
+            self.fallback_count += 1
+        if self._fallback_counter is not None:
+            self._fallback_counter.inc()
+        return copy.deepcopy(value)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the circuit state and counters
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "open_count": self.open_count,
+                "rejected_requests": self.rejected_count,
+                "fallback_responses": self.fallback_count,
+                "probes": self.probe_count,
+                "fallback_entries": len(self._last_known),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
@@ -6,6 +6,7 @@ import email.utils
 import requests
 
 from devcycle_python_sdk.api.backoff import exponential_backoff
+from devcycle_python_sdk.api.http_session import create_session, prewarm_in_background
 from devcycle_python_sdk.options import DevCycleLocalOptions
 from devcycle_python_sdk.exceptions import (
     APIClientError,
@@ -21,12 +22,20 @@ class ConfigAPIClient:
     def __init__(self, sdk_key: str, options: DevCycleLocalOptions):
         self.sdk_key = sdk_key
         self.options = options
-        self.session = requests.Session()
-        self.session.headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-        self.session.max_redirects = 0
+        self.session = create_session(
+            options,
+            {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+        )
+        if options.http_prewarm_connections:
+            prewarm_in_background(
+                self.session,
+                options.config_cdn_uri,
+                options.http_prewarm_connections,
+                options.config_request_timeout_ms / 1000.0,
+            )
         self.max_config_retries = 2
         self.config_file_url = (
             slash_join(
@@ -1,48 +1,125 @@
+import gzip
 import json
 import logging
 import time
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 
 import requests
 
 from devcycle_python_sdk.api.backoff import exponential_backoff
+from devcycle_python_sdk.api.http_session import create_session, prewarm_in_background
 from devcycle_python_sdk.options import DevCycleLocalOptions
 from devcycle_python_sdk.exceptions import (
+    APIClientBadRequestError,
     APIClientError,
+    EventBatchPartiallySentError,
     NotFoundError,
     APIClientUnauthorizedError,
 )
 from devcycle_python_sdk.models.event import UserEventsBatchRecord
 from devcycle_python_sdk.util.strings import slash_join
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 
 class EventAPIClient:
     def __init__(self, sdk_key: str, options: DevCycleLocalOptions):
         self.options = options
-        self.session = requests.Session()
-        self.session.headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Authorization": sdk_key,
-        }
-        self.session.max_redirects = 0
+        self.session = create_session(
+            options,
+            {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "Authorization": sdk_key,
+            },
+        )
+        if options.http_prewarm_connections:
+            prewarm_in_background(
+                self.session,
+                options.events_api_uri,
+                options.http_prewarm_connections,
+                options.event_request_timeout_ms / 1000.0,
+            )
         self.max_batch_retries = 0  # we don't retry events batches
         self.batch_url = slash_join(self.options.events_api_uri, "v1/events/batch")
 
+        self.compression = self.options.event_request_compression
+        if self.compression == "zstd" and zstandard is None:
+            logger.warning(
+                "DevCycle: zstd event compression requires the 'zstandard' package, falling back to gzip"
+            )
+            self.compression = "gzip"
+        self._zstd_compressor = (
+            zstandard.ZstdCompressor() if self.compression == "zstd" else None
+        )
+
+    def _encode_payload(self, payload_json: str) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Encodes the batch payload for the wire, compressing it if compression is enabled and the payload is
+        at least event_request_compression_threshold bytes long.
+
+        :return: A tuple containing the request body and any extra headers needed to send it
+        """
+        body = payload_json.encode("utf-8")
+        if (
+            self.compression is None
+            or len(body) < self.options.event_request_compression_threshold
+        ):
+            return body, {}
+
+        if self._zstd_compressor is not None:
+            return self._zstd_compressor.compress(body), {"Content-Encoding": "zstd"}
+        return gzip.compress(body, compresslevel=6), {"Content-Encoding": "gzip"}
+
     def publish_events(self, batch: List[UserEventsBatchRecord]) -> str:
         """
         Attempts to send a batch of events to the server
         """
+        if self.options.event_request_max_bytes is None:
+            payload_json = json.dumps(
+                {
+                    "batch": [record.to_json() for record in batch],
+                }
+            )
+            return self._post_batch(payload_json)
+
+        return self.publish_raw_events(
+            [json.dumps(record.to_json()) for record in batch]
+        )
+
+    def publish_raw_events(self, records: List[str]) -> str:
+        """
+        Attempts to send a batch of events to the server, where each record is already serialized as JSON text.
+
+        If event_request_max_bytes is set, the records are packed into as few requests as possible without
+        exceeding it. If a request fails after earlier ones were sent, EventBatchPartiallySentError is raised with
+        the records that weren't sent, so only those are retried.
+        """
+        if self.options.event_request_max_bytes is None:
+            return self._post_batch(_batch_json(records))
+
+        message = ""
+        chunks = _chunk_records(records, self.options.event_request_max_bytes)
+        for index, chunk in enumerate(chunks):
+            try:
+                message = self._post_batch(_batch_json(chunk))
+            except APIClientError as e:
+                if index == 0:
+                    raise
+                unsent = [record for rest in chunks[index:] for record in rest]
+                raise EventBatchPartiallySentError(e, unsent) from e
+        return message
+
+    def _post_batch(self, payload_json: str) -> str:
         retries_remaining = self.max_batch_retries + 1
         timeout = self.options.event_request_timeout_ms
 
-        payload_json = json.dumps(
-            {
-                "batch": [record.to_json() for record in batch],
-            }
-        )
+        body, headers = self._encode_payload(payload_json)
 
         attempts = 1
         while retries_remaining > 0:
@@ -53,7 +130,8 @@ class EventAPIClient:
                     self.batch_url,
                     params={},
                     timeout=timeout,
-                    data=payload_json,
+                    data=body,
+                    headers=headers,
                 )
                 if res.status_code == 401 or res.status_code == 403:
                     # Not a retryable error
@@ -63,7 +141,7 @@ class EventAPIClient:
                     raise NotFoundError(self.batch_url)
                 elif 400 <= res.status_code < 500:
                     # Not a retryable error
-                    raise APIClientError(
+                    raise APIClientBadRequestError(
                         f"Bad request: HTTP {res.status_code} - {res.text}"
                     )
                 elif res.status_code >= 500:
@@ -93,3 +171,79 @@ class EventAPIClient:
 
         data: dict = res.json()
         return data.get("message", None)
+
+
+_BATCH_PREFIX = '{"batch": ['
+_BATCH_SUFFIX = "]}"
+_SEPARATOR = ", "
+
+
+def _batch_json(records: List[str]) -> str:
+    return _BATCH_PREFIX + _SEPARATOR.join(records) + _BATCH_SUFFIX
+
+
+def _byte_length(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _chunk_records(records: List[str], max_bytes: int) -> List[List[str]]:
+    """
+    Packs the records into chunks whose batch request body is at most max_bytes. Records that don't fit in a
+    request on their own are split into several records for the same user.
+    """
+    budget = max_bytes - len(_BATCH_PREFIX) - len(_BATCH_SUFFIX)
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    chunk_size = 0
+
+    for record in records:
+        record_size = _byte_length(record)
+        if record_size <= budget:
+            parts = [(record, record_size)]
+        else:
+            parts = [
+                (part, _byte_length(part)) for part in _split_record(record, budget)
+            ]
+
+        for part, part_size in parts:
+            separator_size = len(_SEPARATOR) if chunk else 0
+            if chunk and chunk_size + separator_size + part_size > budget:
+                chunks.append(chunk)
+                chunk, chunk_size, separator_size = [], 0, 0
+            chunk.append(part)
+            chunk_size += separator_size + part_size
+
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _split_record(record: str, budget: int) -> List[str]:
+    # Splits a record's events across several records for the same user, each fitting in budget bytes if possible.
+    # An event that is too large on its own is still sent, alone in its record.
+    data = json.loads(record)
+    user_json = json.dumps(data["user"])
+    prefix = '{"user": ' + user_json + ', "events": ['
+    overhead = _byte_length(prefix) + len("]}")
+
+    parts: List[str] = []
+    events: List[str] = []
+    events_size = 0
+    for event in data.get("events", []):
+        event_json = json.dumps(event)
+        event_size = _byte_length(event_json)
+        separator_size = len(_SEPARATOR) if events else 0
+        if events and overhead + events_size + separator_size + event_size > budget:
+            parts.append(prefix + _SEPARATOR.join(events) + "]}")
+            events, events_size, separator_size = [], 0, 0
+        events.append(event_json)
+        events_size += separator_size + event_size
+
+    if events:
+        parts.append(prefix + _SEPARATOR.join(events) + "]}")
+    if len(parts) <= 1:
+        logger.debug(
+            "DevCycle: Event batch record is larger than event_request_max_bytes and can't be split further"
+        )
+        return [record]
+    return parts
@@ -0,0 +1,47 @@
+import math
+import threading
+from collections import deque
+from typing import Deque, Optional
+
+# Latency samples kept, the samples needed before requests are hedged, and how many new samples are recorded
+# before the percentile is computed again
+_WINDOW = 1000
+_MIN_SAMPLES = 20
+_RECOMPUTE_EVERY = 50
+
+
+class LatencyTracker:
+    """
+    Keeps the latencies of recent successful requests to estimate a latency percentile, which is used as the delay
+    before a hedged request is sent.
+    """
+
+    def __init__(self, percentile: float):
+        self._percentile = percentile
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=_WINDOW)
+        self._since_recompute = 0
+        self._value: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._since_recompute += 1
+            if self._value is None and len(self._samples) < _MIN_SAMPLES:
+                return
+            if self._value is None or self._since_recompute >= _RECOMPUTE_EVERY:
+                self._value = self._compute()
+                self._since_recompute = 0
+
+    def _compute(self) -> float:
+        # Must be called with the lock held
+        ordered = sorted(self._samples)
+        index = math.ceil(self._percentile / 100.0 * len(ordered)) - 1
+        return ordered[min(max(index, 0), len(ordered) - 1)]
+
+    def value(self) -> Optional[float]:
+        """
+        Returns the latency percentile in seconds, or None until enough requests have been recorded
+        """
+        with self._lock:
+            return self._value
@@ -0,0 +1,240 @@
+import importlib.util
+import logging
+import socket
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple, Union, cast
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+from devcycle_python_sdk.options import DevCycleCloudOptions, DevCycleLocalOptions
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Seconds a connection is idle before keep-alive probes start, seconds between probes, and probes before dropping it
+_KEEPALIVE_IDLE = 60
+_KEEPALIVE_INTERVAL = 10
+_KEEPALIVE_COUNT = 6
+
+
+def _keepalive_socket_options() -> List[Tuple[int, int, int]]:
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # Not every platform supports tuning the keep-alive timings
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, _KEEPALIVE_IDLE))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, _KEEPALIVE_INTERVAL))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, _KEEPALIVE_COUNT))
+    return options
+
+
+class _PoolHTTPAdapter(HTTPAdapter):
+    def __init__(self, tcp_keepalive: bool, **kwargs):
+        # Set before HTTPAdapter.__init__, which creates the pool manager
+        self._tcp_keepalive = tcp_keepalive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._tcp_keepalive:
+            kwargs["socket_options"] = (
+                HTTPConnection.default_socket_options + _keepalive_socket_options()
+            )
+        super().init_poolmanager(*args, **kwargs)
+
+
+# The timeouts requests accepts: a single timeout, or separate connect and read timeouts
+_Timeout = Union[None, float, Tuple[float, float], Tuple[float, None]]
+
+# Connection-specific headers aren't allowed in HTTP/2 requests
+_HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-connection",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+def http2_available() -> bool:
+    """
+    Returns True if the optional httpx and h2 packages needed for HTTP/2 are installed
+    """
+    return httpx is not None and importlib.util.find_spec("h2") is not None
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    A requests transport adapter that sends requests with httpx, so that many small requests can be multiplexed
+    over a few HTTP/2 connections. Servers that don't negotiate HTTP/2 are sent HTTP/1.1 requests.
+
+    With http1 set to False, plain HTTP URLs are sent HTTP/2 requests without negotiation (h2c prior knowledge).
+    TLS verification and proxies come from the environment rather than the per-request session settings.
+    """
+
+    def __init__(self, max_connections: int, http1: bool = True):
+        super().__init__()
+        self._client = httpx.Client(
+            http1=http1,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            follow_redirects=False,
+        )
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: _Timeout = None,
+        verify: Union[bool, str] = True,
+        cert: Union[
+            None, bytes, str, Tuple[Union[bytes, str], Union[bytes, str]]
+        ] = None,
+        proxies: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        headers = {
+            name: value
+            for name, value in request.headers.items()
+            if name.lower() not in _HOP_BY_HOP_HEADERS
+        }
+        try:
+            response = self._client.request(
+                str(request.method),
+                str(request.url),
+                headers=headers,
+                content=request.body,
+                timeout=_httpx_timeout(timeout),
+            )
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.headers = CaseInsensitiveDict(response.headers)
+        # httpx has already decoded the body, so requests must not decode it again
+        result._content = response.content
+        result.encoding = response.encoding
+        result.url = str(request.url)
+        result.request = request
+        return result
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def _httpx_timeout(timeout: _Timeout) -> "httpx.Timeout":
+    # requests accepts a (connect, read) tuple as well as a single timeout
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def create_session(
+    options: Union[DevCycleCloudOptions, DevCycleLocalOptions],
+    headers: Dict[str, str],
+    http2: bool = False,
+) -> requests.Session:
+    """
+    Creates a session for one of the DevCycle APIs, with its connection pool configured from the client options.
+
+    If http2 is set and the optional HTTP/2 packages are installed, requests are sent by an HTTP2Adapter instead
+    of the default HTTP/1.1 connection pool.
+    """
+    session = requests.Session()
+    session.headers = headers  # type: ignore[assignment]
+    session.max_redirects = 0
+
+    adapter: BaseAdapter
+    if http2 and http2_available():
+        adapter = HTTP2Adapter(max_connections=options.http_pool_maxsize)
+    else:
+        if http2:
+            logger.warning(
+                "DevCycle: HTTP/2 requires the 'httpx' and 'h2' packages, install them with devcycle-python-server-sdk[http2]. Using HTTP/1.1"
+            )
+        adapter = _PoolHTTPAdapter(
+            tcp_keepalive=options.http_tcp_keepalive,
+            pool_maxsize=options.http_pool_maxsize,
+            pool_block=options.http_pool_block,
+        )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def prewarm_connections(
+    session: requests.Session, url: str, count: int, timeout: float
+) -> int:
+    """
+    Opens up to count connections to the host of url and returns them to the session's connection pool, so the
+    first requests don't wait for TCP and TLS handshakes.
+
+    :return: The number of connections opened
+    """
+    adapter = session.get_adapter(url)
+    if not isinstance(adapter, HTTPAdapter):
+        return 0
+
+    # Look the pool up the same way requests does, including the CA bundle and proxies from the environment,
+    # so the warmed connections are the ones requests will use
+    request = requests.Request("GET", url).prepare()
+    settings = session.merge_environment_settings(url, {}, None, None, None)
+    pool = cast(
+        HTTPConnectionPool,
+        adapter.get_connection_with_tls_context(
+            request,
+            verify=settings["verify"],
+            proxies=settings["proxies"],
+            cert=settings["cert"],
+        ),
+    )
+
+    # _get_conn and _put_conn are private, but have been stable across urllib3 1.x and 2.x
+    connections = []
+    opened = 0
+    try:
+        for _ in range(count):
+            conn = pool._get_conn(timeout=timeout)  # type: ignore[attr-defined]
+            connections.append(conn)
+            if getattr(conn, "sock", None) is None:
+                conn.timeout = timeout
+                conn.connect()
+                opened += 1
+    finally:
+        for conn in connections:
+            pool._put_conn(conn)  # type: ignore[attr-defined]
+    return opened
+
+
+def prewarm_in_background(
+    session: requests.Session, url: str, count: int, timeout: float
+) -> threading.Thread:
+    """
+    Runs prewarm_connections on a background thread, logging any errors
+    """
+
+    def prewarm():
+        try:
+            opened = prewarm_connections(session, url, count, timeout)
+            logger.debug(f"DevCycle: Prewarmed {opened} connections to {url}")
+        except Exception as e:
+            logger.debug(f"DevCycle: Unable to prewarm connections to {url}: {e}")
+
+    thread = threading.Thread(target=prewarm, daemon=True)
+    thread.start()
+    return thread
@@ -5,7 +5,7 @@ import json
 
 from pathlib import Path
 from threading import Lock
-from typing import Any, cast, Optional, List, Tuple
+from typing import Any, cast, Optional, List, Tuple, Union
 
 import wasmtime
 from wasmtime import (
@@ -20,6 +20,7 @@ from wasmtime import (
 )
 
 import devcycle_python_sdk.protobuf.utils as pb_utils
+from devcycle_python_sdk.api.aggregate_events import AggregateVariableEvents
 import devcycle_python_sdk.protobuf.variableForUserParams_pb2 as pb2
 from devcycle_python_sdk.exceptions import (
     MalformedConfigError,
@@ -27,8 +28,11 @@ from devcycle_python_sdk.exceptions import (
 from devcycle_python_sdk.models.bucketed_config import BucketedConfig
 from devcycle_python_sdk.models.user import DevCycleUser
 from devcycle_python_sdk.models.variable import Variable, determine_variable_type
-from devcycle_python_sdk.models.event import FlushPayload
+from devcycle_python_sdk.models.event import FlushPayload, RawFlushPayload
 from devcycle_python_sdk.models.config_metadata import ConfigMetadata
+from devcycle_python_sdk.models.eval_reason import EvalReasons
+from devcycle_python_sdk.metrics import Histogram, MetricsRegistry
+from devcycle_python_sdk.metrics.profiler import PhaseTimer
 
 logger = logging.getLogger(__name__)
 
@@ -43,10 +47,57 @@ class WASMAbortError(WASMError):
     pass
 
 
+class _TimedLock:
+    """
+    A lock that records how long callers wait to acquire it
+    """
+
+    def __init__(self, histogram: Histogram) -> None:
+        self._lock = Lock()
+        self._histogram = histogram
+
+    def __enter__(self) -> bool:
+        start = time.perf_counter()
+        self._lock.acquire()
+        self._histogram.observe(time.perf_counter() - start)
+        return True
+
+    def __exit__(self, *args) -> None:
+        self._lock.release()
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        return self._lock.acquire(blocking, timeout)
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+
 class LocalBucketing:
-    def __init__(self, sdk_key: str) -> None:
+    def __init__(self, sdk_key: str, metrics: Optional[MetricsRegistry] = None) -> None:
         self.random = random.random()
-        self.wasm_lock = Lock()
+
+        # Metrics are only recorded if a registry is given, so the hot paths don't pay for timing otherwise
+        self.wasm_lock: Union[Lock, _TimedLock] = Lock()
+        self._evaluation_seconds: Optional[Histogram] = None
+        self._config_store_seconds: Optional[Histogram] = None
+        if metrics is not None:
+            self.wasm_lock = _TimedLock(
+                metrics.histogram(
+                    "devcycle_wasm_lock_wait_seconds",
+                    "Time spent waiting to acquire the lock on the WASM bucketing module",
+                )
+            )
+            self._evaluation_seconds = metrics.histogram(
+                "devcycle_variable_evaluation_seconds",
+                "Time taken to evaluate a variable for a user in the WASM bucketing module",
+            )
+            self._config_store_seconds = metrics.histogram(
+                "devcycle_config_store_seconds",
+                "Time taken to store a new config in the WASM bucketing module",
+            )
 
         wasi_cfg = wasmtime.WasiConfig()
         wasi_cfg.inherit_env()
@@ -158,6 +209,10 @@ class LocalBucketing:
 
         # Set and pin the SDK key so it can be reused multiple times
         self.sdk_key = sdk_key
+        self._params_template = pb_utils.VariableForUserParamsTemplate(sdk_key)
+        self._aggregate_events = AggregateVariableEvents()
+        # The metadata only changes with the config, so it's read from the WASM module once per config
+        self._config_metadata: Optional[ConfigMetadata] = None
         self.sdk_key_addr = self._new_assembly_script_string(sdk_key)
         self.__pin(self.wasm_store, self.sdk_key_addr)
 
@@ -297,26 +352,49 @@ class LocalBucketing:
             self.initEventQueue(
                 self.wasm_store, self.sdk_key_addr, client_uuid_addr, options_addr
             )
+        self._aggregate_events.init(client_uuid, options_json)
 
     def get_variable_for_user_protobuf(
-        self, user: DevCycleUser, key: str, default_value: Any
+        self,
+        user: DevCycleUser,
+        key: str,
+        default_value: Any,
+        timer: Optional[PhaseTimer] = None,
+    ) -> Tuple[Optional[Variable], Optional[str]]:
+        """
+        Evaluates a variable for a user. If a timer is given, the protobuf_build, lock_wait, wasm and decode
+        phases of the evaluation are marked on it.
+        """
+        if self._evaluation_seconds is None:
+            return self._variable_for_user_protobuf(user, key, default_value, timer)
+
+        start = time.perf_counter()
+        try:
+            return self._variable_for_user_protobuf(user, key, default_value, timer)
+        finally:
+            self._evaluation_seconds.observe(time.perf_counter() - start)
+
+    def _variable_for_user_protobuf(
+        self,
+        user: DevCycleUser,
+        key: str,
+        default_value: Any,
+        timer: Optional[PhaseTimer],
     ) -> Tuple[Optional[Variable], Optional[str]]:
         var_type = determine_variable_type(default_value)
         pb_variable_type = pb_utils.convert_type_enum_to_variable_type(var_type)
 
-        params_pb = pb2.VariableForUserParams_PB(
-            sdkKey=self.sdk_key,
-            variableKey=key,
-            variableType=pb_variable_type,
-            user=pb_utils.create_dvcuser_pb(user),
-            shouldTrackEvent=True,
-        )
-
-        params_str = params_pb.SerializeToString()
+        params_str = self._params_template.serialize(user, key, pb_variable_type)
+        if timer is not None:
+            timer.mark("protobuf_build")
 
         with self.wasm_lock:
+            if timer is not None:
+                timer.mark("lock_wait")
             params_addr = self._new_assembly_script_byte_array(params_str)
             variable_addr = self.VariableForUserProtobuf(self.wasm_store, params_addr)
+            if timer is not None:
+                timer.mark("wasm")
 
             if variable_addr == 0:
                 return None, None
@@ -330,10 +408,13 @@ class LocalBucketing:
                     else None
                 )
 
-                return pb_utils.create_variable(sdk_variable, default_value), feature_id
+                variable = pb_utils.create_variable(sdk_variable, default_value)
+                if timer is not None:
+                    timer.mark("decode")
+                return variable, feature_id
 
     def generate_bucketed_config(self, user: DevCycleUser) -> BucketedConfig:
-        user_json = json.dumps(user.to_json())
+        user_json = user.to_json_str()
 
         with self.wasm_lock:
             user_json_addr = self._new_assembly_script_byte_array(
@@ -359,24 +440,63 @@ class LocalBucketing:
             return config
 
     def store_config(self, config_json: str) -> None:
+        start = time.perf_counter()
         with self.wasm_lock:
             data = config_json.encode("utf-8")
             config_addr = self._new_assembly_script_byte_array(data)
             self.setConfigDataUTF8(self.wasm_store, self.sdk_key_addr, config_addr)
+            self._config_metadata = None
+        if self._config_store_seconds is not None:
+            self._config_store_seconds.observe(time.perf_counter() - start)
+
+    def cached_config_metadata(self) -> Optional[ConfigMetadata]:
+        """
+        Returns the config metadata if it has been read since the config was stored, without waiting on the WASM
+        lock, otherwise None
+        """
+        return self._config_metadata
 
     def get_config_metadata(self) -> Optional[ConfigMetadata]:
+        config_metadata = self._config_metadata
+        if config_metadata is not None:
+            return config_metadata
+
         with self.wasm_lock:
             config_addr = self.getConfigMetadata(self.wasm_store, self.sdk_key_addr)
             config_bytes = self._read_assembly_script_string(config_addr)
             config_data = json.loads(config_bytes.encode("utf-8"))
 
-            return ConfigMetadata.from_json(config_data)
+            self._config_metadata = ConfigMetadata.from_json(config_data)
+            return self._config_metadata
 
     def set_platform_data(self, platform_json: str) -> None:
         with self.wasm_lock:
             data = platform_json.encode("utf-8")
             data_addr = self._new_assembly_script_byte_array(data)
             self.setPlatformDataUTF8(self.wasm_store, data_addr)
+        self._aggregate_events.set_platform_data(platform_json)
+
+    def record_variable_defaulted(self, key: str) -> None:
+        """
+        Queues an aggVariableDefaulted event for a variable that isn't in the config, without calling the WASM
+        module. Used instead of evaluating the variable, which would queue the same event.
+        """
+        self._aggregate_events.record_defaulted(key)
+
+    def record_variable_evaluated(
+        self,
+        key: str,
+        feature_id: str,
+        variation_id: str,
+        eval_reason: str = EvalReasons.TARGETING_MATCH,
+    ) -> None:
+        """
+        Queues an aggVariableEvaluated event for a variable that was evaluated without calling the WASM module.
+        eval_reason is the reason the evaluation would have had, such as SPLIT for a random distribution.
+        """
+        self._aggregate_events.record_evaluated(
+            key, feature_id, variation_id, eval_reason
+        )
 
     def set_client_custom_data(self, client_data_json: str) -> None:
         with self.wasm_lock:
@@ -394,13 +514,47 @@ class LocalBucketing:
             result_addr = self.flushEventQueue(self.wasm_store, self.sdk_key_addr)
             result_str = self._read_assembly_script_string(result_addr)
             result_json = json.loads(result_str)
-            return [FlushPayload.from_json(element) for element in result_json]
+        payloads = [FlushPayload.from_json(element) for element in result_json]
+
+        aggregated = self._aggregate_events.take_payload()
+        if aggregated is not None:
+            payload_id, record_json, event_count = aggregated
+            payloads.append(
+                FlushPayload.from_json(
+                    {
+                        "payloadId": payload_id,
+                        "eventCount": event_count,
+                        "records": [json.loads(record_json)],
+                    }
+                )
+            )
+        return payloads
+
+    def flush_event_queue_raw(self) -> List[RawFlushPayload]:
+        """
+        Collects the events that are ready to send to the server, like flush_event_queue, but keeps each payload's
+        records as the JSON text exported by the WASM instead of parsing them into model objects
+
+        Returns: a list of RawFlushPayload objects, or an empty list if there are no events to send
+        """
+        with self.wasm_lock:
+            result_addr = self.flushEventQueue(self.wasm_store, self.sdk_key_addr)
+            result_str = self._read_assembly_script_string(result_addr)
+        payloads = RawFlushPayload.list_from_json(result_str)
+
+        aggregated = self._aggregate_events.take_payload()
+        if aggregated is not None:
+            payload_id, record_json, event_count = aggregated
+            payloads.append(RawFlushPayload(payload_id, [record_json], event_count))
+        return payloads
 
     def on_event_payload_success(self, payload_id: str) -> None:
         """
         Notifies the WASM that the events associated with the payload_id have been sent successfully and
         can be purged from the queue
         """
+        if self._aggregate_events.on_payload_success(payload_id):
+            return
         with self.wasm_lock:
             id_addr = self._new_assembly_script_string(payload_id)
             self.onPayloadSuccess(self.wasm_store, self.sdk_key_addr, id_addr)
@@ -410,6 +564,8 @@ class LocalBucketing:
         Notifies the WASM that the events associated with the payload_id failed to be sent and should
         be re-queued.
         """
+        if self._aggregate_events.on_payload_failure(payload_id, retryable):
+            return
         with self.wasm_lock:
             id_addr = self._new_assembly_script_string(payload_id)
             self.onPayloadFailure(
@@ -422,7 +578,7 @@ class LocalBucketing:
         """
         with self.wasm_lock:
             val = self.eventQueueSize(self.wasm_store, self.sdk_key_addr)
-            return int(val)
+        return int(val) + self._aggregate_events.size()
 
     def queue_event(self, user_json: str, event_json: str) -> None:
         with self.wasm_lock:
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from numbers import Real
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+
+from devcycle_python_sdk.options import DevCycleLocalOptions
+from devcycle_python_sdk.local_client import DevCycleLocalClient
+from devcycle_python_sdk.models.eval_hook import EvalHook
+from devcycle_python_sdk.models.event import DevCycleEvent
+from devcycle_python_sdk.models.feature import Feature
+from devcycle_python_sdk.models.user import DevCycleUser
+from devcycle_python_sdk.models.variable import Variable
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DevCycleAsyncLocalClient:
+    """
+    An asyncio facade for DevCycleLocalClient, for applications that evaluate variables from inside an event loop.
+
+    Variables that can be answered from the evaluation cache or are served the same way to every user are
+    evaluated inline, since that is cheaper than handing them to another thread and never touches the bucketing
+    library. Everything else that calls the bucketing library, or can flush the event queue and so make a blocking
+    request to the Events API, runs on a dedicated executor of async_eval_max_workers threads, so the loop never
+    waits on the library's lock. At most async_eval_max_pending calls wait on the executor; further callers wait on
+    the loop for a slot.
+    """
+
+    def __init__(self, sdk_key: str, options: Optional[DevCycleLocalOptions] = None):
+        self.client = DevCycleLocalClient(
+            sdk_key, options if options is not None else DevCycleLocalOptions()
+        )
+        self.options = self.client.options
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.options.async_eval_max_workers,
+            thread_name_prefix="devcycle-eval",
+        )
+        self._pending = asyncio.Semaphore(self.options.async_eval_max_pending)
+
+    def get_sdk_platform(self) -> str:
+        return self.client.get_sdk_platform()
+
+    def is_initialized(self) -> bool:
+        return self.client.is_initialized()
+
+    async def wait_for_initialization(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the client has received and stored its first config, without blocking the event loop
+
+        :param timeout: The maximum number of seconds to wait, or None to wait indefinitely
+        :return: True if the client is initialized, False if the wait timed out
+        """
+        return await asyncio.to_thread(
+            self.client.config_manager.wait_for_initialization, timeout
+        )
+
+    async def _offload(self, func: Callable[..., T], *args: Any) -> T:
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def variable_value(
+        self, user: DevCycleUser, key: str, default_value: Any
+    ) -> Any:
+        """
+        Evaluates a variable for a user and returns the value.  If the user is not bucketed into the variable, the default value will be returned
+
+        :param user: The user to evaluate the variable for
+        """
+        variable = await self.variable(user, key, default_value)
+        return variable.value
+
+    async def variable(
+        self, user: DevCycleUser, key: str, default_value: Any
+    ) -> Variable:
+        """
+        Evaluates a variable for a user.
+
+        :param user: The user to evaluate the variable for
+        :param key: The key of the variable to evaluate
+        :param default_value: The default value to return if the user is not bucketed into the variable
+        """
+        variable = self.client._variable_without_wasm(user, key, default_value)
+        if variable is not None:
+            return variable
+        return await self._offload(self.client.variable, user, key, default_value)
+
+    async def all_variables(self, user: DevCycleUser) -> Dict[str, Variable]:
+        """
+        Returns all segmented and bucketed variables for a user.  This method will return an empty map if the client has not been initialized or if the user is not bucketed into any variables
+
+        :param user: The user to retrieve variables for
+        """
+        return await self._offload(self.client.all_variables, user)
+
+    async def all_features(self, user: DevCycleUser) -> Dict[str, Feature]:
+        """
+        Returns all segmented and bucketed features for a user.  This method will return an empty map if the client has not been initialized or if the user is not bucketed into any features
+
+        :param user: The user to retrieve features for
+        """
+        return await self._offload(self.client.all_features, user)
+
+    async def track(self, user: DevCycleUser, user_event: DevCycleEvent) -> None:
+        """
+        Tracks a custom event for a user.  The event is queued for processing in the background.  If the client has not been initialized, the event will be discarded.
+
+        :param user: The user to track the event for
+        :param user_event: The event to track
+        """
+        # Queueing an event flushes the queue on the calling thread once it reaches flush_event_queue_size
+        await self._offload(self.client.track, user, user_event)
+
+    async def set_client_custom_data(
+        self, custom_data: Dict[str, Union[str, Real, bool, None]]
+    ) -> None:
+        """
+        Sets global custom data for this client. See DevCycleLocalClient.set_client_custom_data
+        """
+        await self._offload(self.client.set_client_custom_data, custom_data)
+
+    async def close(self) -> None:
+        """
+        Closes the client, flushing any queued events, and shuts down the evaluation executor
+        """
+        await asyncio.to_thread(self.client.close)
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "DevCycleAsyncLocalClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns a snapshot of the SDK's metrics, or None if metrics are disabled. See DevCycleLocalClient.metrics
+        """
+        return self.client.metrics()
+
+    def evaluation_profile(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the time spent in each phase of the sampled variable evaluations, or None if evaluation profiling
+        is disabled. See DevCycleLocalClient.evaluation_profile
+        """
+        return self.client.evaluation_profile()
+
+    def add_hook(self, eval_hook: EvalHook) -> None:
+        self.client.add_hook(eval_hook)
+
+    def clear_hooks(self) -> None:
+        self.client.clear_hooks()
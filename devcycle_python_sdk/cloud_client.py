@@ -1,19 +1,29 @@
+import copy
 import logging
 import platform
-
-from typing import Any, Dict
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
 
 from devcycle_python_sdk import DevCycleCloudOptions, AbstractDevCycleClient
-from devcycle_python_sdk.api.bucketing_client import BucketingAPIClient
+from devcycle_python_sdk.api.bucketing_client import (
+    BucketingAPIClient,
+    _request_body_key,
+)
 from devcycle_python_sdk.exceptions import (
     NotFoundError,
     CloudClientUnauthorizedError,
 )
+from devcycle_python_sdk.managers.cloud_event_queue_manager import (
+    CloudEventQueueManager,
+)
 from devcycle_python_sdk.managers.eval_hooks_manager import (
     EvalHooksManager,
     BeforeHookError,
     AfterHookError,
 )
+from devcycle_python_sdk.metrics import MetricsRegistry
 from devcycle_python_sdk.models.eval_reason import (
     DefaultReasonDetails,
 )
@@ -53,11 +63,24 @@ class DevCycleCloudClient(AbstractDevCycleClient):
         self.platform_version = platform.python_version()
         self.sdk_version = sdk_version()
         self.sdk_type = "server"
-        self.bucketing_api = BucketingAPIClient(sdk_key, self.options)
+        self.metrics_registry: Optional[MetricsRegistry] = (
+            MetricsRegistry() if self.options.enable_metrics else None
+        )
+        self.bucketing_api = BucketingAPIClient(
+            sdk_key, self.options, self.metrics_registry
+        )
         self._openfeature_provider = DevCycleProvider(self)
         self.eval_hooks_manager = EvalHooksManager(
             None if options is None else options.eval_hooks
         )
+        self.event_queue_manager: Optional[CloudEventQueueManager] = None
+        if self.options.enable_background_tracking:
+            self.event_queue_manager = CloudEventQueueManager(
+                self.options, self.bucketing_api, self.metrics_registry
+            )
+        self._prefetch_scope: ContextVar[Optional[_PrefetchScope]] = ContextVar(
+            f"devcycle_prefetch_scope_{id(self)}", default=None
+        )
 
     def get_sdk_platform(self) -> str:
         return "Cloud"
@@ -66,15 +89,37 @@ class DevCycleCloudClient(AbstractDevCycleClient):
         return self._openfeature_provider
 
     def _add_platform_data_to_user(self, user: DevCycleUser) -> DevCycleUser:
-        user.platform = self.platform
-        user.platformVersion = self.platform_version
-        user.sdkVersion = self.sdk_version
-        user.sdkType = self.sdk_type
+        platform_data = {
+            "platform": self.platform,
+            "platformVersion": self.platform_version,
+            "sdkVersion": self.sdk_version,
+            "sdkType": self.sdk_type,
+        }
+        for name, value in platform_data.items():
+            # Setting an attribute clears the user's cached encodings, so only set the ones that changed
+            if getattr(user, name) != value:
+                setattr(user, name, value)
         return user
 
     def is_initialized(self) -> bool:
         return True
 
+    @contextmanager
+    def prefetch_scope(self) -> Iterator[None]:
+        """
+        Starts a prefetch scope, for example around the handling of one incoming request. Within the scope the
+        first lookup for a user fetches all of the user's variables in one request, and later variable() and
+        all_variables() calls for the same user are answered from that response. Fetched variables are discarded
+        when the scope exits, so they can't leak into later requests.
+
+        The scope applies to the current thread or asyncio task and the tasks it starts.
+        """
+        token = self._prefetch_scope.set(_PrefetchScope())
+        try:
+            yield
+        finally:
+            self._prefetch_scope.reset(token)
+
     def variable_value(self, user: DevCycleUser, key: str, default_value: Any) -> Any:
         """
         Evaluates a variable for a user and returns the value.  If the user is not bucketed into the variable, the default value will be returned
@@ -113,7 +158,7 @@ class DevCycleCloudClient(AbstractDevCycleClient):
                     context = changed_context
             except BeforeHookError as e:
                 before_hook_error = e
-            variable = self.bucketing_api.variable(key, context.user)
+            variable = self._bucketed_variable(key, context.user)
             if before_hook_error is None:
                 self.eval_hooks_manager.run_after(context, variable, None)
             else:
@@ -157,6 +202,17 @@ class DevCycleCloudClient(AbstractDevCycleClient):
 
         return variable
 
+    def _bucketed_variable(self, key: str, user: DevCycleUser) -> Variable:
+        scope = self._prefetch_scope.get()
+        if scope is None:
+            return self.bucketing_api.variable(key, user)
+
+        variables = scope.variables(user, self.bucketing_api.variables)
+        if key not in variables:
+            # The same as the Bucketing API's response for a variable the user doesn't get
+            raise NotFoundError(key)
+        return copy.deepcopy(variables[key])
+
     def all_variables(self, user: DevCycleUser) -> Dict[str, Variable]:
         """
         Returns all segmented and bucketed variables for a user.  This method will return an empty map if the user is not bucketed into any variables
@@ -168,7 +224,13 @@ class DevCycleCloudClient(AbstractDevCycleClient):
 
         variable_map: Dict[str, Variable] = {}
         try:
-            variable_map = self.bucketing_api.variables(user)
+            scope = self._prefetch_scope.get()
+            if scope is None:
+                variable_map = self.bucketing_api.variables(user)
+            else:
+                variable_map = copy.deepcopy(
+                    scope.variables(user, self.bucketing_api.variables)
+                )
         except CloudClientUnauthorizedError as e:
             logger.warning("DevCycle: SDK key is invalid, unable to make cloud request")
             raise e
@@ -199,7 +261,8 @@ class DevCycleCloudClient(AbstractDevCycleClient):
 
     def track(self, user: DevCycleUser, user_event: DevCycleEvent) -> None:
         """
-        Tracks a custom event for a user.
+        Tracks a custom event for a user.  If background tracking is enabled the event is queued and sent from a
+        background thread, otherwise it is sent before this method returns.
 
         :param user: The user to track the event for
         :param user_event: The event to track
@@ -214,6 +277,10 @@ class DevCycleCloudClient(AbstractDevCycleClient):
         if user_event is None or not user_event.type:
             raise ValueError("Invalid Event")
 
+        if self.event_queue_manager is not None:
+            self.event_queue_manager.queue_event(user, user_event)
+            return
+
         events = [user_event]
         try:
             self.bucketing_api.track(user, events)
@@ -223,11 +290,21 @@ class DevCycleCloudClient(AbstractDevCycleClient):
         except Exception as e:
             logger.error(f"DevCycle: Error tracking event: {e}")
 
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns a snapshot of the SDK's metrics, or None if metrics are disabled
+        """
+        if self.metrics_registry is None:
+            return None
+        return self.metrics_registry.snapshot()
+
     def close(self) -> None:
         """
         Closes the client and releases any resources held by it.
         """
-        # Cloud client doesn't need to release any resources
+        if self.event_queue_manager is not None:
+            self.event_queue_manager.close()
+        self.bucketing_api.close()
         logger.debug("DevCycle: Cloud client closed")
 
     def add_hook(self, hook: EvalHook) -> None:
@@ -237,6 +314,59 @@ class DevCycleCloudClient(AbstractDevCycleClient):
         self.eval_hooks_manager.clear_hooks()
 
 
+class _PrefetchScope:
+    """
+    The variables fetched for each user within one prefetch scope
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._users: Dict[str, _PrefetchedUser] = {}
+
+    def variables(
+        self,
+        user: DevCycleUser,
+        fetch: Callable[[DevCycleUser], Dict[str, Variable]],
+    ) -> Dict[str, Variable]:
+        fingerprint = _request_body_key(user.to_json())
+        with self._lock:
+            prefetched = self._users.get(fingerprint)
+            if prefetched is None:
+                leader = self._users[fingerprint] = _PrefetchedUser()
+
+        # Concurrent lookups for the same user in the scope wait for the first one's request, without holding
+        # the lock, so lookups for other users aren't blocked by it
+        if prefetched is not None:
+            return prefetched.wait()
+
+        try:
+            leader.variables = fetch(user)
+            return leader.variables
+        except Exception as e:
+            # Kept, so a failed fetch isn't retried for every lookup in the scope
+            leader.error = e
+            raise
+        finally:
+            leader.done.set()
+
+
+class _PrefetchedUser:
+    """
+    The result of fetching one user's variables within a prefetch scope
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.variables: Dict[str, Variable] = {}
+        self.error: Optional[Exception] = None
+
+    def wait(self) -> Dict[str, Variable]:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.variables
+
+
 def _validate_sdk_key(sdk_key: str) -> None:
     if sdk_key is None or len(sdk_key) == 0:
         raise ValueError("Missing SDK key! Call initialize with a valid SDK key")
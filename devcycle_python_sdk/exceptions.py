@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 
 class APIClientError(Exception):
@@ -10,6 +10,25 @@ class APIClientError(Exception):
         return f"APIClientError: {self.message}"
 
 
+class APIClientBadRequestError(APIClientError):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class EventBatchPartiallySentError(APIClientError):
+    """
+    Raised when an event batch was sent in several requests and one of them failed. The records in the earlier
+    requests were delivered; unsent_records are the serialized records that weren't.
+    """
+
+    def __init__(self, cause: APIClientError, unsent_records: List[str]):
+        super().__init__(cause.message, cause)
+        self.unsent_records = unsent_records
+
+    def __str__(self):
+        return f"{self.__cause__}, {len(self.unsent_records)} records unsent"
+
+
 class APIClientUnauthorizedError(Exception):
     def __init__(self, message: str):
         self.message = message
@@ -24,6 +43,16 @@ class CloudClientError(APIClientError):
         return f"CloudClientException: {self.message}"
 
 
+class CloudClientBadRequestError(CloudClientError):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class CircuitOpenError(CloudClientError):
+    def __init__(self, message: str, cause: Optional[Exception] = None):
+        super().__init__(message, cause)
+
+
 class CloudClientUnauthorizedError(APIClientUnauthorizedError):
     def __init__(self, message: str):
         super().__init__(message)
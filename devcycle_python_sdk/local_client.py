@@ -2,7 +2,7 @@ import json
 import logging
 import uuid
 from numbers import Real
-from typing import Any, Dict, Union, Optional
+from typing import Any, Dict, Union, Optional, Tuple
 
 from devcycle_python_sdk import DevCycleLocalOptions, AbstractDevCycleClient
 from devcycle_python_sdk.api.local_bucketing import LocalBucketing
@@ -13,7 +13,10 @@ from devcycle_python_sdk.managers.eval_hooks_manager import (
     AfterHookError,
 )
 from devcycle_python_sdk.managers.event_queue_manager import EventQueueManager
+from devcycle_python_sdk.metrics import MetricsRegistry
+from devcycle_python_sdk.metrics.profiler import EvaluationProfiler, PhaseTimer
 from devcycle_python_sdk.models.bucketed_config import BucketedConfig
+from devcycle_python_sdk.models.config_metadata import ConfigMetadata
 from devcycle_python_sdk.models.eval_hook import EvalHook
 from devcycle_python_sdk.models.eval_hook_context import HookContext
 from devcycle_python_sdk.models.eval_reason import (
@@ -25,7 +28,7 @@ from devcycle_python_sdk.models.event import DevCycleEvent, EventType
 from devcycle_python_sdk.models.feature import Feature
 from devcycle_python_sdk.models.platform_data import default_platform_data
 from devcycle_python_sdk.models.user import DevCycleUser
-from devcycle_python_sdk.models.variable import Variable
+from devcycle_python_sdk.models.variable import Variable, determine_variable_type
 from devcycle_python_sdk.models.variable_metadata import VariableMetadata
 from devcycle_python_sdk.open_feature_provider.provider import DevCycleProvider
 from openfeature.provider import AbstractProvider
@@ -48,7 +51,10 @@ class DevCycleLocalClient(AbstractDevCycleClient):
         else:
             self.options = options
 
-        self.local_bucketing = LocalBucketing(sdk_key)
+        self.metrics_registry: Optional[MetricsRegistry] = (
+            MetricsRegistry() if self.options.enable_metrics else None
+        )
+        self.local_bucketing = LocalBucketing(sdk_key, self.metrics_registry)
 
         self._platform_data = default_platform_data()
         self.local_bucketing.set_platform_data(
@@ -56,12 +62,22 @@ class DevCycleLocalClient(AbstractDevCycleClient):
         )
 
         self.config_manager: EnvironmentConfigManager = EnvironmentConfigManager(
-            sdk_key, self.options, self.local_bucketing
+            sdk_key, self.options, self.local_bucketing, self.metrics_registry
         )
         self.event_queue_manager: EventQueueManager = EventQueueManager(
-            sdk_key, self.client_uuid, self.options, self.local_bucketing
+            sdk_key,
+            self.client_uuid,
+            self.options,
+            self.local_bucketing,
+            self.metrics_registry,
         )
 
+        self._profiler: Optional[EvaluationProfiler] = None
+        if self.options.enable_evaluation_profiling:
+            self._profiler = EvaluationProfiler(
+                self.options.evaluation_profiling_sample_rate, self.metrics_registry
+            )
+
         self._openfeature_provider: Optional[DevCycleProvider] = None
         self.eval_hooks_manager = EvalHooksManager(self.options.eval_hooks)
 
@@ -104,6 +120,8 @@ class DevCycleLocalClient(AbstractDevCycleClient):
             try:
                 custom_data_json = json.dumps(custom_data)
                 self.local_bucketing.set_client_custom_data(custom_data_json)
+                # Client custom data is merged into every user, so cached evaluations may no longer apply
+                self.config_manager.reset_evaluation_cache()
             except Exception as e:
                 logger.error("DevCycle: Error setting custom data: " + str(e))
 
@@ -123,6 +141,41 @@ class DevCycleLocalClient(AbstractDevCycleClient):
         :param key: The key of the variable to evaluate
         :param default_value: The default value to return if the user is not bucketed into the variable
         """
+        return self._variable(user, key, default_value)
+
+    def _variable_without_wasm(
+        self, user: DevCycleUser, key: str, default_value: Any
+    ) -> Optional[Variable]:
+        """
+        Evaluates a variable the same way as variable(), if it can be answered from the evaluation cache or as an
+        unconditional variable. Returns None, without running hooks or queueing events, if evaluating it needs the
+        WASM module, so it never waits on the WASM lock.
+        """
+        _validate_user(user)
+        if not key or default_value is None or not self.is_initialized():
+            return None
+
+        # The config metadata and evaluation are taken together, so a config stored after this point can't make
+        # the evaluation below call the WASM module
+        config_metadata = self.local_bucketing.cached_config_metadata()
+        if config_metadata is None:
+            return None
+        evaluation = self._evaluate_without_wasm(
+            user, key, determine_variable_type(default_value), default_value, False
+        )
+        if evaluation is None:
+            return None
+        return self._variable(user, key, default_value, (config_metadata, evaluation))
+
+    def _variable(
+        self,
+        user: DevCycleUser,
+        key: str,
+        default_value: Any,
+        evaluated: Optional[
+            Tuple[Optional[ConfigMetadata], Tuple[Optional[Variable], Optional[str]]]
+        ] = None,
+    ) -> Variable:
         _validate_user(user)
 
         if not key:
@@ -151,8 +204,16 @@ class DevCycleLocalClient(AbstractDevCycleClient):
                 key, default_value, DefaultReasonDetails.MISSING_CONFIG
             )
 
-        config_metadata = self.local_bucketing.get_config_metadata()
+        profiler = self._profiler
+        timer = profiler.sample() if profiler is not None else None
+
+        if evaluated is not None:
+            config_metadata = evaluated[0]
+        else:
+            config_metadata = self.local_bucketing.get_config_metadata()
         variable_metadata = None
+        if timer is not None:
+            timer.mark("config_metadata")
 
         context = HookContext(key, user, default_value, config_metadata)
         variable = Variable.create_default_variable(
@@ -167,11 +228,15 @@ class DevCycleLocalClient(AbstractDevCycleClient):
                     context = changed_context
             except BeforeHookError as e:
                 before_hook_error = e
-            bucketed_variable, feature_id = (
-                self.local_bucketing.get_variable_for_user_protobuf(
-                    user, key, default_value
+            if timer is not None:
+                timer.mark("before_hooks")
+            if evaluated is not None:
+                bucketed_variable, feature_id = evaluated[1]
+            else:
+                bucketed_variable, feature_id = self._evaluate_variable(
+                    user, key, variable.type, default_value, timer
                 )
-            )
+            self.event_queue_manager.record_evaluation_event()
             if feature_id is not None:
                 variable_metadata = VariableMetadata(feature_id=feature_id)
             if bucketed_variable is not None:
@@ -201,8 +266,81 @@ class DevCycleLocalClient(AbstractDevCycleClient):
             return variable
         finally:
             self.eval_hooks_manager.run_finally(context, variable, variable_metadata)
+            if profiler is not None and timer is not None:
+                timer.mark("after_hooks")
+                profiler.record(timer)
         return variable
 
+    def _evaluate_variable(
+        self,
+        user: DevCycleUser,
+        key: str,
+        variable_type: str,
+        default_value: Any,
+        timer: Optional[PhaseTimer],
+    ) -> Tuple[Optional[Variable], Optional[str]]:
+        """
+        Evaluates a variable with the WASM module, unless it can be answered without it: variables served the
+        same way to every user, variables that aren't in the config, and evaluations in the evaluation cache
+        """
+        evaluation = self._evaluate_without_wasm(
+            user, key, variable_type, default_value, True
+        )
+        if evaluation is not None:
+            return evaluation
+
+        if not self.config_manager.has_variable(key):
+            # Variables that aren't in the config are defaulted without evaluating them
+            self.local_bucketing.record_variable_defaulted(key)
+            return None, None
+
+        bucketed_variable, feature_id = (
+            self.local_bucketing.get_variable_for_user_protobuf(
+                user, key, default_value, timer
+            )
+        )
+        cache = self.config_manager.evaluation_cache
+        cache_key = cache.key(user, key, variable_type) if cache is not None else None
+        if cache is not None and cache_key is not None:
+            cache.put(cache_key, bucketed_variable, feature_id)
+        return bucketed_variable, feature_id
+
+    def _evaluate_without_wasm(
+        self,
+        user: DevCycleUser,
+        key: str,
+        variable_type: str,
+        default_value: Any,
+        count_miss: bool,
+    ) -> Optional[Tuple[Optional[Variable], Optional[str]]]:
+        """
+        Evaluates a variable served the same way to every user, or from the evaluation cache if a user with the
+        same targeting inputs has already been evaluated, queueing its evaluation event. Returns None if the
+        variable has to be evaluated by the WASM module.
+        """
+        unconditional = self.config_manager.unconditional_variable(key)
+        if unconditional is not None and unconditional.type == variable_type:
+            self.local_bucketing.record_variable_evaluated(
+                key, unconditional.feature_id, unconditional.variation_id
+            )
+            return unconditional.variable(default_value), unconditional.feature_id
+
+        cache = self.config_manager.evaluation_cache
+        cache_key = cache.key(user, key, variable_type) if cache is not None else None
+        if cache is None or cache_key is None:
+            return None
+
+        entry = cache.get(cache_key, count_miss)
+        if entry is None:
+            return None
+        if entry.variable is None:
+            self.local_bucketing.record_variable_defaulted(key)
+        elif entry.feature_id is not None and entry.variation_id is not None:
+            self.local_bucketing.record_variable_evaluated(
+                key, entry.feature_id, entry.variation_id, entry.eval_reason
+            )
+        return entry.variable_for(default_value), entry.feature_id
+
     def _generate_bucketed_config(self, user: DevCycleUser) -> BucketedConfig:
         """
         Generates a bucketed config for a user.  This method will return an empty config if the client has not been initialized or if the user is not bucketed into any features or variables
@@ -280,6 +418,24 @@ class DevCycleLocalClient(AbstractDevCycleClient):
         except Exception as e:
             logger.error(f"DevCycle: Error tracking event: {e}")
 
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns a snapshot of the SDK's metrics, or None if metrics are disabled. Histograms are returned as a dict
+        of their count, sum and cumulative bucket counts.
+        """
+        if self.metrics_registry is None:
+            return None
+        return self.metrics_registry.snapshot()
+
+    def evaluation_profile(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the time spent in each phase of the sampled variable evaluations, or None if evaluation profiling
+        is disabled. Times are estimated from fixed histogram buckets, apart from the means.
+        """
+        if self._profiler is None:
+            return None
+        return self._profiler.breakdown()
+
     def close(self) -> None:
         """
         Closes the client and releases any resources held by it.
@@ -0,0 +1,257 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from devcycle_python_sdk.api.bucketing_client import (
+    BucketingAPIClient,
+    _request_body_key,
+)
+from devcycle_python_sdk.api.backoff import exponential_backoff
+from devcycle_python_sdk.exceptions import (
+    APIClientUnauthorizedError,
+    CloudClientBadRequestError,
+    NotFoundError,
+)
+from devcycle_python_sdk.metrics import Counter, MetricsRegistry
+from devcycle_python_sdk.models.event import DevCycleEvent
+from devcycle_python_sdk.models.user import DevCycleUser
+from devcycle_python_sdk.options import DevCycleCloudOptions
+
+logger = logging.getLogger(__name__)
+
+
+class CloudEventQueueManager(threading.Thread):
+    """
+    Queues events tracked through the cloud client and sends them to the Bucketing API from a background thread,
+    grouped by user. The queue is flushed every event_flush_interval_ms, or as soon as it holds
+    event_request_chunk_size events. Events tracked while max_event_queue_size events are queued are dropped.
+
+    Batches that fail with a retryable error are put back at the front of the queue, as far as
+    max_event_queue_size allows, and the next flush is delayed with exponential backoff.
+    """
+
+    # Longest delay between flushes while the Bucketing API keeps failing
+    MAX_RETRY_DELAY = 60.0
+
+    def __init__(
+        self,
+        options: DevCycleCloudOptions,
+        bucketing_api: BucketingAPIClient,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        super().__init__()
+
+        self._options = options
+        self._bucketing_api = bucketing_api
+        self._queue_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Serialized user and events, keyed by user fingerprint in the order the users were first queued
+        self._queue: "OrderedDict[str, Tuple[dict, List[dict]]]" = OrderedDict()
+        self._queue_size = 0
+        self._wakeup = threading.Event()
+        self._exit = threading.Event()
+        self._exited = threading.Event()
+
+        self._consecutive_failures = 0
+        self._retry_at: Optional[float] = None
+
+        self.dropped_event_count = 0
+        self._dropped_counter: Optional[Counter] = None
+        self._requeued_counter: Optional[Counter] = None
+        if metrics is not None:
+            self._dropped_counter = metrics.counter(
+                "devcycle_cloud_events_dropped",
+                "Tracked events dropped because the queue was full or they could not be sent",
+            )
+            self._requeued_counter = metrics.counter(
+                "devcycle_cloud_events_requeued",
+                "Tracked events put back in the queue after a failed request",
+            )
+            metrics.gauge(
+                "devcycle_cloud_event_queue_size",
+                "Tracked events waiting to be sent",
+                self.queue_size,
+            )
+
+        self.daemon = True
+        self.start()
+
+    def queue_event(self, user: DevCycleUser, event: DevCycleEvent) -> None:
+        # The user and event are serialized now, so later changes by the caller don't affect the queued event
+        user_json = user.to_json()
+        event_json = event.to_json(use_bucketing_api_format=True)
+        fingerprint = _request_body_key(user_json)
+
+        with self._queue_lock:
+            if self._queue_size >= self._options.max_event_queue_size:
+                self._record_dropped(1)
+                queued_event = flush_needed = False
+            else:
+                queued = self._queue.get(fingerprint)
+                if queued is None:
+                    self._queue[fingerprint] = (user_json, [event_json])
+                else:
+                    queued[1].append(event_json)
+                self._queue_size += 1
+                flush_needed = (
+                    self._queue_size >= self._options.event_request_chunk_size
+                )
+                queued_event = True
+
+        if not queued_event:
+            logger.warning("DevCycle: Event queue is full, dropping user event")
+        elif flush_needed:
+            self._wakeup.set()
+
+    def queue_size(self) -> int:
+        with self._queue_lock:
+            return self._queue_size
+
+    def _flush_events(self, requeue: bool = True) -> int:
+        with self._flush_lock:
+            with self._queue_lock:
+                queue, self._queue = self._queue, OrderedDict()
+                self._queue_size = 0
+
+            event_count = 0
+            chunk_size = self._options.event_request_chunk_size
+            unsent: "OrderedDict[str, Tuple[dict, List[dict]]]" = OrderedDict()
+            for fingerprint, (user_json, events) in queue.items():
+                for start in range(0, len(events), chunk_size):
+                    if unsent:
+                        # The Bucketing API is failing, keep the remaining events for the next flush
+                        _add_events(unsent, fingerprint, user_json, events[start:])
+                        break
+                    chunk = events[start : start + chunk_size]
+                    try:
+                        self._bucketing_api.track_json(user_json, chunk)
+                        event_count += len(chunk)
+                    except APIClientUnauthorizedError:
+                        logger.warning(
+                            "DevCycle: SDK key is invalid, unable to send tracked events"
+                        )
+                        self._record_dropped(len(chunk))
+                    except Exception as e:
+                        if _is_retryable(e) and requeue:
+                            logger.warning(
+                                f"DevCycle: Error tracking events, retrying later: {e}"
+                            )
+                            _add_events(unsent, fingerprint, user_json, chunk)
+                        else:
+                            logger.error(
+                                f"DevCycle: Error tracking events, dropping {len(chunk)} events: {e}"
+                            )
+                            self._record_dropped(len(chunk))
+
+            if unsent:
+                self._requeue(unsent)
+                self._consecutive_failures += 1
+                self._retry_at = time.monotonic() + min(
+                    exponential_backoff(
+                        self._consecutive_failures, self._options.retry_delay / 1000.0
+                    ),
+                    self.MAX_RETRY_DELAY,
+                )
+            else:
+                self._consecutive_failures = 0
+                self._retry_at = None
+
+            if event_count:
+                logger.debug(
+                    f"DevCycle: Flushed {event_count} events, for {len(queue)} users"
+                )
+            return event_count
+
+    def _requeue(self, unsent: "OrderedDict[str, Tuple[dict, List[dict]]]") -> None:
+        """
+        Puts events that failed to send back at the front of the queue, ahead of the events queued since the
+        flush started. Events that don't fit in max_event_queue_size are dropped, newest first.
+        """
+        with self._queue_lock:
+            queued, self._queue = self._queue, OrderedDict()
+            space = self._options.max_event_queue_size - self._queue_size
+            requeued = dropped = 0
+            for fingerprint, (user_json, events) in unsent.items():
+                kept = events[: max(space - requeued, 0)]
+                if kept:
+                    _add_events(self._queue, fingerprint, user_json, kept)
+                requeued += len(kept)
+                dropped += len(events) - len(kept)
+            for fingerprint, (user_json, events) in queued.items():
+                _add_events(self._queue, fingerprint, user_json, events)
+            self._queue_size += requeued
+
+        if self._requeued_counter is not None:
+            self._requeued_counter.inc(requeued)
+        if dropped:
+            logger.warning(
+                f"DevCycle: Event queue is full, dropping {dropped} events that failed to send"
+            )
+            self._record_dropped(dropped)
+
+    def _record_dropped(self, count: int) -> None:
+        self.dropped_event_count += count
+        if self._dropped_counter is not None:
+            self._dropped_counter.inc(count)
+
+    def run(self):
+        interval = self._options.event_flush_interval_ms / 1000.0
+        while not self._exit.is_set():
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            retry_at = self._retry_at
+            if retry_at is not None:
+                # Back off after a failed flush, even when the queue fills up
+                self._exit.wait(max(retry_at - time.monotonic(), 0))
+            try:
+                self._flush_events()
+            except Exception as e:
+                logger.warning(f"DevCycle: flushing events: {str(e)}")
+
+        self._exited.set()
+
+    def close(self) -> None:
+        """
+        Stops the background thread and sends any events still queued
+        """
+        self._exit.set()
+        self._wakeup.set()
+        if not self._exited.wait(1.0):
+            logger.error(
+                "DevCycle: Timed out waiting for event flushing thread to stop"
+            )
+
+        try:
+            self._flush_events(requeue=False)
+        except Exception as e:
+            logger.warning(f"DevCycle: flushing events when closing client: {str(e)}")
+
+    def metrics(self) -> Dict[str, int]:
+        with self._queue_lock:
+            return {
+                "queued_events": self._queue_size,
+                "queued_users": len(self._queue),
+                "dropped_events": self.dropped_event_count,
+            }
+
+
+def _add_events(
+    queue: "OrderedDict[str, Tuple[dict, List[dict]]]",
+    fingerprint: str,
+    user_json: dict,
+    events: List[dict],
+) -> None:
+    queued = queue.get(fingerprint)
+    if queued is None:
+        queue[fingerprint] = (user_json, list(events))
+    else:
+        queued[1].extend(events)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Server errors, timeouts and an open circuit are retried, rejected requests are not
+    """
+    return not isinstance(error, (CloudClientBadRequestError, NotFoundError))
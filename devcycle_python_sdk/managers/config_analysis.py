@@ -0,0 +1,380 @@
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from devcycle_python_sdk.models.eval_reason import EvalReason, EvalReasons
+from devcycle_python_sdk.models.user import DevCycleUser
+from devcycle_python_sdk.models.variable import TypeEnum, Variable
+
+logger = logging.getLogger(__name__)
+
+# The config fields that are understood by the analysis. Features, targets or audiences with any other field
+# might be evaluated differently, so their variables are left to the WASM module.
+_FEATURE_FIELDS = {"_id", "key", "type", "variations", "configuration"}
+_CONFIGURATION_FIELDS = {"_id", "targets", "forcedUsers"}
+_TARGET_FIELDS = {"_id", "_audience", "distribution"}
+_AUDIENCE_FIELDS = {"_id", "filters"}
+
+# The DevCycleUser attribute compared by each user filter sub type, apart from customData
+_USER_FILTER_ATTRIBUTES = {
+    "user_id": "user_id",
+    "email": "email",
+    "country": "country",
+    "platform": "platform",
+    "platformVersion": "platformVersion",
+    "appVersion": "appVersion",
+    "deviceModel": "deviceModel",
+}
+
+# Distinguishes custom data keys that are missing from keys set to None
+_MISSING = object()
+
+
+@dataclass(order=False)
+class UnconditionalVariable:
+    """
+    A variable whose value doesn't depend on the user, because its feature's first target serves a single
+    variation to all users. JSON values are kept serialized, so each evaluation gets its own copy.
+    """
+
+    key: str
+    type: str
+    value: Any
+    feature_id: str
+    variation_id: str
+    target_id: str
+
+    def variable(self, default_value: Any) -> Variable:
+        """
+        Returns the variable as it would be evaluated by the WASM module
+        """
+        value = self.value
+        if self.type == TypeEnum.JSON:
+            value = json.loads(value)
+        elif self.type == TypeEnum.NUMBER:
+            value = float(value)
+        return Variable(
+            _id=None,
+            key=self.key,
+            type=self.type,
+            value=value,
+            isDefaulted=False,
+            defaultValue=default_value,
+            eval=EvalReason(
+                reason=EvalReasons.TARGETING_MATCH,
+                details="All Users",
+                target_id=self.target_id,
+            ),
+        )
+
+
+@dataclass(order=False)
+class VariableInputs:
+    """
+    The user attributes and custom data keys that a variable's evaluation depends on in a config, and the value
+    of the variable in each variation that each target can serve.
+    """
+
+    user_attributes: Tuple[str, ...]
+    custom_data_keys: Tuple[str, ...]
+    target_values: Dict[str, Dict[str, Any]]
+
+    def user_key(self, user: DevCycleUser) -> Tuple:
+        """
+        Returns the user's values of the inputs. Users with the same values get the same evaluation.
+        """
+        values: List[Any] = [getattr(user, name) for name in self.user_attributes]
+        if self.custom_data_keys:
+            custom_data = user.customData or {}
+            private_custom_data = user.privateCustomData or {}
+            for key in self.custom_data_keys:
+                # Includes the value types, as 1, 1.0 and True are equal but don't match the same filters
+                value = custom_data.get(key, _MISSING)
+                private_value = private_custom_data.get(key, _MISSING)
+                values.append((type(value), value, type(private_value), private_value))
+        return tuple(values)
+
+    def variation_id(self, target_id: Optional[str], value: Any) -> Optional[str]:
+        """
+        Returns the variation that served the value from the target, or None if it's ambiguous
+        """
+        if target_id is None:
+            return None
+        matches = [
+            variation_id
+            for variation_id, variation_value in self.target_values.get(
+                target_id, {}
+            ).items()
+            if variation_value == value
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+
+def variable_keys(config: dict) -> FrozenSet[str]:
+    """
+    Returns the keys of the variables in the config
+    """
+    return frozenset(
+        variable["key"]
+        for variable in config.get("variables") or []
+        if isinstance(variable, dict) and "key" in variable
+    )
+
+
+def unconditional_variables(config: dict) -> Dict[str, UnconditionalVariable]:
+    """
+    Returns the variables in the config that are served the same way to every user, by key. Only config
+    shapes that are known to be evaluated without the user are considered; anything else is left out.
+    """
+    try:
+        return _unconditional_variables(config)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.debug(f"DevCycle: Unable to analyze config variables: {e}")
+        return {}
+
+
+def _unconditional_variables(config: dict) -> Dict[str, UnconditionalVariable]:
+    variables = {
+        variable["_id"]: variable for variable in config.get("variables") or []
+    }
+
+    # Variables that are in more than one feature are served by whichever the user is bucketed into first
+    features_by_variable: Dict[str, List[str]] = {}
+    for feature in config.get("features") or []:
+        for variation in feature.get("variations") or []:
+            for variation_variable in variation.get("variables") or []:
+                feature_ids = features_by_variable.setdefault(
+                    variation_variable["_var"], []
+                )
+                if feature["_id"] not in feature_ids:
+                    feature_ids.append(feature["_id"])
+
+    result: Dict[str, UnconditionalVariable] = {}
+    for feature in config.get("features") or []:
+        served = _unconditional_variation(feature)
+        if served is None:
+            continue
+        variation, target_id = served
+        for variation_variable in variation.get("variables") or []:
+            variable = variables.get(variation_variable["_var"])
+            if (
+                variable is None
+                or len(features_by_variable[variable["_id"]]) != 1
+                or not _value_matches_type(
+                    variation_variable["value"], variable["type"]
+                )
+            ):
+                continue
+            value = variation_variable["value"]
+            if variable["type"] == TypeEnum.JSON:
+                value = json.dumps(value)
+            result[variable["key"]] = UnconditionalVariable(
+                key=variable["key"],
+                type=variable["type"],
+                value=value,
+                feature_id=feature["_id"],
+                variation_id=variation["_id"],
+                target_id=target_id,
+            )
+    return result
+
+
+def _known_feature(feature: dict) -> bool:
+    configuration = feature.get("configuration")
+    return (
+        set(feature) <= _FEATURE_FIELDS
+        and isinstance(configuration, dict)
+        and set(configuration) <= _CONFIGURATION_FIELDS
+    )
+
+
+def _known_target(target: dict) -> bool:
+    audience = target.get("_audience")
+    return (
+        set(target) <= _TARGET_FIELDS
+        and isinstance(audience, dict)
+        and set(audience) <= _AUDIENCE_FIELDS
+    )
+
+
+def _unconditional_variation(feature: dict) -> Optional[tuple]:
+    # Returns the variation and target ID if the feature's first target serves one variation to all users
+    if not _known_feature(feature):
+        return None
+    configuration = feature["configuration"]
+    if configuration.get("forcedUsers") or not configuration.get("targets"):
+        return None
+
+    target = configuration["targets"][0]
+    if not _known_target(target):
+        return None
+
+    filters = target["_audience"].get("filters") or {}
+    audience_filters = filters.get("filters") or []
+    if (
+        filters.get("operator") not in ("and", "or")
+        or len(audience_filters) != 1
+        or audience_filters[0].get("type") != "all"
+    ):
+        return None
+
+    distribution = target.get("distribution") or []
+    if len(distribution) != 1 or distribution[0].get("percentage") != 1:
+        return None
+
+    for variation in feature.get("variations") or []:
+        if variation["_id"] == distribution[0]["_variation"]:
+            return variation, target["_id"]
+    return None
+
+
+def _value_matches_type(value: Any, variable_type: str) -> bool:
+    if variable_type == TypeEnum.BOOLEAN:
+        return isinstance(value, bool)
+    elif variable_type == TypeEnum.STRING:
+        return isinstance(value, str)
+    elif variable_type == TypeEnum.NUMBER:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    elif variable_type == TypeEnum.JSON:
+        return isinstance(value, dict)
+    return False
+
+
+def variable_inputs(config: dict) -> Dict[str, VariableInputs]:
+    """
+    Returns the inputs of the variables in the config whose evaluation depends only on the user, by key.
+    Variables in features with rollouts, which change over time, or with config fields or filters that aren't
+    understood by the analysis are left out.
+    """
+    try:
+        return _variable_inputs(config)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.debug(f"DevCycle: Unable to analyze config variables: {e}")
+        return {}
+
+
+def _variable_inputs(config: dict) -> Dict[str, VariableInputs]:
+    variables = {
+        variable["_id"]: variable for variable in config.get("variables") or []
+    }
+    audiences = config.get("audiences") or {}
+
+    features_by_variable: Dict[str, List[dict]] = {}
+    for feature in config.get("features") or []:
+        for variation in feature.get("variations") or []:
+            for variation_variable in variation.get("variables") or []:
+                features = features_by_variable.setdefault(
+                    variation_variable["_var"], []
+                )
+                if not any(other is feature for other in features):
+                    features.append(feature)
+
+    result: Dict[str, VariableInputs] = {}
+    for variable_id, features in features_by_variable.items():
+        variable = variables.get(variable_id)
+        if variable is None:
+            continue
+        inputs = _inputs(variable_id, features, audiences)
+        if inputs is not None:
+            result[variable["key"]] = inputs
+    return result
+
+
+def _inputs(
+    variable_id: str, features: List[dict], audiences: dict
+) -> Optional[VariableInputs]:
+    user_attributes: Set[str] = set()
+    custom_data_keys: Set[str] = set()
+    target_values: Dict[str, Dict[str, Any]] = {}
+    for feature in features:
+        if not _known_feature(feature):
+            return None
+        configuration = feature["configuration"]
+        if configuration.get("forcedUsers"):
+            user_attributes.add("user_id")
+
+        values = {
+            variation["_id"]: variation_variable["value"]
+            for variation in feature.get("variations") or []
+            for variation_variable in variation.get("variables") or []
+            if variation_variable["_var"] == variable_id
+        }
+        for target in configuration.get("targets") or []:
+            if not _known_target(target) or not _add_filter_inputs(
+                target["_audience"].get("filters") or {},
+                audiences,
+                user_attributes,
+                custom_data_keys,
+                set(),
+            ):
+                return None
+            served = [
+                distribution["_variation"]
+                for distribution in target.get("distribution") or []
+                if distribution.get("percentage", 0) > 0
+            ]
+            # Users are bucketed into one of the variations by a hash of their user_id
+            if len(served) > 1:
+                user_attributes.add("user_id")
+            target_values[target["_id"]] = {
+                variation_id: values[variation_id]
+                for variation_id in served
+                if variation_id in values
+            }
+
+    return VariableInputs(
+        user_attributes=tuple(sorted(user_attributes)),
+        custom_data_keys=tuple(sorted(custom_data_keys)),
+        target_values=target_values,
+    )
+
+
+def _add_filter_inputs(
+    filters: dict,
+    audiences: dict,
+    user_attributes: Set[str],
+    custom_data_keys: Set[str],
+    seen_audiences: Set[str],
+) -> bool:
+    # Adds the inputs of the filters, returning false if any filter isn't understood
+    for audience_filter in filters.get("filters") or []:
+        filter_type = audience_filter.get("type")
+        if filter_type == "user":
+            sub_type = audience_filter.get("subType")
+            if sub_type == "customData":
+                data_key = audience_filter.get("dataKey")
+                if not isinstance(data_key, str):
+                    return False
+                custom_data_keys.add(data_key)
+            elif sub_type in _USER_FILTER_ATTRIBUTES:
+                user_attributes.add(_USER_FILTER_ATTRIBUTES[sub_type])
+            else:
+                return False
+        elif filter_type == "audienceMatch":
+            for audience_id in audience_filter.get("_audiences") or []:
+                if audience_id in seen_audiences:
+                    continue
+                seen_audiences.add(audience_id)
+                audience = audiences.get(audience_id)
+                if not isinstance(audience, dict) or not _add_filter_inputs(
+                    audience.get("filters") or {},
+                    audiences,
+                    user_attributes,
+                    custom_data_keys,
+                    seen_audiences,
+                ):
+                    return False
+        elif filter_type != "all":
+            return False
+
+        # Nested filter groups
+        if audience_filter.get("filters") and not _add_filter_inputs(
+            audience_filter,
+            audiences,
+            user_attributes,
+            custom_data_keys,
+            seen_audiences,
+        ):
+            return False
+    return True
@@ -3,7 +3,7 @@ import logging
 import threading
 import time
 from datetime import datetime
-from typing import Optional
+from typing import Dict, FrozenSet, Optional
 
 import ld_eventsource.actions
 
@@ -16,7 +16,15 @@ from devcycle_python_sdk.exceptions import (
 from wsgiref.handlers import format_date_time
 from devcycle_python_sdk.options import DevCycleLocalOptions
 from devcycle_python_sdk.managers.sse_manager import SSEManager
+from devcycle_python_sdk.managers.config_analysis import (
+    UnconditionalVariable,
+    unconditional_variables,
+    variable_inputs,
+    variable_keys,
+)
+from devcycle_python_sdk.managers.evaluation_cache import EvaluationCache
 from devcycle_python_sdk.models.config_metadata import ConfigMetadata
+from devcycle_python_sdk.metrics import Counter, MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -27,18 +35,26 @@ class EnvironmentConfigManager(threading.Thread):
         sdk_key: str,
         options: DevCycleLocalOptions,
         local_bucketing: LocalBucketing,
+        metrics: Optional[MetricsRegistry] = None,
     ):
         super().__init__()
 
         self._sdk_key = sdk_key
         self._options = options
         self._local_bucketing = local_bucketing
+        self._metrics = metrics
         self._sse_manager: Optional[SSEManager] = None
         self._sse_polling_interval = 1000 * 60 * 15 * 60
         self._sse_connected = False
         self._config: Optional[dict] = None
         self._config_etag: Optional[str] = None
         self._config_lastmodified: Optional[str] = None
+        self._config_updated_at: Optional[float] = None
+        # The keys of the variables in the config, so unknown variables can be defaulted without evaluating them
+        self._variable_keys: Optional[FrozenSet[str]] = None
+        # Variables served the same way to every user, which can be evaluated without the WASM module
+        self._unconditional_variables: Dict[str, UnconditionalVariable] = {}
+        self._evaluation_cache: Optional[EvaluationCache] = None
 
         # Exponential backoff configuration
         self._sse_reconnect_attempts = 0
@@ -48,6 +64,38 @@ class EnvironmentConfigManager(threading.Thread):
         self._sse_reconnecting = False
         self._config_api_client = ConfigAPIClient(self._sdk_key, self._options)
 
+        self._config_updates: Optional[Counter] = None
+        self._config_fetch_errors: Optional[Counter] = None
+        self._sse_reconnects: Optional[Counter] = None
+        self._evaluation_cache_hits: Optional[Counter] = None
+        self._evaluation_cache_misses: Optional[Counter] = None
+        if metrics is not None:
+            metrics.gauge(
+                "devcycle_config_age_seconds",
+                "Seconds since the current config was fetched",
+                self._config_age,
+            )
+            self._config_updates = metrics.counter(
+                "devcycle_config_updates", "New configs fetched from the config CDN"
+            )
+            self._config_fetch_errors = metrics.counter(
+                "devcycle_config_fetch_errors", "Failed config CDN requests"
+            )
+            self._sse_reconnects = metrics.counter(
+                "devcycle_sse_reconnects",
+                "Attempts to reconnect to the realtime updates stream",
+            )
+            if options.enable_evaluation_cache:
+                self._evaluation_cache_hits = metrics.counter(
+                    "devcycle_evaluation_cache_hits",
+                    "Variable evaluations answered from the evaluation cache",
+                )
+                self._evaluation_cache_misses = metrics.counter(
+                    "devcycle_evaluation_cache_misses",
+                    "Cacheable variable evaluations that weren't in the evaluation cache",
+                )
+
+        self._initialized = threading.Event()
         self._polling_enabled = True
         self.daemon = True
         self.start()
@@ -55,6 +103,19 @@ class EnvironmentConfigManager(threading.Thread):
     def is_initialized(self) -> bool:
         return self._config is not None
 
+    def _config_age(self) -> Optional[float]:
+        if self._config_updated_at is None:
+            return None
+        return time.monotonic() - self._config_updated_at
+
+    def wait_for_initialization(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the first config has been stored in the bucketing library, or until timeout seconds have passed
+
+        :return: True if the config was stored, False if the wait timed out
+        """
+        return self._initialized.wait(timeout)
+
     def _recreate_sse_connection(self):
         """Recreate the SSE connection with the current config."""
         if self._config is None or self._options.disable_realtime_updates:
@@ -78,6 +139,7 @@ class EnvironmentConfigManager(threading.Thread):
                 self.sse_state,
                 self.sse_error,
                 self.sse_message,
+                self._metrics,
             )
             self._sse_manager.update(self._config)
 
@@ -91,6 +153,8 @@ class EnvironmentConfigManager(threading.Thread):
                 f"DevCycle: Waiting {delay_seconds}s before reconnecting SSE..."
             )
             time.sleep(delay_seconds)
+            if self._sse_reconnects is not None:
+                self._sse_reconnects.inc()
             self._recreate_sse_connection()
         except Exception as e:
             logger.error(f"DevCycle: Error during delayed SSE reconnection: {e}")
@@ -127,8 +191,30 @@ class EnvironmentConfigManager(threading.Thread):
             self._config_etag = new_etag
             self._config_lastmodified = new_lastmodified
 
+            new_variable_keys = variable_keys(new_config)
+            new_unconditional_variables = unconditional_variables(new_config)
+            new_evaluation_cache = None
+            if self._options.enable_evaluation_cache:
+                new_evaluation_cache = EvaluationCache(
+                    variable_inputs(new_config),
+                    self._options.evaluation_cache_max_entries,
+                    self._evaluation_cache_hits,
+                    self._evaluation_cache_misses,
+                )
+            # Until the new config is stored, keys from either config may be evaluated, and only by the WASM module
+            if self._variable_keys is not None:
+                self._variable_keys = self._variable_keys | new_variable_keys
+            self._unconditional_variables = {}
+            self._evaluation_cache = None
             json_config = json.dumps(self._config)
             self._local_bucketing.store_config(json_config)
+            self._variable_keys = new_variable_keys
+            self._unconditional_variables = new_unconditional_variables
+            self._evaluation_cache = new_evaluation_cache
+            self._config_updated_at = time.monotonic()
+            if self._config_updates is not None:
+                self._config_updates.inc()
+            self._initialized.set()
             if not self._options.disable_realtime_updates:
                 if (
                     self._sse_manager is None
@@ -151,13 +237,46 @@ class EnvironmentConfigManager(threading.Thread):
                         f"DevCycle: Error received from on_client_initialized callback: {str(e)}"
                     )
         except APIClientError as e:
+            if self._config_fetch_errors is not None:
+                self._config_fetch_errors.inc()
             logger.warning(f"DevCycle: Config fetch failed. Status: {str(e)}")
         except APIClientUnauthorizedError:
+            if self._config_fetch_errors is not None:
+                self._config_fetch_errors.inc()
             logger.error(
                 "DevCycle: Error initializing DevCycle: Invalid SDK key provided."
             )
             self._polling_enabled = False
 
+    def has_variable(self, key: str) -> bool:
+        """
+        Returns false if the variable key isn't in the current config, true if it is or there is no config yet
+        """
+        variable_keys = self._variable_keys
+        return variable_keys is None or key in variable_keys
+
+    def unconditional_variable(self, key: str) -> Optional[UnconditionalVariable]:
+        """
+        Returns the variable if it's served the same way to every user by the current config, otherwise None
+        """
+        return self._unconditional_variables.get(key)
+
+    @property
+    def evaluation_cache(self) -> Optional[EvaluationCache]:
+        """
+        The evaluation cache for the current config, or None if caching is disabled or there is no config yet
+        """
+        return self._evaluation_cache
+
+    def reset_evaluation_cache(self) -> None:
+        """
+        Replaces the evaluation cache with an empty one, for when something other than the config changes
+        evaluations. Evaluations that are in progress add their results to the old cache.
+        """
+        evaluation_cache = self._evaluation_cache
+        if evaluation_cache is not None:
+            self._evaluation_cache = evaluation_cache.empty_copy()
+
     def get_config_metadata(self) -> Optional[ConfigMetadata]:
         return self._local_bucketing.get_config_metadata()
 
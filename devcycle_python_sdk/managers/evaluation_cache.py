@@ -0,0 +1,155 @@
+import copy
+import dataclasses
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from devcycle_python_sdk.managers.config_analysis import VariableInputs
+from devcycle_python_sdk.metrics import Counter
+from devcycle_python_sdk.models.eval_reason import EvalReasons
+from devcycle_python_sdk.models.user import DevCycleUser
+from devcycle_python_sdk.models.variable import Variable
+
+
+class CachedEvaluation:
+    """
+    A cached variable evaluation. variable is None if the user was not served the variable. eval_reason is the
+    evaluation's reason, which the evaluation events for cache hits are counted under.
+    """
+
+    __slots__ = ("variable", "feature_id", "variation_id", "eval_reason")
+
+    def __init__(
+        self,
+        variable: Optional[Variable],
+        feature_id: Optional[str],
+        variation_id: Optional[str],
+        eval_reason: str = EvalReasons.TARGETING_MATCH,
+    ):
+        self.variable = variable
+        self.feature_id = feature_id
+        self.variation_id = variation_id
+        self.eval_reason = eval_reason
+
+    def variable_for(self, default_value: Any) -> Optional[Variable]:
+        """
+        Returns a copy of the cached variable with the caller's default value, so callers can't modify the
+        cached objects
+        """
+        if self.variable is None:
+            return None
+        return dataclasses.replace(
+            self.variable,
+            value=copy.deepcopy(self.variable.value),
+            defaultValue=default_value,
+            eval=(
+                dataclasses.replace(self.variable.eval)
+                if self.variable.eval is not None
+                else None
+            ),
+        )
+
+
+class EvaluationCache:
+    """
+    A bounded cache of variable evaluations for one config, evicting the least recently used entry first.
+
+    Entries are keyed on the variable, the default value's type and only the user attributes and custom data
+    keys that the variable's targeting uses, so users that differ in other attributes share entries. Variables
+    whose evaluation doesn't depend only on the user, such as those in features with rollouts, aren't cached.
+    A new cache is created for each config.
+    """
+
+    def __init__(
+        self,
+        inputs: Dict[str, VariableInputs],
+        max_entries: int,
+        hits: Optional[Counter] = None,
+        misses: Optional[Counter] = None,
+    ):
+        self.inputs = inputs
+        self.max_entries = max_entries
+        self._hit_counter = hits
+        self._miss_counter = misses
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, CachedEvaluation]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self, user: DevCycleUser, variable_key: str, variable_type: str
+    ) -> Optional[Tuple]:
+        """
+        Returns the cache key for the evaluation, or None if it can't be cached
+        """
+        inputs = self.inputs.get(variable_key)
+        if inputs is None:
+            return None
+        try:
+            cache_key = (variable_key, variable_type, inputs.user_key(user))
+            hash(cache_key)
+        except TypeError:
+            # custom data values that can't be hashed
+            return None
+        return cache_key
+
+    def get(
+        self, cache_key: Tuple, count_miss: bool = True
+    ) -> Optional[CachedEvaluation]:
+        """
+        Returns the cached evaluation, or None if there isn't one. A lookup that is tried again after a miss can
+        set count_miss to False, so the miss is only counted once.
+        """
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                if not count_miss:
+                    return None
+                self.misses += 1
+            else:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+
+        counter = self._miss_counter if entry is None else self._hit_counter
+        if counter is not None:
+            counter.inc()
+        return entry
+
+    def put(
+        self,
+        cache_key: Tuple,
+        variable: Optional[Variable],
+        feature_id: Optional[str],
+    ) -> None:
+        variation_id = None
+        eval_reason = EvalReasons.TARGETING_MATCH
+        if variable is not None:
+            # The variation is needed to queue the evaluation event for cache hits
+            variation_id = self.inputs[cache_key[0]].variation_id(
+                variable.eval.target_id if variable.eval is not None else None,
+                variable.value,
+            )
+            if variation_id is None:
+                return
+            if variable.eval is not None:
+                eval_reason = variable.eval.reason
+
+        entry = CachedEvaluation(variable, feature_id, variation_id, eval_reason)
+        with self._lock:
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def empty_copy(self) -> "EvaluationCache":
+        """
+        Returns an empty cache for the same config
+        """
+        return EvaluationCache(
+            self.inputs, self.max_entries, self._hit_counter, self._miss_counter
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
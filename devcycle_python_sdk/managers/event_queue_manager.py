@@ -1,23 +1,33 @@
 import threading
 import logging
 import json
-from typing import Optional
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Union
 
 from devcycle_python_sdk.options import DevCycleLocalOptions
 from devcycle_python_sdk.api.local_bucketing import LocalBucketing
+from devcycle_python_sdk.api.backoff import exponential_backoff
 from devcycle_python_sdk.api.event_client import EventAPIClient
 from devcycle_python_sdk.exceptions import (
+    APIClientBadRequestError,
     APIClientError,
     APIClientUnauthorizedError,
+    EventBatchPartiallySentError,
     NotFoundError,
 )
 from devcycle_python_sdk.models.event import (
     FlushPayload,
+    RawFlushPayload,
     DevCycleEvent,
     EventType,
 )
 from devcycle_python_sdk.models.user import DevCycleUser
 from devcycle_python_sdk.models.bucketed_config import BucketedConfig
+from devcycle_python_sdk.managers.event_spool import EventSpool
+from devcycle_python_sdk.managers.flush_scheduler import FlushReason, FlushScheduler
+from devcycle_python_sdk.util.json_fragments import split_json_array
+from devcycle_python_sdk.metrics import Counter, Histogram, MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +43,7 @@ class EventQueueManager(threading.Thread):
         client_uuid: str,
         options: DevCycleLocalOptions,
         local_bucketing: LocalBucketing,
+        metrics: Optional[MetricsRegistry] = None,
     ):
         super().__init__()
 
@@ -47,6 +58,55 @@ class EventQueueManager(threading.Thread):
         self._exit = threading.Event()
         self._exited = threading.Event()
 
+        # Payloads that fail with retryable errors are moved to the spool file, if one is configured
+        self._event_spool: Optional[EventSpool] = None
+        self._spool_drain_attempts = 0
+        self._next_spool_drain_time = 0.0
+        self._max_spool_drain_interval = 300.0  # Cap at 5 minutes
+        if self._options.event_spool_path:
+            try:
+                self._event_spool = EventSpool(
+                    self._options.event_spool_path, self._options.event_spool_max_bytes
+                )
+            except (OSError, ValueError) as e:
+                logger.error(f"DevCycle: Unable to open event spool file: {str(e)}")
+
+        # Records left unsent when a chunked payload partially fails, retried before the next flushed payloads.
+        # The WASM module can only retry whole payloads, which would send the delivered records again.
+        self._unsent_payloads: Deque[Union[FlushPayload, RawFlushPayload]] = deque()
+        self._unsent_event_count = 0
+
+        self._flush_seconds: Optional[Histogram] = None
+        self._events_published: Optional[Counter] = None
+        self._publish_failures: Optional[Counter] = None
+        self._events_dropped: Optional[Counter] = None
+        if metrics is not None:
+            metrics.gauge(
+                "devcycle_event_queue_depth",
+                "Events waiting in the event queue",
+                self._queue_depth,
+            )
+            self._flush_seconds = metrics.histogram(
+                "devcycle_event_flush_seconds",
+                "Time taken to flush the event queue and publish its payloads",
+            )
+            self._events_published = metrics.counter(
+                "devcycle_events_published", "Events sent to the Events API"
+            )
+            self._publish_failures = metrics.counter(
+                "devcycle_event_publish_failures",
+                "Event payloads that failed to be sent to the Events API",
+            )
+            self._events_dropped = metrics.counter(
+                "devcycle_events_dropped",
+                "Events dropped because the event queue was full or the Events API rejected them",
+            )
+
+        # When adaptive flushing is enabled, flushes are triggered by the scheduler instead of a fixed interval
+        self._flush_scheduler: Optional[FlushScheduler] = None
+        if self._options.enable_adaptive_event_flushing:
+            self._flush_scheduler = FlushScheduler(self._options, metrics)
+
         # Setup the event queue inside the WASM module
         event_options_json = json.dumps(self._options.event_queue_options())
         self._local_bucketing.init_event_queue(client_uuid, event_options_json)
@@ -69,6 +129,8 @@ class EventQueueManager(threading.Thread):
     def _stop_running(self) -> None:
         # Indicate to the thread that it should stop running, interrupting any sleep
         self._exit.set()
+        if self._flush_scheduler is not None:
+            self._flush_scheduler.wake()
 
     def _sleep(self) -> bool:
         # Returns true if the sleep was interrupted, false otherwise
@@ -88,14 +150,18 @@ class EventQueueManager(threading.Thread):
             return 0
 
         with self._flush_lock:
-            payloads = []
+            payloads: Sequence[Union[FlushPayload, RawFlushPayload]] = []
             try:
-                payloads = self._local_bucketing.flush_event_queue()
+                if self._options.enable_raw_event_payloads:
+                    payloads = self._local_bucketing.flush_event_queue_raw()
+                else:
+                    payloads = self._local_bucketing.flush_event_queue()
             except Exception as e:
                 logger.error(f"DevCycle: Error flushing event payloads: {str(e)}")
 
-            event_count = 0
+            event_count = self._retry_unsent_payloads()
             if payloads:
+                start = time.perf_counter()
                 logger.debug(f"DevCycle: Flush {len(payloads)} event payloads")
                 for payload in payloads:
                     event_count += payload.eventCount
@@ -103,31 +169,229 @@ class EventQueueManager(threading.Thread):
                 logger.debug(
                     f"DevCycle: Flush {event_count} events, for {len(payloads)} users"
                 )
+                if self._flush_seconds is not None:
+                    self._flush_seconds.observe(time.perf_counter() - start)
             return event_count
 
-    def _publish_event_payload(self, payload: FlushPayload) -> None:
-        if payload and payload.records:
-            try:
+    def _retry_unsent_payloads(self) -> int:
+        # Sends the records left over from partially sent payloads, oldest first, until one fails.
+        # Returns the number of events sent
+        sent = 0
+        while self._unsent_payloads:
+            payload = self._unsent_payloads.popleft()
+            self._unsent_event_count -= payload.eventCount
+            if not self._publish_event_payload(payload, queued_in_wasm=False):
+                break
+            sent += payload.eventCount
+        return sent
+
+    def _publish_event_payload(
+        self,
+        payload: Union[FlushPayload, RawFlushPayload],
+        queued_in_wasm: bool = True,
+    ) -> bool:
+        # Returns false if the payload failed and is being kept for a retry, true otherwise. Payloads that aren't
+        # queued_in_wasm are records left over from a partially sent payload, which are retried from Python.
+        if not payload or not payload.records:
+            return True
+
+        try:
+            if isinstance(payload, RawFlushPayload):
+                self._event_api_client.publish_raw_events(payload.records)
+            else:
                 self._event_api_client.publish_events(payload.records)
+            if queued_in_wasm:
+                self._local_bucketing.on_event_payload_success(payload.payloadId)
+            if self._events_published is not None:
+                self._events_published.inc(payload.eventCount)
+            if self._flush_scheduler is not None:
+                self._flush_scheduler.on_publish_success()
+            return True
+        except APIClientUnauthorizedError:
+            logger.error(
+                "DevCycle: Unauthorized to publish events, please check your SDK key"
+            )
+            # stop the thread
+            self._stop_running()
+            self._record_publish_failure(payload, dropped=True)
+            if queued_in_wasm:
+                self._local_bucketing.on_event_payload_failure(payload.payloadId, False)
+            return True
+        except NotFoundError as e:
+            logger.error(
+                f"DevCycle: Unable to reach the DevCycle Events API service: {str(e)}"
+            )
+            self._stop_running()
+            self._record_publish_failure(payload, dropped=True)
+            if queued_in_wasm:
+                self._local_bucketing.on_event_payload_failure(payload.payloadId, False)
+            return True
+        except EventBatchPartiallySentError as e:
+            logger.warning(
+                f"DevCycle: Error publishing events to DevCycle Events API service: {str(e)}"
+            )
+            unsent = RawFlushPayload(
+                payloadId=payload.payloadId,
+                records=e.unsent_records,
+                eventCount=_count_events(e.unsent_records),
+            )
+            self._record_publish_failure(payload, dropped=False)
+            if self._events_published is not None:
+                self._events_published.inc(payload.eventCount - unsent.eventCount)
+            # The delivered records are done with, so only the unsent ones are kept
+            if queued_in_wasm:
                 self._local_bucketing.on_event_payload_success(payload.payloadId)
-            except APIClientUnauthorizedError:
+            self._keep_unsent_payload(
+                unsent,
+                retryable=not isinstance(e.__cause__, APIClientBadRequestError),
+                first=not queued_in_wasm,
+            )
+            return False
+        except APIClientError as e:
+            logger.warning(
+                f"DevCycle: Error publishing events to DevCycle Events API service: {str(e)}"
+            )
+            self._record_publish_failure(payload, dropped=False)
+            retryable = not isinstance(e, APIClientBadRequestError)
+            if not queued_in_wasm:
+                return self._keep_unsent_payload(payload, retryable, first=True)
+
+            if retryable and self._flush_scheduler is not None:
+                self._flush_scheduler.on_publish_failure()
+            if retryable and self._spool_payload(payload):
+                # The spool now owns these events, so they can be purged from the WASM queue
+                self._local_bucketing.on_event_payload_success(payload.payloadId)
+            else:
+                self._local_bucketing.on_event_payload_failure(payload.payloadId, True)
+            return False
+
+    def _keep_unsent_payload(
+        self,
+        payload: Union[FlushPayload, RawFlushPayload],
+        retryable: bool,
+        first: bool = False,
+    ) -> bool:
+        # Keeps records that weren't sent for a retry, in the spool if there is one. Returns true if they were
+        # dropped instead, false if they were kept
+        if not retryable:
+            logger.error(
+                f"DevCycle: Events API rejected {payload.eventCount} events, dropping them"
+            )
+            self._record_publish_failure(payload, dropped=True)
+            return True
+
+        if self._flush_scheduler is not None:
+            self._flush_scheduler.on_publish_failure()
+        if self._spool_payload(payload):
+            return False
+
+        if (
+            self._unsent_event_count + payload.eventCount
+            > self._options.max_event_queue_size
+        ):
+            logger.warning(
+                f"DevCycle: Too many unsent events, dropping {payload.eventCount} events"
+            )
+            self._record_publish_failure(payload, dropped=True)
+            return True
+
+        if first:
+            self._unsent_payloads.appendleft(payload)
+        else:
+            self._unsent_payloads.append(payload)
+        self._unsent_event_count += payload.eventCount
+        return False
+
+    def _record_publish_failure(
+        self, payload: Union[FlushPayload, RawFlushPayload], dropped: bool
+    ) -> None:
+        if self._publish_failures is not None:
+            self._publish_failures.inc()
+        if dropped and self._events_dropped is not None:
+            self._events_dropped.inc(payload.eventCount)
+
+    def _spool_payload(self, payload: Union[FlushPayload, RawFlushPayload]) -> bool:
+        # Returns true if the payload was written to the spool, false otherwise
+        if self._event_spool is None:
+            return False
+
+        if isinstance(payload, RawFlushPayload):
+            records_json = "[" + ", ".join(payload.records) + "]"
+        else:
+            records_json = json.dumps([record.to_json() for record in payload.records])
+
+        self._back_off_spool_drain()
+        if self._event_spool.append(records_json.encode("utf-8")):
+            return True
+
+        logger.warning(
+            "DevCycle: Event spool is full, events will be kept in the event queue"
+        )
+        return False
+
+    def _back_off_spool_drain(self) -> None:
+        # Delay the next attempt to drain the spool, as the Events API is failing
+        self._spool_drain_attempts += 1
+        delay = min(
+            exponential_backoff(
+                self._spool_drain_attempts, self._options.event_retry_delay_ms / 1000.0
+            ),
+            self._max_spool_drain_interval,
+        )
+        self._next_spool_drain_time = time.monotonic() + delay
+
+    def _drain_event_spool(self) -> int:
+        # Sends the spooled payloads to the Events API, oldest first, until the spool is empty or a request fails.
+        # Returns the number of payloads sent
+        if self._event_spool is None or time.monotonic() < self._next_spool_drain_time:
+            return 0
+
+        sent = 0
+        while self._should_run():
+            entry = self._event_spool.peek()
+            if entry is None:
+                break
+
+            try:
+                records = split_json_array(entry.decode("utf-8"))[0]
+                self._event_api_client.publish_raw_events(records)
+                sent += 1
+            except (APIClientUnauthorizedError, NotFoundError) as e:
                 logger.error(
-                    "DevCycle: Unauthorized to publish events, please check your SDK key"
+                    f"DevCycle: Unable to publish spooled events, please check your SDK key and Events API URL: {str(e)}"
                 )
-                # stop the thread
                 self._stop_running()
-                self._local_bucketing.on_event_payload_failure(payload.payloadId, False)
-            except NotFoundError as e:
+                break
+            except EventBatchPartiallySentError as e:
+                logger.debug(f"DevCycle: Unable to drain event spool: {str(e)}")
+                # Only the records that weren't sent are kept, as a new spool entry
+                self._event_spool.pop()
+                self._keep_unsent_payload(
+                    RawFlushPayload(
+                        payloadId="spool",
+                        records=e.unsent_records,
+                        eventCount=_count_events(e.unsent_records),
+                    ),
+                    retryable=not isinstance(e.__cause__, APIClientBadRequestError),
+                )
+                break
+            except APIClientBadRequestError as e:
                 logger.error(
-                    f"DevCycle: Unable to reach the DevCycle Events API service: {str(e)}"
+                    f"DevCycle: Events API rejected spooled events, dropping them: {str(e)}"
                 )
-                self._stop_running()
-                self._local_bucketing.on_event_payload_failure(payload.payloadId, False)
             except APIClientError as e:
-                logger.warning(
-                    f"DevCycle: Error publishing events to DevCycle Events API service: {str(e)}"
-                )
-                self._local_bucketing.on_event_payload_failure(payload.payloadId, True)
+                logger.debug(f"DevCycle: Unable to drain event spool: {str(e)}")
+                self._back_off_spool_drain()
+                break
+            except ValueError as e:
+                logger.error(f"DevCycle: Dropping malformed spooled events: {str(e)}")
+
+            self._event_spool.pop()
+            self._spool_drain_attempts = 0
+
+        if sent:
+            logger.debug(f"DevCycle: Sent {sent} spooled event payloads")
+        return sent
 
     def is_event_logging_disabled(self, event_type: str) -> bool:
         if event_type in [
@@ -141,9 +405,14 @@ class EventQueueManager(threading.Thread):
             return self._options.disable_custom_event_logging
 
     def run(self):
+        if self._flush_scheduler is not None:
+            self._run_adaptive(self._flush_scheduler)
+            return
+
         while self._should_run():
             try:
                 self._flush_events()
+                self._drain_event_spool()
             except Exception as e:
                 logger.warning(f"DevCycle: flushing events: {str(e)}")
 
@@ -151,6 +420,45 @@ class EventQueueManager(threading.Thread):
 
         self._mark_exited()
 
+    def _run_adaptive(self, scheduler: FlushScheduler) -> None:
+        while self._should_run():
+            reason = scheduler.wait()
+            if reason is None or not self._should_run():
+                continue
+
+            try:
+                scheduler.begin_flush()
+                if reason == FlushReason.DEADLINE and not self._queue_size():
+                    event_count = 0
+                else:
+                    event_count = self._flush_events()
+                scheduler.on_flush(reason, event_count)
+                self._drain_event_spool()
+            except Exception as e:
+                logger.warning(f"DevCycle: flushing events: {str(e)}")
+                # Anything left in the queue is flushed at the next deadline
+                scheduler.record_pending_event()
+
+        self._mark_exited()
+
+    def record_evaluation_event(self) -> None:
+        """
+        Tells the flush scheduler that a variable evaluation queued an aggregated event inside the WASM module
+        """
+        if (
+            self._flush_scheduler is not None
+            and not self._options.disable_automatic_event_logging
+        ):
+            self._flush_scheduler.record_pending_event()
+
+    def flush_scheduler_metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns a snapshot of the adaptive flush scheduler's decisions, or None if adaptive flushing is disabled
+        """
+        if self._flush_scheduler is None:
+            return None
+        return self._flush_scheduler.metrics()
+
     def close(self):
         self._stop_running()
 
@@ -167,6 +475,10 @@ class EventQueueManager(threading.Thread):
         except Exception as e:
             logger.warning(f"DevCycle: flushing events when closing client: {str(e)}")
 
+        # Spooled events stay in the spool file and are sent by the next client that opens it
+        if self._event_spool is not None:
+            self._event_spool.close()
+
     def queue_event(self, user: DevCycleUser, event: DevCycleEvent) -> None:
         if user is None:
             raise ValueError("user cannot be None")
@@ -181,11 +493,15 @@ class EventQueueManager(threading.Thread):
             self._check_queue_status()
         except QueueFullError:
             logger.warning("DevCycle: Event queue is full, dropping user event")
+            if self._events_dropped is not None:
+                self._events_dropped.inc()
             return
 
-        user_json = json.dumps(user.to_json())
+        user_json = user.to_json_str()
         event_json = json.dumps(event.to_json())
         self._local_bucketing.queue_event(user_json, event_json)
+        if self._flush_scheduler is not None:
+            self._flush_scheduler.record_event(len(user_json) + len(event_json))
 
     def queue_aggregate_event(
         self, event: DevCycleEvent, bucketed_config: Optional[BucketedConfig]
@@ -203,6 +519,8 @@ class EventQueueManager(threading.Thread):
             self._check_queue_status()
         except QueueFullError:
             logger.warning("DevCycle: Event queue is full, dropping aggregate event")
+            if self._events_dropped is not None:
+                self._events_dropped.inc()
             return
 
         event_json = json.dumps(event.to_json())
@@ -211,18 +529,43 @@ class EventQueueManager(threading.Thread):
         else:
             variation_map_json = "{}"
         self._local_bucketing.queue_aggregate_event(event_json, variation_map_json)
+        if self._flush_scheduler is not None:
+            self._flush_scheduler.record_event(len(event_json))
 
     def _check_queue_status(self) -> None:
         if self._flush_needed():
-            self._flush_events()
+            if self._flush_scheduler is not None and not self._queue_full():
+                # Hand the flush to the flush thread instead of publishing on the caller's thread
+                self._flush_scheduler.request_flush(FlushReason.COUNT)
+            else:
+                self._flush_events()
 
         if self._queue_full():
             raise QueueFullError()
 
+    def _queue_size(self) -> int:
+        return self._local_bucketing.get_event_queue_size()
+
+    def _queue_depth(self) -> Optional[float]:
+        try:
+            return self._queue_size()
+        except Exception:
+            # Metrics collection must not fail because the queue can't be read
+            return None
+
     def _flush_needed(self) -> bool:
-        queue_size = self._local_bucketing.get_event_queue_size()
-        return queue_size >= self._options.flush_event_queue_size
+        return self._queue_size() >= self._options.flush_event_queue_size
 
     def _queue_full(self) -> bool:
-        queue_size = self._local_bucketing.get_event_queue_size()
-        return queue_size >= self._options.max_event_queue_size
+        return self._queue_size() >= self._options.max_event_queue_size
+
+
+def _count_events(records: List[str]) -> int:
+    # Counts the events in serialized batch records, for records split off from a payload
+    count = 0
+    for record in records:
+        try:
+            count += len(json.loads(record).get("events", []))
+        except (ValueError, AttributeError):
+            continue
+    return count
@@ -0,0 +1,161 @@
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Header layout: magic, format version, offset of the oldest unsent entry, offset just past the newest entry
+_HEADER = struct.Struct("<8sIxxxxQQ")
+_MAGIC = b"DVCSPOOL"
+_VERSION = 1
+
+# Entry layout: payload length and CRC32 of the payload, followed by the payload itself
+_ENTRY_HEADER = struct.Struct("<II")
+
+
+class EventSpool:
+    """
+    An append-only, memory-mapped spool file for event payloads that could not be delivered to the Events API.
+
+    Entries are appended at the write offset and consumed in order from the read offset. Both offsets are kept
+    in the file header, so entries left in the spool when the process exits are sent by the next client that
+    opens the same file. The file is preallocated to max_bytes and never grows beyond it; appends that don't fit
+    are rejected.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        if max_bytes <= _HEADER.size + _ENTRY_HEADER.size:
+            raise ValueError(f"Event spool max_bytes is too small: {max_bytes}")
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        existing_size = os.path.getsize(path) if os.path.exists(path) else 0
+        self._file = open(path, "r+b" if existing_size else "w+b")
+        if existing_size != max_bytes:
+            self._file.truncate(max_bytes)
+        self._mmap = mmap.mmap(self._file.fileno(), max_bytes)
+
+        self._read_offset = _HEADER.size
+        self._write_offset = _HEADER.size
+        if existing_size:
+            self._load_header()
+        self._write_header()
+
+    def _load_header(self) -> None:
+        magic, version, read_offset, write_offset = _HEADER.unpack_from(self._mmap, 0)
+        if (
+            magic != _MAGIC
+            or version != _VERSION
+            or not _HEADER.size <= read_offset <= write_offset <= self.max_bytes
+        ):
+            logger.warning(
+                f"DevCycle: Event spool file {self.path} is not valid, discarding its contents"
+            )
+            return
+        self._read_offset = read_offset
+        self._write_offset = write_offset
+
+    def _write_header(self) -> None:
+        _HEADER.pack_into(
+            self._mmap, 0, _MAGIC, _VERSION, self._read_offset, self._write_offset
+        )
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._read_offset == self._write_offset
+
+    def size(self) -> int:
+        """
+        Returns the number of bytes of unsent entries in the spool
+        """
+        with self._lock:
+            return self._write_offset - self._read_offset
+
+    def append(self, payload: bytes) -> bool:
+        """
+        Appends a payload to the spool.
+
+        :return: True if the payload was written, False if there was not enough room left in the spool
+        """
+        entry_size = _ENTRY_HEADER.size + len(payload)
+        with self._lock:
+            if self._mmap.closed:
+                return False
+            if self._write_offset + entry_size > self.max_bytes:
+                self._compact()
+                if self._write_offset + entry_size > self.max_bytes:
+                    return False
+
+            _ENTRY_HEADER.pack_into(
+                self._mmap, self._write_offset, len(payload), zlib.crc32(payload)
+            )
+            data_offset = self._write_offset + _ENTRY_HEADER.size
+            self._mmap[data_offset : data_offset + len(payload)] = payload
+            self._write_offset += entry_size
+            self._write_header()
+            self._mmap.flush()
+            return True
+
+    def peek(self) -> Optional[bytes]:
+        """
+        Returns the oldest unsent payload without removing it, or None if the spool is empty
+        """
+        with self._lock:
+            if self._mmap.closed or self._read_offset == self._write_offset:
+                return None
+
+            length, crc = _ENTRY_HEADER.unpack_from(self._mmap, self._read_offset)
+            data_offset = self._read_offset + _ENTRY_HEADER.size
+            if data_offset + length > self._write_offset:
+                payload = None
+            else:
+                payload = self._mmap[data_offset : data_offset + length]
+
+            if payload is None or zlib.crc32(payload) != crc:
+                logger.error(
+                    f"DevCycle: Event spool file {self.path} is corrupted, discarding its contents"
+                )
+                self._read_offset = self._write_offset = _HEADER.size
+                self._write_header()
+                return None
+            return payload
+
+    def pop(self) -> None:
+        """
+        Removes the oldest unsent payload from the spool, once it has been delivered
+        """
+        with self._lock:
+            if self._mmap.closed or self._read_offset == self._write_offset:
+                return
+
+            length, _ = _ENTRY_HEADER.unpack_from(self._mmap, self._read_offset)
+            self._read_offset += _ENTRY_HEADER.size + length
+            if self._read_offset >= self._write_offset:
+                # the spool is drained, start writing from the beginning again
+                self._read_offset = self._write_offset = _HEADER.size
+            self._write_header()
+            self._mmap.flush()
+
+    def _compact(self) -> None:
+        # Move the unsent entries to the start of the file to reclaim the space of entries that were already sent
+        if self._read_offset == _HEADER.size:
+            return
+        unsent = self._write_offset - self._read_offset
+        self._mmap.move(_HEADER.size, self._read_offset, unsent)
+        self._read_offset = _HEADER.size
+        self._write_offset = _HEADER.size + unsent
+        self._write_header()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap.closed:
+                return
+            self._mmap.flush()
+            self._mmap.close()
+            self._file.close()
@@ -0,0 +1,225 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from devcycle_python_sdk.api.backoff import exponential_backoff
+from devcycle_python_sdk.metrics import Counter, MetricsRegistry
+from devcycle_python_sdk.options import DevCycleLocalOptions
+
+
+class FlushReason:
+    COUNT = "count"
+    BYTES = "bytes"
+    DEADLINE = "deadline"
+
+
+class FlushScheduler:
+    """
+    Decides when the event queue should be flushed, instead of flushing on a fixed interval. A flush happens as soon
+    as the queued event count or the estimated queued payload size crosses its watermark, or once the first event
+    queued since the last flush has waited event_flush_max_latency_ms. After the Events API fails, flushes are held
+    back with exponential backoff until a publish succeeds again.
+    """
+
+    def __init__(
+        self, options: DevCycleLocalOptions, metrics: Optional[MetricsRegistry] = None
+    ):
+        self._bytes_watermark = options.event_flush_watermark_bytes
+        self._max_latency = options.event_flush_max_latency_ms / 1000.0
+        self._retry_delay = options.event_retry_delay_ms / 1000.0
+        self._max_backoff = 300.0  # Cap at 5 minutes
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._requested_reason: Optional[str] = None
+        self._pending_bytes = 0
+        # Set when the first event is queued after a flush, so the thread sleeps while the queue is empty
+        self._deadline: Optional[float] = None
+        self._backoff_until = 0.0
+        self._consecutive_failures = 0
+
+        self._flushes: Dict[str, int] = {
+            FlushReason.COUNT: 0,
+            FlushReason.BYTES: 0,
+            FlushReason.DEADLINE: 0,
+        }
+        self._deferred_flushes = 0
+        self._empty_deadlines = 0
+        self._last_flush_reason: Optional[str] = None
+
+        self._flush_counters: Dict[str, Counter] = {}
+        self._deferred_counter: Optional[Counter] = None
+        self._empty_deadlines_counter: Optional[Counter] = None
+        if metrics is not None:
+            for reason in self._flushes:
+                self._flush_counters[reason] = metrics.counter(
+                    f"devcycle_event_flushes_{reason}",
+                    f"Event queue flushes triggered by the {reason} watermark or deadline",
+                )
+            self._deferred_counter = metrics.counter(
+                "devcycle_event_flushes_deferred",
+                "Requested event queue flushes held back by backoff after Events API failures",
+            )
+            self._empty_deadlines_counter = metrics.counter(
+                "devcycle_event_flush_empty_deadlines",
+                "Flush deadlines that passed with no events queued",
+            )
+            metrics.gauge(
+                "devcycle_event_flush_pending_bytes",
+                "Estimated size of the events queued since the last flush",
+                lambda: self.metrics()["pending_bytes"],
+            )
+            metrics.gauge(
+                "devcycle_event_publish_consecutive_failures",
+                "Event publishes that have failed in a row",
+                lambda: self.metrics()["consecutive_failures"],
+            )
+            metrics.gauge(
+                "devcycle_event_flush_backoff_seconds",
+                "Time left before flushes resume after Events API failures",
+                lambda: self.metrics()["backoff_remaining_seconds"],
+            )
+
+    def record_event(self, size_bytes: int) -> None:
+        """
+        Records an event queued from Python, with the estimated size of its JSON payload
+        """
+        with self._lock:
+            self._pending_bytes += size_bytes
+            crossed = self._pending_bytes >= self._bytes_watermark
+            armed = self._arm_deadline()
+        if crossed:
+            self.request_flush(FlushReason.BYTES)
+        elif armed:
+            self._wakeup.set()
+
+    def record_pending_event(self) -> None:
+        """
+        Records an event queued inside the WASM module, such as an aggregated variable evaluation, whose size isn't
+        known. Only the first one after a flush takes the lock.
+        """
+        if self._deadline is not None:
+            return
+        with self._lock:
+            armed = self._arm_deadline()
+        if armed:
+            self._wakeup.set()
+
+    def _arm_deadline(self) -> bool:
+        # Starts the deadline if this is the first event since the last flush. Must be called with the lock held.
+        if self._deadline is not None:
+            return False
+        self._deadline = time.monotonic() + self._max_latency
+        return True
+
+    def request_flush(self, reason: str) -> None:
+        """
+        Asks the flush thread to flush as soon as it is not backing off
+        """
+        with self._lock:
+            if self._requested_reason is None:
+                self._requested_reason = reason
+        self._wakeup.set()
+
+    def wake(self) -> None:
+        """
+        Interrupts wait() without requesting a flush, e.g. when the client is closing
+        """
+        self._wakeup.set()
+
+    def wait(self) -> Optional[str]:
+        """
+        Blocks until a flush is due or wake() is called.
+
+        :return: The reason for the flush, or None if the wait was interrupted before a flush was due
+        """
+        with self._lock:
+            now = time.monotonic()
+            timeout: Optional[float]
+            if now < self._backoff_until:
+                timeout = self._backoff_until - now
+            elif self._requested_reason is not None:
+                timeout = 0.0
+            elif self._deadline is None:
+                timeout = None
+            else:
+                timeout = max(self._deadline - now, 0.0)
+
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+        with self._lock:
+            now = time.monotonic()
+            deferred = False
+            reason: Optional[str] = None
+            if now < self._backoff_until:
+                if self._requested_reason is not None:
+                    self._deferred_flushes += 1
+                    deferred = True
+            elif self._requested_reason is not None:
+                reason = self._requested_reason
+            elif self._deadline is not None and now >= self._deadline:
+                reason = FlushReason.DEADLINE
+
+        if deferred and self._deferred_counter is not None:
+            self._deferred_counter.inc()
+        return reason
+
+    def begin_flush(self) -> None:
+        """
+        Resets the watermarks and deadline before the queue is flushed, so events queued during the flush start a
+        new deadline
+        """
+        with self._lock:
+            self._requested_reason = None
+            self._pending_bytes = 0
+            self._deadline = None
+
+    def on_flush(self, reason: str, event_count: int) -> None:
+        """
+        Records a completed flush
+        """
+        with self._lock:
+            if reason == FlushReason.DEADLINE and event_count == 0:
+                self._empty_deadlines += 1
+                counter = self._empty_deadlines_counter
+            else:
+                self._flushes[reason] = self._flushes.get(reason, 0) + 1
+                self._last_flush_reason = reason
+                counter = self._flush_counters.get(reason)
+        if counter is not None:
+            counter.inc()
+
+    def on_publish_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            self._backoff_until = 0.0
+
+    def on_publish_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            delay = min(
+                exponential_backoff(self._consecutive_failures, self._retry_delay),
+                self._max_backoff,
+            )
+            self._backoff_until = time.monotonic() + delay
+            # The failed payloads are still queued, so they are retried once the backoff has elapsed
+            if self._deadline is None:
+                self._deadline = self._backoff_until
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the scheduler's decisions and current state
+        """
+        with self._lock:
+            return {
+                "flushes": dict(self._flushes),
+                "deferred_flushes": self._deferred_flushes,
+                "empty_deadlines": self._empty_deadlines,
+                "last_flush_reason": self._last_flush_reason,
+                "pending_bytes": self._pending_bytes,
+                "consecutive_failures": self._consecutive_failures,
+                "backoff_remaining_seconds": max(
+                    self._backoff_until - time.monotonic(), 0.0
+                ),
+            }
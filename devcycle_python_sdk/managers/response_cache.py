@@ -0,0 +1,206 @@
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, Tuple, TypeVar
+
+from devcycle_python_sdk.metrics import Counter, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _CacheEntry:
+    __slots__ = ("value", "fetched_at")
+
+    def __init__(self, value: Any, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+
+class ResponseCache:
+    """
+    A bounded cache of Bucketing API responses, grouped by user fingerprint and evicted least recently used user
+    first.
+
+    An entry is fresh for ttl_ms after it was fetched. For stale_ms after that it is still returned, but a
+    background refresh is started so the next caller gets a fresh value. Older entries are fetched again by the
+    caller. Values are deep copied on the way out, so callers can't modify the cached objects.
+    """
+
+    def __init__(
+        self,
+        ttl_ms: int,
+        stale_ms: int,
+        max_users: int,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self._ttl = ttl_ms / 1000.0
+        self._stale = stale_ms / 1000.0
+        self._max_users = max_users
+
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[str, Dict[str, _CacheEntry]]" = OrderedDict()
+        self._refreshing: Set[Tuple[str, str]] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+
+        self._hit_counter: Optional[Counter] = None
+        self._stale_hit_counter: Optional[Counter] = None
+        self._miss_counter: Optional[Counter] = None
+        self._refresh_error_counter: Optional[Counter] = None
+        if metrics is not None:
+            metrics.gauge(
+                "devcycle_response_cache_users",
+                "Users with Bucketing API responses in the response cache",
+                lambda: self.stats()["users"],
+            )
+            self._hit_counter = metrics.counter(
+                "devcycle_response_cache_hits",
+                "Bucketing API requests answered with a fresh cached response",
+            )
+            self._stale_hit_counter = metrics.counter(
+                "devcycle_response_cache_stale_hits",
+                "Bucketing API requests answered with a stale cached response while it was refreshed",
+            )
+            self._miss_counter = metrics.counter(
+                "devcycle_response_cache_misses",
+                "Bucketing API requests with no usable cached response",
+            )
+            self._refresh_error_counter = metrics.counter(
+                "devcycle_response_cache_refresh_errors",
+                "Failed background refreshes of stale cached responses",
+            )
+
+    def get_fresh_item(
+        self, fingerprint: str, entry_key: str, item_key: str
+    ) -> Tuple[bool, Optional[Any]]:
+        """
+        Looks up item_key in a fresh cached dict, copying only that item rather than the whole dict. Does not
+        count as a hit or miss.
+
+        :return: (False, None) if there is no fresh value, otherwise True and a copy of the item, or None if the
+        dict doesn't contain item_key
+        """
+        with self._lock:
+            entry = self._entry(fingerprint, entry_key)
+            if entry is None or time.monotonic() - entry.fetched_at > self._ttl:
+                return False, None
+            item = entry.value.get(item_key)
+        return True, copy.deepcopy(item)
+
+    def get_or_fetch(
+        self, fingerprint: str, entry_key: str, fetch: Callable[[], T]
+    ) -> T:
+        """
+        Returns a copy of the cached value, calling fetch to fill the cache if there is no usable entry
+        """
+        now = time.monotonic()
+        refresh = False
+        with self._lock:
+            entry = self._entry(fingerprint, entry_key)
+            if entry is None or now - entry.fetched_at > self._ttl + self._stale:
+                self.misses += 1
+                counter = self._miss_counter
+                entry = None
+            elif now - entry.fetched_at <= self._ttl:
+                self.hits += 1
+                counter = self._hit_counter
+            else:
+                self.stale_hits += 1
+                counter = self._stale_hit_counter
+                refresh = (
+                    not self._closed
+                    and (fingerprint, entry_key) not in self._refreshing
+                )
+                if refresh:
+                    self._refreshing.add((fingerprint, entry_key))
+
+        if counter is not None:
+            counter.inc()
+        if entry is None:
+            value = fetch()
+            self.set(fingerprint, entry_key, value)
+            return copy.deepcopy(value)
+
+        if refresh:
+            self._refresh_in_background(fingerprint, entry_key, fetch)
+        return copy.deepcopy(entry.value)
+
+    def set(self, fingerprint: str, entry_key: str, value: Any) -> None:
+        with self._lock:
+            entries = self._users.get(fingerprint)
+            if entries is None:
+                entries = self._users[fingerprint] = {}
+                while len(self._users) > self._max_users:
+                    self._users.popitem(last=False)
+            else:
+                self._users.move_to_end(fingerprint)
+            entries[entry_key] = _CacheEntry(value, time.monotonic())
+
+    def _entry(self, fingerprint: str, entry_key: str) -> Optional[_CacheEntry]:
+        # Must be called with the lock held
+        entries = self._users.get(fingerprint)
+        if entries is None:
+            return None
+        self._users.move_to_end(fingerprint)
+        return entries.get(entry_key)
+
+    def _refresh_in_background(
+        self, fingerprint: str, entry_key: str, fetch: Callable[[], Any]
+    ) -> None:
+        def refresh():
+            try:
+                self.set(fingerprint, entry_key, fetch())
+            except Exception as e:
+                with self._lock:
+                    self.refresh_errors += 1
+                if self._refresh_error_counter is not None:
+                    self._refresh_error_counter.inc()
+                logger.debug(f"DevCycle: Error refreshing cached response: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard((fingerprint, entry_key))
+
+        with self._lock:
+            if self._closed:
+                self._refreshing.discard((fingerprint, entry_key))
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="devcycle-cache-refresh"
+                )
+            executor = self._executor
+        executor.submit(refresh)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns a snapshot of the cache's size and hit counts
+        """
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refresh_errors": self.refresh_errors,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -4,7 +4,9 @@ import ld_eventsource
 import ld_eventsource.actions
 import logging
 import ld_eventsource.config
-from typing import Callable
+from typing import Callable, Optional
+
+from devcycle_python_sdk.metrics import Counter, MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,7 @@ class SSEManager:
         handle_state: Callable[[ld_eventsource.actions.Start], None],
         handle_error: Callable[[ld_eventsource.actions.Fault], None],
         handle_message: Callable[[ld_eventsource.actions.Event], None],
+        metrics: Optional[MetricsRegistry] = None,
     ):
         self.client: ld_eventsource.SSEClient = None
         self.url = ""
@@ -22,6 +25,22 @@ class SSEManager:
         self.handle_error = handle_error
         self.handle_message = handle_message
 
+        self._connections: Optional[Counter] = None
+        self._errors: Optional[Counter] = None
+        self._messages: Optional[Counter] = None
+        if metrics is not None:
+            self._connections = metrics.counter(
+                "devcycle_sse_connections",
+                "Connections made to the realtime updates stream",
+            )
+            self._errors = metrics.counter(
+                "devcycle_sse_errors", "Errors from the realtime updates stream"
+            )
+            self._messages = metrics.counter(
+                "devcycle_sse_messages",
+                "Messages received from the realtime updates stream",
+            )
+
         self.read_thread = threading.Thread(
             target=self.read_events,
             args=(self.handle_state, self.handle_error, self.handle_message),
@@ -38,15 +57,23 @@ class SSEManager:
             logger.info("DevCycle: SSE connection created successfully")
             for event in self.client.all:
                 if isinstance(event, ld_eventsource.actions.Start):
+                    if self._connections is not None:
+                        self._connections.inc()
                     handle_state(event)
                 elif isinstance(event, ld_eventsource.actions.Fault):
+                    if self._errors is not None:
+                        self._errors.inc()
                     handle_error(event)
                 elif isinstance(event, ld_eventsource.actions.Event):
+                    if self._messages is not None:
+                        self._messages.inc()
                     handle_message(event)
                 elif isinstance(event, ld_eventsource.actions.Comment):
                     handle_state(None)
         except Exception as e:
             logger.debug(f"DevCycle SSE: Error in read loop: {e}")
+            if self._errors is not None:
+                self._errors.inc()
             fault_event = ld_eventsource.actions.Fault(error=e)
             handle_error(fault_event)
         finally:
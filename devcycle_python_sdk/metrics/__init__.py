@@ -0,0 +1,9 @@
+# Simplify imports for the metrics registry
+
+from devcycle_python_sdk.metrics.registry import (
+    DEFAULT_LATENCY_BUCKETS,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
@@ -0,0 +1,58 @@
+from typing import Any, Iterable, Optional
+
+from devcycle_python_sdk.metrics.registry import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+
+try:
+    from opentelemetry import metrics as otel_metrics
+except ImportError:
+    otel_metrics = None  # type: ignore
+
+
+def instrument_meter(registry: MetricsRegistry, meter: Optional[Any] = None) -> None:
+    """
+    Reports the SDK's metrics through an OpenTelemetry meter, the global meter provider's if none is given.
+
+    Counters and gauges are read by observable instruments when the meter is collected. OpenTelemetry histograms
+    can't be observed after the fact, so histogram values are recorded as they are observed, from the time this
+    is called. Metrics created after this is called are not reported.
+    """
+    if otel_metrics is None:
+        raise ImportError(
+            "The OpenTelemetry exporter requires the 'opentelemetry-api' package, install it with devcycle-python-server-sdk[opentelemetry]"
+        )
+    if meter is None:
+        meter = otel_metrics.get_meter("devcycle_python_sdk")
+
+    for metric in registry.metrics():
+        if isinstance(metric, Counter):
+            meter.create_observable_counter(
+                metric.name,
+                callbacks=[_observe(metric)],
+                description=metric.description,
+            )
+        elif isinstance(metric, Gauge):
+            meter.create_observable_gauge(
+                metric.name,
+                callbacks=[_observe(metric)],
+                description=metric.description,
+            )
+        elif isinstance(metric, Histogram):
+            histogram = meter.create_histogram(
+                metric.name, unit="s", description=metric.description
+            )
+            metric.add_listener(histogram.record)
+
+
+def _observe(metric: Any) -> Any:
+    def callback(options: Any) -> Iterable[Any]:
+        value = metric.value
+        if value is None:
+            return []
+        return [otel_metrics.Observation(value)]
+
+    return callback
@@ -0,0 +1,137 @@
+import random
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from devcycle_python_sdk.metrics.registry import Histogram, MetricsRegistry
+
+# The phases of a variable evaluation, in the order they run. Aggregate evaluation events are queued by the
+# WASM module while it evaluates the variable, so their time is part of the wasm phase.
+PHASES: Tuple[str, ...] = (
+    "config_metadata",
+    "before_hooks",
+    "protobuf_build",
+    "lock_wait",
+    "wasm",
+    "decode",
+    "after_hooks",
+)
+
+# Evaluation phases take from a microsecond to a few milliseconds, finer than the default latency buckets
+PHASE_BUCKETS: Tuple[float, ...] = (
+    0.000001,
+    0.0000025,
+    0.000005,
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.1,
+    1.0,
+)
+
+
+class PhaseTimer:
+    """
+    Times the phases of one evaluation. Each call to mark ends the current phase and starts the next.
+    """
+
+    __slots__ = ("_last", "phases")
+
+    def __init__(self) -> None:
+        self._last = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+
+class EvaluationProfiler:
+    """
+    Records how long each phase of a sample of variable evaluations takes. Only sampled evaluations are timed,
+    so unsampled evaluations pay for one random number, and nothing is paid when profiling is disabled.
+
+    If a metrics registry is given, the phase histograms are added to it so they are exported with the other
+    metrics.
+    """
+
+    def __init__(
+        self, sample_rate: float, metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        self.sample_rate = sample_rate
+        self._histograms: Dict[str, Histogram] = {}
+        for phase in PHASES + ("total",):
+            name = f"devcycle_variable_phase_{phase}_seconds"
+            description = (
+                f"Time spent in the {phase} phase of sampled variable evaluations"
+            )
+            if metrics is not None:
+                self._histograms[phase] = metrics.histogram(
+                    name, description, PHASE_BUCKETS
+                )
+            else:
+                self._histograms[phase] = Histogram(name, description, PHASE_BUCKETS)
+
+    def sample(self) -> Optional[PhaseTimer]:
+        """
+        Returns a timer if this evaluation should be profiled, otherwise None
+        """
+        if random.random() < self.sample_rate:
+            return PhaseTimer()
+        return None
+
+    def record(self, timer: PhaseTimer) -> None:
+        total = 0.0
+        for phase, seconds in timer.phases.items():
+            self._histograms[phase].observe(seconds)
+            total += seconds
+        self._histograms["total"].observe(total)
+
+    def breakdown(self) -> Dict[str, Any]:
+        """
+        Returns, for each phase, the number of sampled evaluations that ran it, its mean and estimated p50 and
+        p99 times in microseconds, and its share of the total evaluation time
+        """
+        snapshots = {
+            phase: histogram.snapshot() for phase, histogram in self._histograms.items()
+        }
+        total_seconds = snapshots["total"]["sum"]
+        phases = {}
+        for phase in PHASES + ("total",):
+            snapshot = snapshots[phase]
+            count = snapshot["count"]
+            phases[phase] = {
+                "count": count,
+                "mean_us": snapshot["sum"] / count * 1e6 if count else 0.0,
+                "p50_us": _percentile(snapshot, 0.5) * 1e6,
+                "p99_us": _percentile(snapshot, 0.99) * 1e6,
+                "share": snapshot["sum"] / total_seconds if total_seconds else 0.0,
+            }
+        return {
+            "sample_rate": self.sample_rate,
+            "sampled_evaluations": snapshots["total"]["count"],
+            "phases": phases,
+        }
+
+
+def _percentile(snapshot: Dict[str, Any], quantile: float) -> float:
+    # The upper bound of the bucket holding the quantile, or the last finite bound if it's above every bucket
+    count = snapshot["count"]
+    if not count:
+        return 0.0
+    target = quantile * count
+    finite_bound = 0.0
+    for bound, cumulative in snapshot["buckets"]:
+        if bound != float("inf"):
+            finite_bound = bound
+        if cumulative >= target:
+            return finite_bound
+    return finite_bound
@@ -0,0 +1,76 @@
+from typing import Any, Iterator, Optional
+
+from devcycle_python_sdk.metrics.registry import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+
+try:
+    import prometheus_client
+    from prometheus_client.core import (
+        CounterMetricFamily,
+        GaugeMetricFamily,
+        HistogramMetricFamily,
+    )
+except ImportError:
+    prometheus_client = None  # type: ignore
+
+
+class DevCycleCollector:
+    """
+    A prometheus_client collector that reads the SDK's metrics when Prometheus scrapes them
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        if prometheus_client is None:
+            raise ImportError(
+                "The Prometheus exporter requires the 'prometheus_client' package, install it with devcycle-python-server-sdk[prometheus]"
+            )
+        self._registry = registry
+
+    def collect(self) -> Iterator[Any]:
+        for metric in self._registry.metrics():
+            if isinstance(metric, Counter):
+                family: Any = CounterMetricFamily(metric.name, metric.description)
+                family.add_metric([], metric.value)
+            elif isinstance(metric, Gauge):
+                value = metric.value
+                if value is None:
+                    continue
+                family = GaugeMetricFamily(metric.name, metric.description)
+                family.add_metric([], value)
+            elif isinstance(metric, Histogram):
+                snapshot = metric.snapshot()
+                family = HistogramMetricFamily(metric.name, metric.description)
+                family.add_metric(
+                    [],
+                    [
+                        (_bucket_label(bound), count)
+                        for bound, count in snapshot["buckets"]
+                    ],
+                    snapshot["sum"],
+                )
+            else:
+                continue
+            yield family
+
+
+def _bucket_label(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def register_prometheus_collector(
+    registry: MetricsRegistry, prometheus_registry: Optional[Any] = None
+) -> DevCycleCollector:
+    """
+    Registers the SDK's metrics with a prometheus_client registry, the default registry if none is given
+
+    :return: The collector, which can be passed to the registry's unregister method
+    """
+    collector = DevCycleCollector(registry)
+    if prometheus_registry is None:
+        prometheus_registry = prometheus_client.REGISTRY
+    prometheus_registry.register(collector)
+    return collector
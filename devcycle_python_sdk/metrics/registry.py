@@ -0,0 +1,199 @@
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Histogram bucket upper bounds in seconds, from 10µs WASM calls up to slow network requests
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Counter:
+    """
+    A count that only goes up
+    """
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        with self._lock:
+            return self._value
+
+
+class Gauge:
+    """
+    A value that can go up and down. If a callback is given, the value is read from it when the metrics are
+    collected, instead of being set.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        callback: Optional[Callable[[], Optional[float]]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self._callback = callback
+        self._value: Optional[float] = None
+
+    def set(self, value: Optional[float]) -> None:
+        self._value = value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self._callback is not None:
+            return self._callback()
+        return self._value
+
+
+class Histogram:
+    """
+    Counts observations into fixed buckets, keeping their count and sum. Observing a value is a bisect and a few
+    additions, so histograms can be updated on every variable evaluation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # One count per bucket, plus one for values above the last bucket
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._listeners: List[Callable[[float], None]] = []
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+        for listener in self._listeners:
+            listener(value)
+
+    def time(self) -> "_Timer":
+        """
+        Returns a context manager that observes the seconds spent inside it
+        """
+        return _Timer(self)
+
+    def add_listener(self, listener: Callable[[float], None]) -> None:
+        """
+        Calls listener with every value observed from now on, for exporters that need the raw observations
+        """
+        self._listeners.append(listener)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the count, sum and cumulative bucket counts, as (upper bound, count) pairs ending with infinity
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative.append((bound, running))
+        return {"count": running, "sum": total, "buckets": cumulative}
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class MetricsRegistry:
+    """
+    Holds the SDK's metrics. Getting a metric that already exists returns it, so components can share metrics
+    by name.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+
+    def _get_or_create(self, name: str, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, description))
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        callback: Optional[Callable[[], Optional[float]]] = None,
+    ) -> Gauge:
+        return self._get_or_create(name, lambda: Gauge(name, description, callback))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, description, buckets))
+
+    def metrics(self) -> List[Any]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the current value of every metric. Histograms are returned as a dict of their count, sum and
+        cumulative bucket counts.
+        """
+        result: Dict[str, Any] = {}
+        for metric in self.metrics():
+            if isinstance(metric, Histogram):
+                result[metric.name] = metric.snapshot()
+            else:
+                result[metric.name] = metric.value
+        return result
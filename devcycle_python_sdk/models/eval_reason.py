@@ -6,6 +6,8 @@ class EvalReasons:
     """Evaluation reasons constants"""
 
     DEFAULT = "DEFAULT"
+    TARGETING_MATCH = "TARGETING_MATCH"
+    SPLIT = "SPLIT"
 
 
 class DefaultReasonDetails:
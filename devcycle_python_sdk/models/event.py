@@ -1,9 +1,11 @@
 # ruff: noqa: N815
+import json
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple, Union, cast
 from datetime import datetime, timezone
 
 from .user import DevCycleUser
+from devcycle_python_sdk.util.json_fragments import parse_json_array, split_json_object
 
 
 class EventType:
@@ -121,3 +123,39 @@ class FlushPayload:
                 UserEventsBatchRecord.from_json(element) for element in data["records"]
             ],
         )
+
+
+@dataclass()
+class RawFlushPayload:
+    """
+    A FlushPayload whose records are kept as the JSON text exported by the local bucketing library, so they can be
+    forwarded to the Events API without being rebuilt as model objects
+    """
+
+    payloadId: str
+    records: List[str]
+    eventCount: int
+
+    @classmethod
+    def list_from_json(cls, data: str) -> List["RawFlushPayload"]:
+        """
+        Parses the JSON array of payloads exported by the local bucketing library, extracting only the payloadId and
+        eventCount of each payload
+        """
+        # Each payload is split in a single pass, so every record is only decoded once to find where it ends
+        payloads = []
+        for fields in parse_json_array(data, _split_payload)[0]:
+            payloads.append(
+                cls(
+                    payloadId=json.loads(cast(str, fields["payloadId"])),
+                    eventCount=json.loads(cast(str, fields["eventCount"])),
+                    records=cast(List[str], fields["records"]),
+                )
+            )
+        return payloads
+
+
+def _split_payload(
+    data: str, index: int
+) -> Tuple[Dict[str, Union[str, List[str]]], int]:
+    return split_json_object(data, index, split_arrays=("records",))
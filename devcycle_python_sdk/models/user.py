@@ -1,10 +1,20 @@
 # ruff: noqa: N815
+import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, Optional, Any, cast
+from typing import Callable, Dict, Optional, Any, Tuple, TypeVar, cast
 from openfeature.evaluation_context import EvaluationContext
 from openfeature.exception import TargetingKeyMissingError, InvalidContextError
 
+T = TypeVar("T")
+
+
+def _custom_data_state(custom_data: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+    # Includes the value types, as 1, 1.0 and True are equal but encode differently
+    if custom_data is None:
+        return None
+    return tuple((key, type(value), value) for key, value in custom_data.items())
+
 
 @dataclass(order=False)
 class DevCycleUser:
@@ -26,7 +36,41 @@ class DevCycleUser:
     sdkVersion: Optional[str] = None
     sdkPlatform: Optional[str] = None
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Any change to the user invalidates its cached encodings
+        self.__dict__["_encodings"] = None
+        object.__setattr__(self, name, value)
+
+    def cached_encoding(self, name: str, encode: Callable[["DevCycleUser"], T]) -> T:
+        """
+        Returns the user's encoding called name, calling encode to create it if it isn't cached. The cache is
+        cleared when an attribute of the user is set, or when the contents of the custom data dicts change.
+        """
+        custom_data_state = (
+            _custom_data_state(self.customData),
+            _custom_data_state(self.privateCustomData),
+        )
+        cached = self.__dict__.get("_encodings")
+        if cached is None or cached[0] != custom_data_state:
+            cached = (custom_data_state, {})
+            self.__dict__["_encodings"] = cached
+
+        encodings: Dict[str, Any] = cached[1]
+        if name not in encodings:
+            encodings[name] = encode(self)
+        return encodings[name]
+
     def to_json(self):
+        # A copy, so changes to the returned dict don't affect the cached encoding
+        return dict(self.cached_encoding("json", DevCycleUser._build_json))
+
+    def to_json_str(self) -> str:
+        """
+        Returns the user serialized as a JSON string, the same as json.dumps(user.to_json())
+        """
+        return self.cached_encoding("json_str", lambda user: json.dumps(user.to_json()))
+
+    def _build_json(self) -> Dict[str, Any]:
         json_dict = {
             key: getattr(self, key)
             for key in self.__dataclass_fields__
@@ -1,5 +1,5 @@
 import logging
-from typing import Callable, Optional, Dict, Any, List
+from typing import Callable, Optional, Dict, Any, List, Union
 
 from devcycle_python_sdk.models.eval_hook import EvalHook
 
@@ -18,6 +18,28 @@ class DevCycleCloudOptions:
         request_timeout: int = 5,  # seconds
         request_retries: int = 5,
         retry_delay: int = 200,  # milliseconds
+        enable_request_coalescing: bool = False,
+        enable_response_cache: bool = False,
+        response_cache_ttl_ms: int = 10000,
+        response_cache_stale_ms: int = 30000,
+        response_cache_max_users: int = 10000,
+        enable_background_tracking: bool = False,
+        event_flush_interval_ms: int = 10000,
+        event_request_chunk_size: int = 100,
+        max_event_queue_size: int = 2000,
+        http_pool_maxsize: int = 10,
+        http_pool_block: bool = False,
+        http_tcp_keepalive: bool = False,
+        http_prewarm_connections: int = 0,
+        enable_http2: bool = False,
+        enable_circuit_breaker: bool = False,
+        circuit_breaker_failure_threshold: int = 5,
+        circuit_breaker_reset_timeout_ms: int = 30000,
+        circuit_breaker_max_fallback_entries: int = 10000,
+        request_deadline_ms: Optional[int] = None,
+        enable_request_hedging: bool = False,
+        request_hedging_percentile: float = 95.0,
+        enable_metrics: bool = False,
         eval_hooks: Optional[List[EvalHook]] = None,
     ):
         self.enable_edge_db = enable_edge_db
@@ -25,8 +47,62 @@ class DevCycleCloudOptions:
         self.request_timeout = request_timeout
         self.request_retries = request_retries
         self.retry_delay = retry_delay
+        self.enable_request_coalescing = enable_request_coalescing
+        self.enable_response_cache = enable_response_cache
+        self.response_cache_ttl_ms = response_cache_ttl_ms
+        self.response_cache_stale_ms = response_cache_stale_ms
+        self.response_cache_max_users = response_cache_max_users
+        self.enable_background_tracking = enable_background_tracking
+        self.event_flush_interval_ms = event_flush_interval_ms
+        self.event_request_chunk_size = event_request_chunk_size
+        self.max_event_queue_size = max_event_queue_size
+        self.http_pool_maxsize = http_pool_maxsize
+        self.http_pool_block = http_pool_block
+        self.http_tcp_keepalive = http_tcp_keepalive
+        self.http_prewarm_connections = http_prewarm_connections
+        self.enable_http2 = enable_http2
+        self.enable_circuit_breaker = enable_circuit_breaker
+        self.circuit_breaker_failure_threshold = circuit_breaker_failure_threshold
+        self.circuit_breaker_reset_timeout_ms = circuit_breaker_reset_timeout_ms
+        self.circuit_breaker_max_fallback_entries = circuit_breaker_max_fallback_entries
+        self.request_deadline_ms = request_deadline_ms
+        self.enable_request_hedging = enable_request_hedging
+        self.request_hedging_percentile = request_hedging_percentile
+        self.enable_metrics = enable_metrics
         self.eval_hooks = eval_hooks if eval_hooks is not None else []
 
+        if self.response_cache_max_users < 1:
+            logger.warning(
+                f"DevCycle: response_cache_max_users: {self.response_cache_max_users} must be at least 1"
+            )
+            self.response_cache_max_users = 1
+
+        if self.event_request_chunk_size > self.max_event_queue_size:
+            logger.warning(
+                f"DevCycle: event_request_chunk_size: {self.event_request_chunk_size} must be smaller than max_event_queue_size: {self.max_event_queue_size}"
+            )
+            self.event_request_chunk_size = min(100, self.max_event_queue_size)
+
+        if self.circuit_breaker_failure_threshold < 1:
+            logger.warning(
+                f"DevCycle: circuit_breaker_failure_threshold: {self.circuit_breaker_failure_threshold} must be at least 1"
+            )
+            self.circuit_breaker_failure_threshold = 1
+
+        if self.request_deadline_ms is not None and self.request_deadline_ms <= 0:
+            logger.warning(
+                f"DevCycle: request_deadline_ms: {self.request_deadline_ms} must be greater than 0, disabling the request deadline"
+            )
+            self.request_deadline_ms = None
+
+        if not 0 < self.request_hedging_percentile < 100:
+            logger.warning(
+                f"DevCycle: request_hedging_percentile: {self.request_hedging_percentile} must be between 0 and 100"
+            )
+            self.request_hedging_percentile = 95.0
+
+        _validate_http_pool_options(self)
+
 
 class DevCycleLocalOptions:
     """
@@ -47,10 +123,30 @@ class DevCycleLocalOptions:
         event_request_chunk_size: int = 100,
         event_request_timeout_ms: int = 10000,
         event_retry_delay_ms: int = 200,  # milliseconds
+        event_request_max_bytes: Optional[int] = None,  # uncompressed request body size
+        event_request_compression: Optional[str] = None,  # "gzip" or "zstd"
+        event_request_compression_threshold: int = 1024,  # bytes
+        enable_raw_event_payloads: bool = False,
+        event_spool_path: Optional[str] = None,
+        event_spool_max_bytes: int = 64 * 1024 * 1024,
+        enable_adaptive_event_flushing: bool = False,
+        event_flush_watermark_bytes: int = 512 * 1024,
+        event_flush_max_latency_ms: int = 30000,
+        async_eval_max_workers: int = 2,
+        async_eval_max_pending: int = 1000,
+        http_pool_maxsize: int = 10,
+        http_pool_block: bool = False,
+        http_tcp_keepalive: bool = False,
+        http_prewarm_connections: int = 0,
         disable_automatic_event_logging: bool = False,
         disable_custom_event_logging: bool = False,
         enable_beta_realtime_updates: bool = False,
         disable_realtime_updates: bool = False,
+        enable_metrics: bool = False,
+        enable_evaluation_profiling: bool = False,
+        evaluation_profiling_sample_rate: float = 0.01,
+        enable_evaluation_cache: bool = False,
+        evaluation_cache_max_entries: int = 10000,
         eval_hooks: Optional[List[EvalHook]] = None,
     ):
         self.events_api_uri = events_api_uri
@@ -67,7 +163,27 @@ class DevCycleLocalOptions:
         self.on_client_initialized = on_client_initialized
         self.event_request_timeout_ms = event_request_timeout_ms
         self.event_retry_delay_ms = event_retry_delay_ms
+        self.event_request_max_bytes = event_request_max_bytes
+        self.event_request_compression = event_request_compression
+        self.event_request_compression_threshold = event_request_compression_threshold
+        self.enable_raw_event_payloads = enable_raw_event_payloads
+        self.event_spool_path = event_spool_path
+        self.event_spool_max_bytes = event_spool_max_bytes
+        self.enable_adaptive_event_flushing = enable_adaptive_event_flushing
+        self.event_flush_watermark_bytes = event_flush_watermark_bytes
+        self.event_flush_max_latency_ms = event_flush_max_latency_ms
+        self.async_eval_max_workers = async_eval_max_workers
+        self.async_eval_max_pending = async_eval_max_pending
+        self.http_pool_maxsize = http_pool_maxsize
+        self.http_pool_block = http_pool_block
+        self.http_tcp_keepalive = http_tcp_keepalive
+        self.http_prewarm_connections = http_prewarm_connections
         self.disable_realtime_updates = disable_realtime_updates
+        self.enable_metrics = enable_metrics
+        self.enable_evaluation_profiling = enable_evaluation_profiling
+        self.evaluation_profiling_sample_rate = evaluation_profiling_sample_rate
+        self.enable_evaluation_cache = enable_evaluation_cache
+        self.evaluation_cache_max_entries = evaluation_cache_max_entries
 
         if enable_beta_realtime_updates:
             logger.warning(
@@ -106,6 +222,47 @@ class DevCycleLocalOptions:
             )
             self.max_event_queue_size = 20000
 
+        if (
+            self.event_request_max_bytes is not None
+            and self.event_request_max_bytes <= 0
+        ):
+            logger.warning(
+                f"DevCycle: event_request_max_bytes: {self.event_request_max_bytes} must be greater than 0, chunking disabled"
+            )
+            self.event_request_max_bytes = None
+
+        if self.event_request_compression not in (None, "gzip", "zstd"):
+            logger.warning(
+                f"DevCycle: event_request_compression: {self.event_request_compression} must be one of 'gzip' or 'zstd', compression disabled"
+            )
+            self.event_request_compression = None
+
+        if self.async_eval_max_workers < 1:
+            logger.warning(
+                f"DevCycle: async_eval_max_workers: {self.async_eval_max_workers} must be at least 1"
+            )
+            self.async_eval_max_workers = 1
+
+        if self.async_eval_max_pending < self.async_eval_max_workers:
+            logger.warning(
+                f"DevCycle: async_eval_max_pending: {self.async_eval_max_pending} must be at least async_eval_max_workers: {self.async_eval_max_workers}"
+            )
+            self.async_eval_max_pending = self.async_eval_max_workers
+
+        if not 0 < self.evaluation_profiling_sample_rate <= 1:
+            logger.warning(
+                f"DevCycle: evaluation_profiling_sample_rate: {self.evaluation_profiling_sample_rate} must be greater than 0 and at most 1"
+            )
+            self.evaluation_profiling_sample_rate = 0.01
+
+        if self.evaluation_cache_max_entries < 1:
+            logger.warning(
+                f"DevCycle: evaluation_cache_max_entries: {self.evaluation_cache_max_entries} must be at least 1"
+            )
+            self.evaluation_cache_max_entries = 1
+
+        _validate_http_pool_options(self)
+
     def event_queue_options(self) -> Dict[str, Any]:
         """
         Returns a read-only view of the options that are relevant to the event subsystem
@@ -119,3 +276,19 @@ class DevCycleLocalOptions:
             "eventRequestChunkSize": self.event_request_chunk_size,
             "eventsAPIBasePath": self.events_api_uri,
         }
+
+
+def _validate_http_pool_options(
+    options: Union[DevCycleCloudOptions, DevCycleLocalOptions],
+) -> None:
+    if options.http_pool_maxsize < 1:
+        logger.warning(
+            f"DevCycle: http_pool_maxsize: {options.http_pool_maxsize} must be at least 1"
+        )
+        options.http_pool_maxsize = 1
+
+    if options.http_prewarm_connections > options.http_pool_maxsize:
+        logger.warning(
+            f"DevCycle: http_prewarm_connections: {options.http_prewarm_connections} must not be larger than http_pool_maxsize: {options.http_pool_maxsize}"
+        )
+        options.http_prewarm_connections = options.http_pool_maxsize
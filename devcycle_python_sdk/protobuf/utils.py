@@ -89,6 +89,59 @@ def create_dvcuser_pb(user: DevCycleUser) -> pb2.DVCUser_PB:  # type: ignore
     )
 
 
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+# Field tags of VariableForUserParams_PB: variableKey is field 2 (length delimited), variableType is field 3 (varint)
+_VARIABLE_KEY_TAG = b"\x12"
+_VARIABLE_TYPE_TAG = b"\x18"
+
+
+def _encode_user_field(user: DevCycleUser) -> bytes:
+    return pb2.VariableForUserParams_PB(  # type: ignore
+        user=create_dvcuser_pb(user)
+    ).SerializeToString()
+
+
+class VariableForUserParamsTemplate:
+    """
+    Serializes VariableForUserParams_PB messages from pre-encoded fields. An encoded message is the concatenation
+    of its encoded fields, so the sdkKey and shouldTrackEvent fields are encoded once, and the user field once
+    per user, leaving only the variableKey and variableType to encode for each variable. The output is identical
+    to SerializeToString.
+
+    The encoded user field is cached on the user, so evaluating several variables for one user encodes the
+    user once.
+    """
+
+    def __init__(self, sdk_key: str, should_track_event: bool = True):
+        self._prefix = pb2.VariableForUserParams_PB(sdkKey=sdk_key).SerializeToString()  # type: ignore
+        self._suffix = pb2.VariableForUserParams_PB(  # type: ignore
+            shouldTrackEvent=should_track_event
+        ).SerializeToString()
+
+    @staticmethod
+    def user_field(user: DevCycleUser) -> bytes:
+        """
+        Returns the encoded user field for the user
+        """
+        return user.cached_encoding("pb_params_user", _encode_user_field)
+
+    def serialize(self, user: DevCycleUser, key: str, variable_type: int) -> bytes:
+        key_bytes = key.encode("utf-8")
+        variable = _VARIABLE_KEY_TAG + _encode_varint(len(key_bytes)) + key_bytes
+        # proto3 leaves out fields with the default value, Boolean
+        if variable_type:
+            variable += _VARIABLE_TYPE_TAG + _encode_varint(variable_type)
+        return self._prefix + variable + self.user_field(user) + self._suffix
+
+
 def create_eval_reason_from_pb(eval_reason_pb: pb2.EvalReason_PB) -> EvalReason:  # type: ignore
     """Convert EvalReason_PB protobuf message to EvalReason object"""
     return EvalReason(
@@ -0,0 +1,98 @@
+import json
+import re
+from typing import Callable, Collection, Dict, List, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def _skip_whitespace(data: str, index: int) -> int:
+    match = _whitespace.match(data, index)
+    return match.end() if match else index
+
+
+def _expect(data: str, index: int, char: str) -> int:
+    if index >= len(data) or data[index] != char:
+        raise ValueError(f"Expected '{char}' at position {index}")
+    return index + 1
+
+
+def _fragment(data: str, start: int) -> Tuple[str, int]:
+    _, end = _decoder.raw_decode(data, start)
+    return data[start:end], end
+
+
+def parse_json_array(
+    data: str, parse_element: Callable[[str, int], Tuple[T, int]], index: int = 0
+) -> Tuple[List[T], int]:
+    """
+    Parses the JSON array starting at index, calling parse_element with the start of each element. parse_element
+    returns the parsed element and the index just past it, so nested values can be split without decoding them
+    first.
+
+    :return: A tuple containing the parsed elements and the index just past the closing bracket
+    """
+    index = _expect(data, _skip_whitespace(data, index), "[")
+    elements: List[T] = []
+
+    index = _skip_whitespace(data, index)
+    if index < len(data) and data[index] == "]":
+        return elements, index + 1
+
+    while True:
+        element, end = parse_element(data, _skip_whitespace(data, index))
+        elements.append(element)
+
+        index = _skip_whitespace(data, end)
+        if index < len(data) and data[index] == ",":
+            index += 1
+            continue
+        return elements, _expect(data, index, "]")
+
+
+def split_json_array(data: str, index: int = 0) -> Tuple[List[str], int]:
+    """
+    Splits the JSON array starting at index into the original source text of each of its elements, without
+    re-serializing them.
+
+    :return: A tuple containing the element fragments and the index just past the closing bracket
+    """
+    return parse_json_array(data, _fragment, index)
+
+
+def split_json_object(
+    data: str, index: int = 0, split_arrays: Collection[str] = ()
+) -> Tuple[Dict[str, Union[str, List[str]]], int]:
+    """
+    Splits the JSON object starting at index into the original source text of each of its values, keyed by the
+    decoded property name. The array values of the properties in split_arrays are split into the source text of
+    their elements instead, so each element is only decoded once.
+
+    :return: A tuple containing the value fragments and the index just past the closing brace
+    """
+    index = _expect(data, _skip_whitespace(data, index), "{")
+    fragments: Dict[str, Union[str, List[str]]] = {}
+
+    index = _skip_whitespace(data, index)
+    if index < len(data) and data[index] == "}":
+        return fragments, index + 1
+
+    while True:
+        key, index = _decoder.raw_decode(data, _skip_whitespace(data, index))
+        if not isinstance(key, str):
+            raise ValueError(f"Expected a property name before position {index}")
+        index = _expect(data, _skip_whitespace(data, index), ":")
+
+        start = _skip_whitespace(data, index)
+        if key in split_arrays:
+            fragments[key], end = split_json_array(data, start)
+        else:
+            fragments[key], end = _fragment(data, start)
+
+        index = _skip_whitespace(data, end)
+        if index < len(data) and data[index] == ",":
+            index += 1
+            continue
+        return fragments, _expect(data, index, "}")
@@ -24,6 +24,12 @@ setup(
     url="https://github.com/devcycleHQ/python-server-sdk",
     keywords=["DevCycle"],
     install_requires=REQUIRES,
+    extras_require={
+        "async": ["httpx>=0.24.0"],
+        "http2": ["httpx[http2]>=0.24.0"],
+        "prometheus": ["prometheus_client>=0.16.0"],
+        "opentelemetry": ["opentelemetry-api>=1.20.0"],
+    },
     python_requires=">=3.10",
     packages=find_packages(),
     package_data={
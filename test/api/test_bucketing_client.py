@@ -3,20 +3,27 @@ import logging
 import requests
 import responses
 from responses.registries import OrderedRegistry
+import threading
+import time
 import unittest
 import uuid
+from typing import List, Optional
 
-from devcycle_python_sdk.api.bucketing_client import BucketingAPIClient
+from devcycle_python_sdk.api.bucketing_client import _HEDGE_WORKERS, BucketingAPIClient
 from devcycle_python_sdk.exceptions import (
+    CircuitOpenError,
+    CloudClientBadRequestError,
     CloudClientError,
     CloudClientUnauthorizedError,
     NotFoundError,
 )
+from devcycle_python_sdk.metrics import MetricsRegistry
 from devcycle_python_sdk.options import DevCycleCloudOptions
 from devcycle_python_sdk.models.event import DevCycleEvent
 from devcycle_python_sdk.models.feature import Feature
 from devcycle_python_sdk.models.user import DevCycleUser
 from devcycle_python_sdk.models.variable import Variable
+from test.fixture.stub_servers import BucketingStubServer
 
 logger = logging.getLogger(__name__)
 
@@ -146,6 +153,18 @@ class BucketingClientTest(unittest.TestCase):
         with self.assertRaises(NotFoundError):
             self.test_client.variable("variable-key", self.test_user)
 
+    @responses.activate
+    def test_variable_bad_request(self):
+        responses.add(
+            responses.POST,
+            "https://bucketing-api.devcycle.com/v1/variables/variable-key",
+            status=400,
+        )
+        with self.assertRaises(CloudClientBadRequestError):
+            self.test_client.variable("variable-key", self.test_user)
+        # not retried
+        self.assertEqual(len(responses.calls), 1)
+
     @responses.activate
     def test_variables(self):
         responses.add(
@@ -233,5 +252,551 @@ class BucketingClientTest(unittest.TestCase):
         self.assertEqual(data["events"][0]["type"], "sample-event")
 
 
+class BucketingClientCoalescingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = BucketingStubServer(
+            variables={
+                "json-var": {
+                    "_id": "variable_id",
+                    "key": "json-var",
+                    "type": "JSON",
+                    "value": {"nested": [1, 2, 3]},
+                }
+            }
+        )
+        # hold every variable request until the test releases it
+        self.release = threading.Event()
+        variable_route = self.server.routes[("POST", "/v1/variables/*")]
+
+        def gated_variable(path, body):
+            self.release.wait(5)
+            return variable_route(path, body)
+
+        self.server.routes[("POST", "/v1/variables/*")] = gated_variable
+        self.server.start()
+
+        options = DevCycleCloudOptions(
+            bucketing_api_uri=self.server.url,
+            retry_delay=0,
+            enable_request_coalescing=True,
+        )
+        self.test_client = BucketingAPIClient(
+            "dvc_server_" + str(uuid.uuid4()), options
+        )
+
+    def tearDown(self) -> None:
+        self.release.set()
+        self.server.stop()
+
+    def _call_concurrently(
+        self, func, count: int, coalesced: bool = True
+    ) -> List[object]:
+        results: List[object] = [None] * count
+
+        def call(index):
+            try:
+                results[index] = func()
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+
+        # wait until every caller after the first is waiting on the in-flight request
+        deadline = time.monotonic() + 5
+        while (
+            coalesced
+            and self.test_client.coalesced_request_count < count - 1
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.01)
+        self.release.set()
+
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_requests_are_coalesced(self):
+        results = self._call_concurrently(
+            # separately constructed users for the same user_id have different createdDates
+            lambda: self.test_client.variable("json-var", DevCycleUser(user_id="a")),
+            10,
+        )
+
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(self.test_client.coalesced_request_count, 9)
+        for result in results:
+            self.assertIsInstance(result, Variable)
+            self.assertEqual(result.value, {"nested": [1, 2, 3]})  # type: ignore
+        # every caller gets its own copy of the value
+        self.assertEqual(len({id(result.value) for result in results}), 10)  # type: ignore
+
+    def test_different_requests_are_not_coalesced(self):
+        self.release.set()
+        self.test_client.variable("json-var", DevCycleUser(user_id="a"))
+        self.test_client.variable("json-var", DevCycleUser(user_id="b"))
+        with self.assertRaises(NotFoundError):
+            self.test_client.variable("other-var", DevCycleUser(user_id="a"))
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(self.test_client.coalesced_request_count, 0)
+
+    def test_error_is_shared(self):
+        results = self._call_concurrently(
+            lambda: self.test_client.variable("missing-var", DevCycleUser(user_id="a")),
+            5,
+        )
+        self.assertEqual(self.server.request_count, 1)
+        for result in results:
+            self.assertIsInstance(result, NotFoundError)
+
+    def test_track_is_not_coalesced(self):
+        user = DevCycleUser(user_id="a")
+        event = DevCycleEvent(type="sample-event")
+        threads = [
+            threading.Thread(target=self.test_client.track, args=(user, [event]))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.server.tracked), 3)
+
+    def test_coalescing_disabled(self):
+        self.release.set()
+        self.test_client.options.enable_request_coalescing = False
+        self._call_concurrently(
+            lambda: self.test_client.variable("json-var", DevCycleUser(user_id="a")),
+            3,
+            coalesced=False,
+        )
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(self.test_client.coalesced_request_count, 0)
+
+
+class BucketingClientResponseCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = BucketingStubServer(
+            variables={
+                "string-var": {
+                    "_id": "string_var_id",
+                    "key": "string-var",
+                    "type": "String",
+                    "value": "hello",
+                },
+                "json-var": {
+                    "_id": "json_var_id",
+                    "key": "json-var",
+                    "type": "JSON",
+                    "value": {"nested": True},
+                },
+            },
+            features={"a-feature": {"_id": "feature_id", "key": "a-feature"}},
+        )
+        self.server.start()
+        options = DevCycleCloudOptions(
+            bucketing_api_uri=self.server.url,
+            retry_delay=0,
+            enable_response_cache=True,
+        )
+        self.test_client = BucketingAPIClient(
+            "dvc_server_" + str(uuid.uuid4()), options
+        )
+
+    def tearDown(self) -> None:
+        self.test_client.close()
+        self.server.stop()
+
+    def test_variable_cached_per_user(self):
+        first = self.test_client.variable("string-var", DevCycleUser(user_id="a"))
+        second = self.test_client.variable("string-var", DevCycleUser(user_id="a"))
+        self.assertEqual(first, second)
+        self.assertEqual(self.server.request_count, 1)
+
+        self.test_client.variable("string-var", DevCycleUser(user_id="b"))
+        self.assertEqual(self.server.request_count, 2)
+
+        stats = self.test_client.cache_stats()
+        self.assertIsNotNone(stats)
+        self.assertEqual(stats["hits"], 1)  # type: ignore
+        self.assertEqual(stats["users"], 2)  # type: ignore
+
+    def test_variable_answered_from_all_variables(self):
+        user = DevCycleUser(user_id="a")
+        variables = self.test_client.variables(user)
+        self.assertEqual(self.server.request_count, 1)
+
+        variable = self.test_client.variable("json-var", user)
+        self.assertEqual(variable.value, {"nested": True})
+        self.assertEqual(self.server.request_count, 1)
+
+        # the cached value is not shared with callers
+        variable.value["nested"] = False
+        self.assertEqual(variables["json-var"].value, {"nested": True})
+        self.assertEqual(
+            self.test_client.variable("json-var", user).value, {"nested": True}
+        )
+
+        # a variable missing from the user's variables is not found, as the API would answer
+        with self.assertRaises(NotFoundError):
+            self.test_client.variable("missing-var", user)
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_features_cached(self):
+        user = DevCycleUser(user_id="a")
+        self.test_client.features(user)
+        features = self.test_client.features(user)
+        self.assertEqual(features["a-feature"].key, "a-feature")
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_errors_not_cached(self):
+        user = DevCycleUser(user_id="a")
+        for _ in range(2):
+            with self.assertRaises(NotFoundError):
+                self.test_client.variable("missing-var", user)
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_cache_disabled(self):
+        self.test_client.close()
+        self.test_client = BucketingAPIClient(
+            "dvc_server_" + str(uuid.uuid4()),
+            DevCycleCloudOptions(bucketing_api_uri=self.server.url),
+        )
+        user = DevCycleUser(user_id="a")
+        self.test_client.variable("string-var", user)
+        self.test_client.variable("string-var", user)
+        self.assertEqual(self.server.request_count, 2)
+        self.assertIsNone(self.test_client.cache_stats())
+
+
+class BucketingClientCircuitBreakerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = BucketingStubServer(
+            variables={
+                "string-var": {
+                    "_id": "string_var_id",
+                    "key": "string-var",
+                    "type": "String",
+                    "value": "hello",
+                }
+            }
+        )
+        self.server.start()
+        options = DevCycleCloudOptions(
+            bucketing_api_uri=self.server.url,
+            retry_delay=0,
+            request_retries=5,
+            enable_circuit_breaker=True,
+            circuit_breaker_failure_threshold=3,
+            circuit_breaker_reset_timeout_ms=50,
+        )
+        self.registry = MetricsRegistry()
+        self.test_client = BucketingAPIClient(
+            "dvc_server_" + str(uuid.uuid4()), options, self.registry
+        )
+        self.user = DevCycleUser(user_id="a")
+
+    def tearDown(self) -> None:
+        self.test_client.close()
+        self.server.stop()
+
+    def test_open_circuit_stops_retries(self):
+        self.server.fail_requests = 100
+        with self.assertRaises(CircuitOpenError):
+            self.test_client.variable("string-var", self.user)
+        # the circuit opened after 3 of the 6 attempts
+        self.assertEqual(self.server.request_count, 3)
+
+        with self.assertRaises(CircuitOpenError):
+            self.test_client.variables(self.user)
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(
+            self.test_client.circuit_breaker_metrics()["state"],  # type: ignore[index]
+            "open",
+        )
+
+    def test_last_known_value_while_open(self):
+        self.assertEqual(
+            self.test_client.variable("string-var", self.user).value, "hello"
+        )
+        self.server.variables["string-var"]["value"] = "changed"
+        self.server.fail_requests = 100
+
+        # the request that opens the circuit falls back too
+        self.assertEqual(
+            self.test_client.variable("string-var", self.user).value, "hello"
+        )
+        self.assertEqual(
+            self.test_client.variable("string-var", self.user).value, "hello"
+        )
+
+        metrics = self.test_client.circuit_breaker_metrics()
+        self.assertEqual(metrics["fallback_responses"], 2)  # type: ignore[index]
+
+    def test_registered_metrics(self):
+        self.assertEqual(
+            self.registry.snapshot()["devcycle_bucketing_circuit_state"], 0
+        )
+
+        self.test_client.variable("string-var", self.user)
+        self.server.fail_requests = 100
+        self.test_client.variable("string-var", self.user)
+        with self.assertRaises(CircuitOpenError):
+            self.test_client.variables(self.user)
+
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot["devcycle_bucketing_circuit_state"], 2)
+        self.assertEqual(snapshot["devcycle_bucketing_circuit_opened"], 1)
+        self.assertEqual(snapshot["devcycle_bucketing_circuit_rejected_requests"], 1)
+        self.assertEqual(snapshot["devcycle_bucketing_circuit_fallback_responses"], 1)
+
+    def test_track_not_guarded(self):
+        self.server.fail_requests = 3
+        with self.assertRaises(CircuitOpenError):
+            self.test_client.variables(self.user)
+
+        # tracked events are still sent while the circuit is open
+        self.test_client.track(
+            self.user, [DevCycleEvent(type="customEvent", target="target")]
+        )
+        self.assertEqual(len(self.server.tracked), 1)
+
+        # and failing track requests don't count towards opening it
+        self.server.fail_requests = 100
+        with self.assertRaises(CloudClientError):
+            self.test_client.track_json(self.user.to_json(), [{"type": "a"}])
+        metrics = self.test_client.circuit_breaker_metrics()
+        self.assertEqual(metrics["open_count"], 1)  # type: ignore[index]
+        self.assertEqual(metrics["probes"], 0)  # type: ignore[index]
+
+    def test_probe_reads_variables(self):
+        paths = []
+        routes = dict(self.server.routes)
+
+        def recording(route):
+            def handler(path, body):
+                paths.append(path)
+                return route(path, body)
+
+            return handler
+
+        for key, route in routes.items():
+            self.server.routes[key] = recording(route)
+
+        self.server.fail_requests = 3
+        with self.assertRaises(CircuitOpenError):
+            self.test_client.features(self.user)
+        time.sleep(0.06)
+        with self.assertRaises(CircuitOpenError):
+            self.test_client.features(self.user)
+
+        deadline = time.monotonic() + 1
+        while len(paths) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # the probe is a variables request, not a repeat of the request that failed
+        self.assertEqual(paths, ["/v1/features"] * 3 + ["/v1/variables"])
+
+    def test_recovers_after_probe(self):
+        self.test_client.variable("string-var", self.user)
+        self.server.fail_requests = 3
+        self.test_client.variable("string-var", self.user)
+        self.assertEqual(self.server.request_count, 4)
+
+        time.sleep(0.06)
+        # starts the probe, which succeeds now the server has recovered
+        self.test_client.variable("string-var", self.user)
+        deadline = time.monotonic() + 1
+        while (
+            self.test_client.circuit_breaker_metrics()["state"] != "closed"  # type: ignore[index]
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.01)
+
+        request_count = self.server.request_count
+        self.assertEqual(
+            self.test_client.variable("string-var", self.user).value, "hello"
+        )
+        self.assertEqual(self.server.request_count, request_count + 1)
+
+    def test_client_errors_are_not_failures(self):
+        for _ in range(5):
+            with self.assertRaises(NotFoundError):
+                self.test_client.variable("unknown-var", self.user)
+        self.assertEqual(
+            self.test_client.circuit_breaker_metrics()["state"],  # type: ignore[index]
+            "closed",
+        )
+
+    def test_disabled_by_default(self):
+        client = BucketingAPIClient(
+            "dvc_server_" + str(uuid.uuid4()), DevCycleCloudOptions()
+        )
+        self.assertIsNone(client.circuit_breaker_metrics())
+
+
+class BucketingClientDeadlineTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = BucketingStubServer(
+            variables={
+                "string-var": {
+                    "_id": "string_var_id",
+                    "key": "string-var",
+                    "type": "String",
+                    "value": "hello",
+                }
+            }
+        )
+        self.server.start()
+        self.user = DevCycleUser(user_id="a")
+        self.test_client: Optional[BucketingAPIClient] = None
+
+    def tearDown(self) -> None:
+        if self.test_client is not None:
+            self.test_client.close()
+        self.server.stop()
+
+    def _client(self, **kwargs) -> BucketingAPIClient:
+        options = DevCycleCloudOptions(bucketing_api_uri=self.server.url, **kwargs)
+        self.test_client = BucketingAPIClient(
+            "dvc_server_" + str(uuid.uuid4()), options
+        )
+        return self.test_client
+
+    def _slow_first_requests(self, count: int, seconds: float) -> None:
+        route = self.server.routes[("POST", "/v1/variables/*")]
+        remaining = [count]
+
+        def slow_route(path, body):
+            with self.server._lock:
+                slow = remaining[0] > 0
+                remaining[0] -= 1
+            if slow:
+                time.sleep(seconds)
+            return route(path, body)
+
+        self.server.routes[("POST", "/v1/variables/*")] = slow_route
+
+    def test_deadline_stops_retries(self):
+        client = self._client(
+            request_deadline_ms=250, request_retries=10, retry_delay=100
+        )
+        self.server.fail_requests = 100
+
+        start = time.monotonic()
+        with self.assertRaises(CloudClientError) as context:
+            client.variable("string-var", self.user)
+        self.assertEqual(context.exception.message, "Request deadline exceeded")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertLess(self.server.request_count, 11)
+
+    def test_deadline_limits_attempt_timeout(self):
+        client = self._client(request_deadline_ms=200, request_timeout=5)
+        self._slow_first_requests(1, 1.0)
+
+        start = time.monotonic()
+        with self.assertRaises(CloudClientError):
+            client.variable("string-var", self.user)
+        self.assertLess(time.monotonic() - start, 0.6)
+
+    def test_slow_failed_request_is_hedged(self):
+        client = self._client(enable_request_hedging=True, request_retries=0)
+        for _ in range(20):
+            client._latency.record(0.02)  # type: ignore[union-attr]
+        route = self.server.routes[("POST", "/v1/variables/*")]
+        remaining = [1]
+
+        def slow_error_route(path, body):
+            with self.server._lock:
+                slow = remaining[0] > 0
+                remaining[0] -= 1
+            if slow:
+                time.sleep(0.3)
+                return 500, {"message": "Error"}
+            return route(path, body)
+
+        self.server.routes[("POST", "/v1/variables/*")] = slow_error_route
+
+        # the hedge sent while the first request was in flight answers it
+        self.assertEqual(client.variable("string-var", self.user).value, "hello")
+        self.assertEqual(client.hedged_request_count, 1)
+        self.assertEqual(client.hedge_win_count, 1)
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_slow_request_is_hedged(self):
+        client = self._client(enable_request_hedging=True)
+        for _ in range(20):
+            client._latency.record(0.02)  # type: ignore[union-attr]
+        self._slow_first_requests(1, 0.3)
+
+        self.assertEqual(client.variable("string-var", self.user).value, "hello")
+        self.assertEqual(client.hedged_request_count, 1)
+        # the first request succeeded, so its response is used
+        self.assertEqual(client.hedge_win_count, 0)
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_hedges_skipped_when_executor_busy(self):
+        client = self._client(enable_request_hedging=True, request_retries=0)
+        for _ in range(20):
+            client._latency.record(0.02)  # type: ignore[union-attr]
+        callers = _HEDGE_WORKERS + 8
+        self._slow_first_requests(callers, 0.3)
+
+        values = []
+
+        def call(index):
+            user = DevCycleUser(user_id=f"user-{index}")
+            values.append(client.variable("string-var", user).value)
+
+        threads = [
+            threading.Thread(target=call, args=(index,)) for index in range(callers)
+        ]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(values, ["hello"] * callers)
+        # every request was sent at once, none waited for an executor thread
+        self.assertLess(time.monotonic() - start, 1.0)
+        # only as many hedges as there are executor threads were sent
+        self.assertLessEqual(client.hedged_request_count, _HEDGE_WORKERS)
+        self.assertEqual(
+            self.server.request_count, callers + client.hedged_request_count
+        )
+
+    def test_fast_request_is_not_hedged(self):
+        client = self._client(enable_request_hedging=True)
+        for _ in range(20):
+            client._latency.record(0.5)  # type: ignore[union-attr]
+
+        self.assertEqual(client.variable("string-var", self.user).value, "hello")
+        self.assertEqual(client.hedged_request_count, 0)
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_track_is_not_hedged(self):
+        client = self._client(enable_request_hedging=True)
+        for _ in range(20):
+            client._latency.record(0.02)  # type: ignore[union-attr]
+        track_route = self.server.routes[("POST", "/v1/track")]
+
+        def slow_track(path, body):
+            time.sleep(0.2)
+            return track_route(path, body)
+
+        self.server.routes[("POST", "/v1/track")] = slow_track
+
+        client.track(self.user, [DevCycleEvent(type="customEvent", target="target")])
+        self.assertEqual(client.hedged_request_count, 0)
+        self.assertEqual(len(self.server.tracked), 1)
+
+    def test_not_hedged_without_latency_samples(self):
+        client = self._client(enable_request_hedging=True)
+        self._slow_first_requests(1, 0.1)
+        self.assertEqual(client.variable("string-var", self.user).value, "hello")
+        self.assertEqual(client.hedged_request_count, 0)
+
+
 if __name__ == "__main__":
     unittest.main()
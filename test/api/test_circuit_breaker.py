@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+import unittest
+
+from devcycle_python_sdk.api.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.probe = self._failing_probe
+        self.breaker = CircuitBreaker(
+            failure_threshold=3,
+            reset_timeout_ms=50,
+            max_fallback_entries=2,
+            probe=lambda: self.probe(),
+        )
+
+    def tearDown(self) -> None:
+        self.breaker.close()
+
+    def _failing_probe(self):
+        raise Exception("still failing")
+
+    def _wait_for_state(self, state: str) -> None:
+        deadline = time.monotonic() + 1
+        while self.breaker.state != state and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.breaker.state, state)
+
+    def test_opens_after_consecutive_failures(self):
+        self.assertFalse(self.breaker.record_failure())
+        self.assertFalse(self.breaker.record_failure())
+        self.breaker.record_success()
+        self.assertFalse(self.breaker.record_failure())
+        self.assertFalse(self.breaker.record_failure())
+        self.assertTrue(self.breaker.allow_request())
+
+        self.assertTrue(self.breaker.record_failure())
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+        metrics = self.breaker.metrics()
+        self.assertEqual(metrics["open_count"], 1)
+        self.assertEqual(metrics["rejected_requests"], 1)
+        self.assertEqual(metrics["probes"], 0)
+
+    def test_probe_closes_circuit(self):
+        release = threading.Event()
+        self.probe = lambda: release.wait(1)
+        for _ in range(3):
+            self.breaker.record_failure()
+        time.sleep(0.06)
+
+        # the probe runs in the background, so the request that starts it is still rejected
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        release.set()
+
+        self._wait_for_state(CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.metrics()["probes"], 1)
+
+    def test_failed_probe_reopens_circuit(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        time.sleep(0.06)
+
+        self.assertFalse(self.breaker.allow_request())
+        self._wait_for_state(OPEN)
+        # the reset timeout starts again, so no new probe is started yet
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.metrics()["probes"], 1)
+        self.assertEqual(self.breaker.metrics()["open_count"], 2)
+
+    def test_fallback_values(self):
+        self.assertIsNone(self.breaker.fallback("a"))
+        self.breaker.store("a", {"value": 1})
+        self.breaker.store("b", {"value": 2})
+
+        value = self.breaker.fallback("a")
+        self.assertEqual(value, {"value": 1})
+        value["value"] = "changed"
+        self.assertEqual(self.breaker.fallback("a"), {"value": 1})
+
+        # b is the least recently used entry
+        self.breaker.store("c", {"value": 3})
+        self.assertIsNone(self.breaker.fallback("b"))
+        self.assertEqual(self.breaker.metrics()["fallback_entries"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
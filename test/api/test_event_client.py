@@ -1,4 +1,7 @@
+import gzip
+import json
 import logging
+import time
 import unittest
 import uuid
 from http import HTTPStatus
@@ -6,11 +9,17 @@ from http import HTTPStatus
 import responses
 from responses.registries import OrderedRegistry
 
-from devcycle_python_sdk.api.event_client import EventAPIClient
+from devcycle_python_sdk.api.event_client import (
+    EventAPIClient,
+    _batch_json,
+    _chunk_records,
+    zstandard,
+)
 from devcycle_python_sdk.options import DevCycleLocalOptions
 from devcycle_python_sdk.exceptions import (
     APIClientError,
     APIClientUnauthorizedError,
+    EventBatchPartiallySentError,
     NotFoundError,
 )
 from devcycle_python_sdk.models.event import (
@@ -19,6 +28,7 @@ from devcycle_python_sdk.models.event import (
     EventType,
 )
 from devcycle_python_sdk.models.user import DevCycleUser
+from test.fixture.stub_servers import EventsStubServer
 
 logger = logging.getLogger(__name__)
 
@@ -98,3 +108,289 @@ class EventAPIClientTest(unittest.TestCase):
             )
         with self.assertRaises(APIClientUnauthorizedError):
             self.test_client.publish_events(self.test_batch)
+
+
+def _repetitive_batch(records: int, events_per_record: int):
+    # Mirrors the shape of WASM flush payloads: the same user fields, featureVars and metaData keys in every record
+    batch = []
+    for i in range(records):
+        user = DevCycleUser(
+            user_id=f"user-{i}",
+            email=f"user-{i}@example.com",
+            country="CA",
+            customData={"plan": "enterprise", "region": "us-east-1"},
+            platform="Python",
+            platformVersion="3.12.0",
+            sdkType="server",
+            sdkVersion="3.0.0",
+        )
+        events = [
+            RequestEvent(
+                type=EventType.AggVariableEvaluated,
+                user_id=user.user_id,
+                date="2023-06-27T12:50:19.871Z",
+                clientDate="2023-06-27T12:50:19.871Z",
+                target=f"variable-{j}",
+                value=1,
+                featureVars={"62fbf6566f1ba302829f9e32": "62fbf6566f1ba302829f9e39"},
+                metaData={
+                    "_feature": "62fbf6566f1ba302829f9e32",
+                    "_variation": "62fbf6566f1ba302829f9e39",
+                },
+            )
+            for j in range(events_per_record)
+        ]
+        batch.append(UserEventsBatchRecord(user=user, events=events))
+    return batch
+
+
+class EventAPIClientCompressionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sdk_key = "dvc_server_" + str(uuid.uuid4())
+        self.server = EventsStubServer().start()
+        self.batch = _repetitive_batch(records=20, events_per_record=5)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _client(self, **kwargs) -> EventAPIClient:
+        options = DevCycleLocalOptions(events_api_uri=self.server.url, **kwargs)
+        return EventAPIClient(self.sdk_key, options)
+
+    def test_publish_events_uncompressed(self):
+        self._client().publish_events(self.batch)
+
+        self.assertNotIn("Content-Encoding", self.server.request_headers[0])
+        self.assertEqual(
+            self.server.batches[0]["batch"], [r.to_json() for r in self.batch]
+        )
+
+    def test_publish_events_gzip(self):
+        message = self._client(event_request_compression="gzip").publish_events(
+            self.batch
+        )
+
+        self.assertEqual(message, "Successfully received 20 event batches.")
+        self.assertEqual(self.server.request_headers[0]["Content-Encoding"], "gzip")
+        self.assertEqual(
+            self.server.batches[0]["batch"], [r.to_json() for r in self.batch]
+        )
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_publish_events_zstd(self):
+        self._client(event_request_compression="zstd").publish_events(self.batch)
+
+        self.assertEqual(self.server.request_headers[0]["Content-Encoding"], "zstd")
+        self.assertEqual(
+            self.server.batches[0]["batch"], [r.to_json() for r in self.batch]
+        )
+
+    def test_publish_events_below_threshold(self):
+        client = self._client(
+            event_request_compression="gzip",
+            event_request_compression_threshold=1024 * 1024,
+        )
+        client.publish_events(self.batch)
+
+        self.assertNotIn("Content-Encoding", self.server.request_headers[0])
+        self.assertEqual(len(self.server.batches), 1)
+
+    def test_compression_reduces_bytes_on_wire(self):
+        self._client().publish_events(self.batch)
+        uncompressed_bytes = self.server.bytes_received
+
+        self._client(event_request_compression="gzip").publish_events(self.batch)
+        compressed_bytes = self.server.bytes_received - uncompressed_bytes
+
+        self.assertLess(compressed_bytes * 5, uncompressed_bytes)
+
+    def test_publish_raw_events(self):
+        records = [json.dumps(r.to_json()) for r in self.batch]
+        message = self._client(event_request_compression="gzip").publish_raw_events(
+            records
+        )
+
+        self.assertEqual(message, "Successfully received 20 event batches.")
+        self.assertEqual(
+            self.server.batches[0]["batch"], [r.to_json() for r in self.batch]
+        )
+
+    def test_invalid_max_bytes_option(self):
+        for max_bytes in (0, -1):
+            options = DevCycleLocalOptions(event_request_max_bytes=max_bytes)
+            self.assertIsNone(options.event_request_max_bytes)
+
+    def test_invalid_compression_option(self):
+        options = DevCycleLocalOptions(event_request_compression="brotli")
+        self.assertIsNone(options.event_request_compression)
+
+    def test_encode_payload(self):
+        client = self._client(
+            event_request_compression="gzip", event_request_compression_threshold=10
+        )
+        body, headers = client._encode_payload('{"batch": []}')
+        self.assertEqual(headers, {"Content-Encoding": "gzip"})
+        self.assertEqual(gzip.decompress(body), b'{"batch": []}')
+
+        body, headers = client._encode_payload("{}")
+        self.assertEqual(headers, {})
+        self.assertEqual(body, b"{}")
+
+
+class EventAPIClientChunkingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sdk_key = "dvc_server_" + str(uuid.uuid4())
+        self.server = EventsStubServer().start()
+        self.batch = _repetitive_batch(records=20, events_per_record=5)
+        self.records = [json.dumps(record.to_json()) for record in self.batch]
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _received_events(self):
+        return [
+            (record["user"]["user_id"], event)
+            for batch in self.server.batches
+            for record in batch["batch"]
+            for event in record["events"]
+        ]
+
+    def test_chunk_records_packs_to_max_bytes(self):
+        max_bytes = 5000
+        chunks = _chunk_records(self.records, max_bytes)
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(len(_batch_json(chunk)), max_bytes)
+        self.assertEqual([r for chunk in chunks for r in chunk], self.records)
+
+        # packing is greedy, adding the next record would go over the limit
+        for chunk, next_chunk in zip(chunks, chunks[1:]):
+            self.assertGreater(len(_batch_json(chunk + next_chunk[:1])), max_bytes)
+
+    def test_chunk_records_splits_large_record(self):
+        max_bytes = 1500
+        chunks = _chunk_records(self.records[:1], max_bytes)
+
+        self.assertGreater(len(chunks), 1)
+        events = []
+        for chunk in chunks:
+            self.assertLessEqual(len(_batch_json(chunk)), max_bytes)
+            for record_json in chunk:
+                record = json.loads(record_json)
+                self.assertEqual(record["user"], self.batch[0].user.to_json())
+                events.extend(record["events"])
+        self.assertEqual(events, [e.to_json() for e in self.batch[0].events])
+
+    def test_chunk_records_oversized_event(self):
+        # an event that doesn't fit in a request on its own is sent in a request by itself
+        chunks = _chunk_records(self.records[:2], 100)
+        self.assertEqual(len(chunks), 10)
+        for chunk in chunks:
+            self.assertEqual(len(chunk), 1)
+            self.assertEqual(len(json.loads(chunk[0])["events"]), 1)
+
+    def test_publish_events_max_bytes(self):
+        options = DevCycleLocalOptions(
+            events_api_uri=self.server.url, event_request_max_bytes=5000
+        )
+        EventAPIClient(self.sdk_key, options).publish_events(self.batch)
+
+        self.assertGreater(self.server.request_count, 1)
+        self.assertLessEqual(
+            self.server.bytes_received, 5000 * len(self.server.batches)
+        )
+        expected = [
+            (record.user.user_id, event.to_json())
+            for record in self.batch
+            for event in record.events
+        ]
+        self.assertEqual(self._received_events(), expected)
+
+    @responses.activate(registry=OrderedRegistry)
+    def test_publish_raw_events_partially_sent(self):
+        max_bytes = 5000
+        chunks = _chunk_records(self.records, max_bytes)
+        self.assertGreater(len(chunks), 2)
+        batch_url = "http://localhost:8080/v1/events/batch"
+        for status in (201, 201, 500):
+            responses.add(responses.POST, batch_url, status=status, json={})
+        client = EventAPIClient(
+            self.sdk_key,
+            DevCycleLocalOptions(
+                events_api_uri="http://localhost:8080",
+                event_request_max_bytes=max_bytes,
+            ),
+        )
+
+        with self.assertRaises(EventBatchPartiallySentError) as context:
+            client.publish_raw_events(self.records)
+        # only the records after the sent requests are left to retry
+        self.assertEqual(
+            context.exception.unsent_records,
+            [record for chunk in chunks[2:] for record in chunk],
+        )
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_publish_raw_events_first_request_fails(self):
+        responses.add(
+            responses.POST, "http://localhost:8080/v1/events/batch", status=500
+        )
+        client = EventAPIClient(
+            self.sdk_key,
+            DevCycleLocalOptions(
+                events_api_uri="http://localhost:8080", event_request_max_bytes=5000
+            ),
+        )
+
+        # nothing was sent, so the whole payload is retried
+        with self.assertRaises(APIClientError) as context:
+            client.publish_raw_events(self.records)
+        self.assertNotIsInstance(context.exception, EventBatchPartiallySentError)
+
+    def test_publish_raw_events_max_bytes_single_request(self):
+        options = DevCycleLocalOptions(
+            events_api_uri=self.server.url, event_request_max_bytes=1024 * 1024
+        )
+        EventAPIClient(self.sdk_key, options).publish_raw_events(self.records)
+
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(
+            self.server.batches[0]["batch"], [r.to_json() for r in self.batch]
+        )
+
+
+def _benchmark_publish_events(benchmark, compression):
+    batch = _repetitive_batch(records=100, events_per_record=10)
+    with EventsStubServer() as server:
+        options = DevCycleLocalOptions(
+            events_api_uri=server.url, event_request_compression=compression
+        )
+        client = EventAPIClient("dvc_server_" + str(uuid.uuid4()), options)
+
+        cpu_start = time.process_time()
+        benchmark(client.publish_events, batch)
+        cpu_seconds = time.process_time() - cpu_start
+
+        # bytes on the wire and process CPU time (client and stub server) per request, reported alongside
+        # the wall-clock timings
+        benchmark.extra_info["bytes_on_wire"] = server.bytes_received // max(
+            server.request_count, 1
+        )
+        benchmark.extra_info["cpu_ms_per_request"] = (
+            cpu_seconds * 1000.0 / max(server.request_count, 1)
+        )
+
+
+def test_benchmark_publish_events_uncompressed(benchmark):
+    _benchmark_publish_events(benchmark, None)
+
+
+def test_benchmark_publish_events_gzip(benchmark):
+    _benchmark_publish_events(benchmark, "gzip")
+
+
+@unittest.skipIf(zstandard is None, "zstandard is not installed")
+def test_benchmark_publish_events_zstd(benchmark):
+    _benchmark_publish_events(benchmark, "zstd")
@@ -0,0 +1,39 @@
+import logging
+import unittest
+
+from devcycle_python_sdk.api.hedging import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTrackerTest(unittest.TestCase):
+    def test_percentile(self):
+        tracker = LatencyTracker(95)
+        for i in range(1, 20):
+            tracker.record(i / 1000.0)
+        # not enough samples yet
+        self.assertIsNone(tracker.value())
+
+        tracker.record(0.02)
+        self.assertEqual(tracker.value(), 0.019)
+
+        # the percentile is computed again every 50 samples
+        for i in range(21, 70):
+            tracker.record(i / 1000.0)
+        self.assertEqual(tracker.value(), 0.019)
+        tracker.record(0.07)
+        self.assertEqual(tracker.value(), 0.067)
+
+    def test_percentile_follows_recent_latencies(self):
+        tracker = LatencyTracker(50)
+        for _ in range(1000):
+            tracker.record(0.01)
+        self.assertEqual(tracker.value(), 0.01)
+
+        for _ in range(1000):
+            tracker.record(0.2)
+        self.assertEqual(tracker.value(), 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+import logging
+import socket
+import threading
+import time
+import unittest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from unittest.mock import patch
+
+from requests.adapters import HTTPAdapter
+
+from devcycle_python_sdk.api.bucketing_client import BucketingAPIClient
+from devcycle_python_sdk.api.http_session import (
+    HTTP2Adapter,
+    create_session,
+    http2_available,
+    prewarm_connections,
+    prewarm_in_background,
+)
+from devcycle_python_sdk.exceptions import CloudClientError, NotFoundError
+from devcycle_python_sdk.models.user import DevCycleUser
+from devcycle_python_sdk.options import DevCycleCloudOptions, DevCycleLocalOptions
+from test.fixture.stub_servers import BucketingStubServer, H2StubServer
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPSessionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = BucketingStubServer(features={})
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _wait_for_connections(self, count: int) -> None:
+        deadline = time.monotonic() + 2
+        while self.server.connection_count < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_pool_options(self):
+        options = DevCycleCloudOptions(
+            http_pool_maxsize=32, http_pool_block=True, http_tcp_keepalive=True
+        )
+        session = create_session(options, {"Authorization": "key"})
+        self.assertEqual(session.headers["Authorization"], "key")
+        self.assertEqual(session.max_redirects, 0)
+
+        pool_kw = session.get_adapter("https://example.com").poolmanager.connection_pool_kw  # type: ignore[attr-defined]
+        self.assertEqual(pool_kw["maxsize"], 32)
+        self.assertTrue(pool_kw["block"])
+        self.assertIn(
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), pool_kw["socket_options"]
+        )
+
+    def test_no_keepalive_by_default(self):
+        session = create_session(DevCycleLocalOptions(), {})
+        pool_kw = session.get_adapter("https://example.com").poolmanager.connection_pool_kw  # type: ignore[attr-defined]
+        self.assertEqual(pool_kw["maxsize"], 10)
+        self.assertNotIn("socket_options", pool_kw)
+
+    def test_prewarmed_connections_are_used(self):
+        session = create_session(DevCycleCloudOptions(http_pool_maxsize=4), {})
+        self.assertEqual(prewarm_connections(session, self.server.url, 4, 1.0), 4)
+        self._wait_for_connections(4)
+        self.assertEqual(self.server.connection_count, 4)
+        self.assertEqual(self.server.request_count, 0)
+
+        threads = [
+            threading.Thread(
+                target=session.post, args=(self.server.url + "/v1/features",)
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.server.request_count, 4)
+        self.assertEqual(self.server.connection_count, 4)
+
+    def test_prewarm_error_is_logged(self):
+        session = create_session(DevCycleCloudOptions(), {})
+        # nothing is listening on a port once its socket is closed
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+        thread = prewarm_in_background(session, url, 2, 0.5)
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+
+    def test_client_prewarms_connections(self):
+        options = DevCycleCloudOptions(
+            bucketing_api_uri=self.server.url, http_prewarm_connections=2
+        )
+        BucketingAPIClient("dvc_server_" + str(uuid.uuid4()), options)
+        self._wait_for_connections(2)
+        self.assertEqual(self.server.connection_count, 2)
+
+    def test_prewarm_limited_to_pool_size(self):
+        options = DevCycleLocalOptions(http_pool_maxsize=4, http_prewarm_connections=8)
+        self.assertEqual(options.http_prewarm_connections, 4)
+
+
+VARIABLES: Dict[str, dict] = {
+    "string-var": {
+        "_id": "614ef6ea475129459160721a",
+        "key": "string-var",
+        "type": "String",
+        "value": "variationOn",
+    }
+}
+
+
+def _closed_port_url() -> str:
+    # nothing is listening on a port once its socket is closed
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def _http2_client(url: str, max_connections: int, **kwargs) -> BucketingAPIClient:
+    options = DevCycleCloudOptions(
+        bucketing_api_uri=url,
+        enable_http2=True,
+        http_pool_maxsize=max_connections,
+        retry_delay=0,
+        **kwargs,
+    )
+    client = BucketingAPIClient("dvc_server_" + str(uuid.uuid4()), options)
+    # The stand-in server speaks HTTP/2 over plain HTTP, which needs prior knowledge rather than negotiation
+    client.session.get_adapter(url).close()
+    client.session.mount("http://", HTTP2Adapter(max_connections, http1=False))
+    return client
+
+
+@unittest.skipIf(not http2_available(), "httpx and h2 are not installed")
+class HTTP2SessionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = BucketingStubServer(variables=VARIABLES)
+        self.server = H2StubServer(self.stub)
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_http2_adapter_enabled(self):
+        session = create_session(DevCycleCloudOptions(), {}, http2=True)
+        self.assertIsInstance(session.get_adapter("https://example.com"), HTTP2Adapter)
+
+    def test_http2_unavailable_uses_http1(self):
+        with patch(
+            "devcycle_python_sdk.api.http_session.http2_available", return_value=False
+        ):
+            session = create_session(DevCycleCloudOptions(), {}, http2=True)
+        self.assertIsInstance(session.get_adapter("https://example.com"), HTTPAdapter)
+
+    def test_requests_are_multiplexed(self):
+        client = _http2_client(self.server.url, max_connections=1)
+        user = DevCycleUser(user_id="test")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(lambda _: client.variable("string-var", user), range(8))
+            )
+        client.close()
+
+        self.assertEqual([result.value for result in results], ["variationOn"] * 8)
+        self.assertEqual(self.stub.request_count, 8)
+        self.assertEqual(self.server.connection_count, 1)
+        self.assertEqual(
+            self.stub.request_headers[0]["Content-Type"], "application/json"
+        )
+
+    def test_errors_are_mapped(self):
+        client = _http2_client(self.server.url, max_connections=1)
+        with self.assertRaises(NotFoundError):
+            client.variable("unknown-var", DevCycleUser(user_id="test"))
+        client.close()
+
+        client = _http2_client(_closed_port_url(), max_connections=1, request_retries=1)
+        with self.assertRaises(CloudClientError) as context:
+            client.variables(DevCycleUser(user_id="test"))
+        self.assertEqual(context.exception.message, "Retries exceeded")
+        client.close()
+
+    def test_http1_server(self):
+        # Without prior knowledge, servers that don't negotiate HTTP/2 are sent HTTP/1.1 requests
+        with BucketingStubServer(variables=VARIABLES) as server:
+            options = DevCycleCloudOptions(
+                bucketing_api_uri=server.url, enable_http2=True
+            )
+            client = BucketingAPIClient("dvc_server_" + str(uuid.uuid4()), options)
+            variables = client.variables(DevCycleUser(user_id="test"))
+            client.close()
+        self.assertEqual(variables["string-var"].value, "variationOn")
+
+
+def _benchmark_concurrent_variables(benchmark, http2: bool):
+    stub = BucketingStubServer(variables=VARIABLES)
+    server = H2StubServer(stub) if http2 else stub
+    with server:
+        if http2:
+            client = _http2_client(server.url, max_connections=2)
+        else:
+            options = DevCycleCloudOptions(
+                bucketing_api_uri=server.url, http_pool_maxsize=2
+            )
+            client = BucketingAPIClient("dvc_server_" + str(uuid.uuid4()), options)
+        user = DevCycleUser(user_id="test")
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+
+            def run():
+                list(
+                    executor.map(
+                        lambda _: client.variable("string-var", user), range(100)
+                    )
+                )
+
+            start = time.perf_counter()
+            benchmark(run)
+            elapsed = time.perf_counter() - start
+        client.close()
+
+        # connections opened over all rounds, including HTTP/1.1 connections discarded when the pool was full
+        benchmark.extra_info["connections"] = server.connection_count
+        benchmark.extra_info["requests_per_second"] = stub.request_count / elapsed
+
+
+def test_benchmark_concurrent_variables_http1(benchmark):
+    _benchmark_concurrent_variables(benchmark, http2=False)
+
+
+@unittest.skipIf(not http2_available(), "httpx and h2 are not installed")
+def test_benchmark_concurrent_variables_http2(benchmark):
+    _benchmark_concurrent_variables(benchmark, http2=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,14 +10,25 @@ from devcycle_python_sdk.models.bucketed_config import (
     Project,
     ProjectSettings,
 )
-from devcycle_python_sdk.models.eval_reason import EvalReason
+from devcycle_python_sdk.models.eval_reason import EvalReason, EvalReasons
 from devcycle_python_sdk.models.feature import Feature
 from devcycle_python_sdk.models.variable import Variable
 from devcycle_python_sdk.models.platform_data import default_platform_data
 from devcycle_python_sdk.models.user import DevCycleUser
 from devcycle_python_sdk.models.event import DevCycleEvent, EventType
 from devcycle_python_sdk.models.variable import TypeEnum
-from test.fixture.data import small_config, large_config, special_character_config
+from test.fixture.config_generator import (
+    ConfigSpec,
+    generate_config,
+    generate_traffic,
+    generate_users,
+)
+from test.fixture.data import (
+    small_config,
+    small_config_json,
+    large_config,
+    special_character_config,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +86,36 @@ class LocalBucketingTest(unittest.TestCase):
         self.local_bucketing.store_config(large_config())
         self.local_bucketing.store_config(special_character_config())
 
+    def test_store_generated_config(self) -> None:
+        spec = ConfigSpec(features=20, audiences=5, seed=1)
+        config = generate_config(spec)
+        self.assertEqual(len(config["features"]), 20)
+        self.assertEqual(len(config["variables"]), 20 * spec.variables_per_feature)
+        self.assertEqual(generate_config(spec)["variables"], config["variables"])
+
+        self.local_bucketing.store_config(json.dumps(config))
+        platform_json = json.dumps(default_platform_data().to_json())
+        self.local_bucketing.set_platform_data(platform_json)
+        self.local_bucketing.init_event_queue(self.client_uuid, "{}")
+
+        variable_types = {
+            variable["key"]: variable["type"] for variable in config["variables"]
+        }
+        default_values = {"Boolean": False, "String": "", "Number": 0, "JSON": {}}
+        traffic = generate_traffic(config, generate_users(20, spec))
+        bucketed = 0
+        for _ in range(100):
+            user, key = next(traffic)
+            result, _ = self.local_bucketing.get_variable_for_user_protobuf(
+                user=user, key=key, default_value=default_values[variable_types[key]]
+            )
+            if result is not None:
+                self.assertEqual(result.key, key)
+                self.assertEqual(result.type, variable_types[key])
+                bucketed += 1
+        # every feature has a target for all users, so only rollouts leave users out
+        self.assertGreater(bucketed, 50)
+
     def test_set_platform_data(self):
         # should set the data without any errors
         platform_json = json.dumps(default_platform_data().to_json())
@@ -338,6 +379,40 @@ class LocalBucketingTest(unittest.TestCase):
         self.assertEqual(len(results[0].records), 1)
         self.assertEqual(len(results[0].records[0].events), 2)
 
+    def test_flush_event_queue_raw(self):
+        self.local_bucketing.store_config(small_config())
+        platform_json = json.dumps(default_platform_data().to_json())
+        self.local_bucketing.set_platform_data(platform_json)
+
+        self.local_bucketing.init_event_queue(
+            self.client_uuid,
+            json.dumps(
+                {
+                    "disableAutomaticEventLogging": False,
+                    "disableCustomEventLogging": False,
+                    "minEventsPerFlush": 1,
+                }
+            ),
+        )
+
+        user = DevCycleUser(user_id="test_user_id")
+        self.local_bucketing.get_variable_for_user_protobuf(
+            user=user, key="string-var", default_value="default value"
+        )
+        self.local_bucketing.get_variable_for_user_protobuf(
+            user=user, key="bool-var", default_value=False
+        )
+        results = self.local_bucketing.flush_event_queue_raw()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].eventCount, 2)
+        self.assertTrue(len(results[0].payloadId) > 0)
+        self.assertEqual(len(results[0].records), 1)
+
+        # records are passed through as the JSON exported by the WASM, including fields the models don't know about
+        record = json.loads(results[0].records[0])
+        self.assertEqual(len(record["events"]), 2)
+        self.assertIn("hostname", record["user"])
+
     def test_on_event_payload_failure_unknown_payload_id(self):
         self.local_bucketing.store_config(small_config())
         platform_json = json.dumps(default_platform_data().to_json())
@@ -410,6 +485,154 @@ class LocalBucketingTest(unittest.TestCase):
             event_json, variable_variation_map_json
         )
 
+    def _init_events(self) -> None:
+        self.local_bucketing.store_config(small_config())
+        platform_json = json.dumps(default_platform_data().to_json())
+        self.local_bucketing.set_platform_data(platform_json)
+        self.local_bucketing.init_event_queue(
+            self.client_uuid, json.dumps({"minEventsPerFlush": 1})
+        )
+
+    def assert_same_events(self, payloads, wasm_payloads) -> None:
+        # the recorded events match the ones the WASM module creates, apart from the dates
+        self.assertEqual(len(payloads), 1)
+        self.assertEqual(payloads[0].eventCount, wasm_payloads[0].eventCount)
+        record = json.loads(payloads[0].records[0])
+        wasm_record = json.loads(wasm_payloads[0].records[0])
+        for dated in [record["user"], wasm_record["user"]] + [
+            event for r in (record, wasm_record) for event in r["events"]
+        ]:
+            for key in ("createdDate", "lastSeenDate", "date", "clientDate"):
+                if key in dated:
+                    self.assertRegex(dated.pop(key), r"^\d{4}-\d\d-\d\dT[\d:.]+Z$")
+        self.assertEqual(record, wasm_record)
+
+    def test_record_variable_evaluated(self):
+        self._init_events()
+        user = DevCycleUser(user_id="test_user_id")
+        for _ in range(3):
+            self.local_bucketing.get_variable_for_user_protobuf(
+                user=user, key="string-var", default_value="default"
+            )
+        wasm_payloads = self.local_bucketing.flush_event_queue_raw()
+        self.local_bucketing.on_event_payload_success(wasm_payloads[0].payloadId)
+
+        for _ in range(3):
+            self.local_bucketing.record_variable_evaluated(
+                "string-var", "62fbf6566f1ba302829f9e32", "62fbf6566f1ba302829f9e39"
+            )
+        self.assert_same_events(
+            self.local_bucketing.flush_event_queue_raw(), wasm_payloads
+        )
+
+    def test_record_variable_evaluated_split(self):
+        # serve the feature's variations to a random half of the users each
+        config = small_config_json()
+        feature = config["features"][0]
+        variation_ids = [variation["_id"] for variation in feature["variations"]]
+        for target in feature["configuration"]["targets"]:
+            target["distribution"] = [
+                {"_variation": variation_id, "percentage": 0.5}
+                for variation_id in variation_ids
+            ]
+        self.local_bucketing.store_config(json.dumps(config))
+        self.local_bucketing.set_platform_data(
+            json.dumps(default_platform_data().to_json())
+        )
+        self.local_bucketing.init_event_queue(
+            self.client_uuid, json.dumps({"minEventsPerFlush": 1})
+        )
+
+        served = []
+        for user_id in ["a", "b", "c", "d"]:
+            variable, _ = self.local_bucketing.get_variable_for_user_protobuf(
+                user=DevCycleUser(user_id=user_id),
+                key="string-var",
+                default_value="default",
+            )
+            self.assertEqual(variable.eval.reason, EvalReasons.SPLIT)
+            served.append(
+                {
+                    "variationOn": "62fbf6566f1ba302829f9e39",
+                    "variationOff": "62fbf6566f1ba302829f9e38",
+                }[variable.value]
+            )
+        self.assertEqual(len(set(served)), 2)
+        wasm_payloads = self.local_bucketing.flush_event_queue_raw()
+        self.local_bucketing.on_event_payload_success(wasm_payloads[0].payloadId)
+
+        for variation_id in served:
+            self.local_bucketing.record_variable_evaluated(
+                "string-var", feature["_id"], variation_id, EvalReasons.SPLIT
+            )
+        self.assert_same_events(
+            self.local_bucketing.flush_event_queue_raw(), wasm_payloads
+        )
+
+    def test_record_variable_evaluated_reasons(self):
+        self._init_events()
+        for reason in ["TARGETING_MATCH", "SPLIT", "SPLIT"]:
+            self.local_bucketing.record_variable_evaluated(
+                "string-var",
+                "62fbf6566f1ba302829f9e32",
+                "62fbf6566f1ba302829f9e39",
+                reason,
+            )
+        payloads = self.local_bucketing.flush_event_queue_raw()
+        self.assertEqual(payloads[0].eventCount, 1)
+        events = json.loads(payloads[0].records[0])["events"]
+        # evaluations of the same variation are one event, counted by reason
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["value"], 3)
+        self.assertEqual(
+            events[0]["metaData"]["eval"], {"TARGETING_MATCH": 1, "SPLIT": 2}
+        )
+
+    def test_record_variable_defaulted(self):
+        self._init_events()
+        user = DevCycleUser(user_id="test_user_id")
+        for _ in range(2):
+            self.local_bucketing.get_variable_for_user_protobuf(
+                user=user, key="unknown-var", default_value="default"
+            )
+        wasm_payloads = self.local_bucketing.flush_event_queue_raw()
+        self.local_bucketing.on_event_payload_success(wasm_payloads[0].payloadId)
+
+        for _ in range(2):
+            self.local_bucketing.record_variable_defaulted("unknown-var")
+        self.assertEqual(self.local_bucketing.get_event_queue_size(), 1)
+        payloads = self.local_bucketing.flush_event_queue_raw()
+
+        self.assert_same_events(payloads, wasm_payloads)
+
+        self.local_bucketing.on_event_payload_success(payloads[0].payloadId)
+        self.assertEqual(self.local_bucketing.get_event_queue_size(), 0)
+        self.assertEqual(self.local_bucketing.flush_event_queue_raw(), [])
+
+    def test_record_variable_defaulted_retry(self):
+        self._init_events()
+        self.local_bucketing.record_variable_defaulted("unknown-var")
+        payloads = self.local_bucketing.flush_event_queue()
+        self.assertEqual(len(payloads), 1)
+        self.assertEqual(payloads[0].records[0].events[0].value, 1)
+
+        # retryable failures are sent again, with the events recorded since
+        self.local_bucketing.on_event_payload_failure(payloads[0].payloadId, True)
+        self.local_bucketing.record_variable_defaulted("unknown-var")
+        payloads = self.local_bucketing.flush_event_queue()
+        self.assertEqual(payloads[0].records[0].events[0].value, 2)
+
+        self.local_bucketing.on_event_payload_failure(payloads[0].payloadId, False)
+        self.assertEqual(self.local_bucketing.flush_event_queue(), [])
+
+    def test_record_variable_defaulted_automatic_events_disabled(self):
+        self.local_bucketing.store_config(small_config())
+        self.local_bucketing.init_event_queue(
+            self.client_uuid, json.dumps({"disableAutomaticEventLogging": True})
+        )
+        self.local_bucketing.record_variable_defaulted("unknown-var")
+        self.assertEqual(self.local_bucketing.get_event_queue_size(), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,316 @@
+"""
+Benchmarks for the local bucketing hot paths, run against a synthetic config served from a local stand-in CDN.
+Benchmarks are skipped by default, run them with:
+
+    DEVCYCLE_BENCHMARK_FEATURES=1000 pytest test/benchmark --benchmark-only
+
+DEVCYCLE_BENCHMARK_FEATURES sets the number of features in the config (default 100). The small config's feature is
+repeated that many times for the per-operation benchmarks, while the generated config benchmarks use a config and
+user population from test.fixture.config_generator, with audiences, custom data filters and rollouts.
+Besides the pytest-benchmark timings and ops/sec, each benchmark reports the p50 and p99 round times and the
+Python memory allocated per call, traced separately from the timed rounds. Memory allocated inside the WASM
+module is not traced.
+"""
+
+import json
+import math
+import os
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from devcycle_python_sdk import DevCycleLocalClient, DevCycleLocalOptions
+from devcycle_python_sdk.api.local_bucketing import LocalBucketing
+from devcycle_python_sdk.models.event import DevCycleEvent, RawFlushPayload
+from devcycle_python_sdk.models.platform_data import default_platform_data
+from devcycle_python_sdk.models.user import DevCycleUser
+from devcycle_python_sdk.protobuf.utils import create_dvcuser_pb
+from test.fixture.config_generator import (
+    ConfigSpec,
+    generate_config,
+    generate_traffic,
+    generate_users,
+)
+from test.fixture.data import scaled_config_json
+from test.fixture.stub_servers import ConfigCDNStubServer, EventsStubServer
+
+FEATURE_COUNT = int(os.environ.get("DEVCYCLE_BENCHMARK_FEATURES", "100"))
+
+# Calls traced to measure allocations
+_ALLOCATION_CALLS = 20
+
+
+def _user() -> DevCycleUser:
+    return DevCycleUser(
+        user_id="benchmark_user",
+        email="benchmark@example.com",
+        country="CA",
+        customData={"plan": "enterprise", "seats": 25, "beta": True},
+    )
+
+
+def _report(
+    benchmark,
+    function: Callable[..., Any],
+    *args: Any,
+    setup: Optional[Callable[[], None]] = None,
+) -> Any:
+    """
+    Benchmarks function, adding round time percentiles and allocations per call to the report. If setup is given,
+    it is run before every call, outside the timings, for a fixed number of rounds.
+    """
+    if setup is None:
+        result = benchmark(function, *args)
+    else:
+        result = benchmark.pedantic(
+            function, args=args, setup=setup, rounds=30, warmup_rounds=2
+        )
+
+    # stats aren't collected when benchmarks are disabled
+    if benchmark.stats is not None:
+        data = sorted(benchmark.stats.stats.data)
+        benchmark.extra_info["p50_us"] = _percentile(data, 50) * 1e6
+        benchmark.extra_info["p99_us"] = _percentile(data, 99) * 1e6
+    benchmark.extra_info["config_features"] = FEATURE_COUNT
+    benchmark.extra_info.update(_allocations(function, args, setup))
+    return result
+
+
+def _percentile(data: List[float], percentile: float) -> float:
+    index = math.ceil(percentile / 100.0 * len(data)) - 1
+    return data[min(max(index, 0), len(data) - 1)]
+
+
+def _allocations(
+    function: Callable[..., Any],
+    args: Tuple[Any, ...],
+    setup: Optional[Callable[[], None]],
+) -> dict:
+    peak = 0
+    retained = 0
+    tracemalloc.start()
+    try:
+        for _ in range(_ALLOCATION_CALLS):
+            if setup is not None:
+                setup()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            function(*args)
+            current, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak - before)
+            retained += current - before
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_bytes": peak,
+        "alloc_retained_bytes": retained // _ALLOCATION_CALLS,
+    }
+
+
+@contextmanager
+def _local_client(
+    config: Optional[dict] = None, **options: Any
+) -> Iterator[DevCycleLocalClient]:
+    sdk_key = "dvc_server_" + str(uuid.uuid4())
+    if config is None:
+        config = scaled_config_json(FEATURE_COUNT)
+    with ConfigCDNStubServer(config) as cdn, EventsStubServer() as events_api:
+        client = DevCycleLocalClient(
+            sdk_key,
+            DevCycleLocalOptions(
+                config_cdn_uri=cdn.url,
+                events_api_uri=events_api.url,
+                config_polling_interval_ms=60 * 60 * 1000,
+                event_flush_interval_ms=60 * 60 * 1000,
+                disable_realtime_updates=True,
+                **options,
+            ),
+        )
+        try:
+            assert client.config_manager.wait_for_initialization(30)
+            yield client
+        finally:
+            client.close()
+
+
+def _benchmark_variable(benchmark, key: str, default_value: Any) -> None:
+    with _local_client(disable_automatic_event_logging=True) as client:
+        variable = _report(benchmark, client.variable, _user(), key, default_value)
+        assert not variable.isDefaulted
+
+
+def test_benchmark_variable_boolean(benchmark):
+    _benchmark_variable(benchmark, "a-cool-new-feature", False)
+
+
+def test_benchmark_variable_string(benchmark):
+    _benchmark_variable(benchmark, "string-var", "default")
+
+
+def test_benchmark_variable_number(benchmark):
+    _benchmark_variable(benchmark, "num-var", 0)
+
+
+def test_benchmark_variable_json(benchmark):
+    _benchmark_variable(benchmark, "json-var", {})
+
+
+def test_benchmark_variable_unknown(benchmark):
+    with _local_client(disable_automatic_event_logging=True) as client:
+        variable = _report(benchmark, client.variable, _user(), "unknown-var", "")
+        assert variable.isDefaulted
+
+
+def test_benchmark_variable_unconditional(benchmark):
+    # a variable served to all users, which is evaluated without the WASM module
+    config = generate_config(
+        ConfigSpec(features=FEATURE_COUNT, unconditional_features=1)
+    )
+    with _local_client(config, disable_automatic_event_logging=True) as client:
+        variable = _report(benchmark, client.variable, _user(), "var-0-1", "")
+        assert not variable.isDefaulted
+
+
+def test_benchmark_variable_cached(benchmark):
+    # repeated evaluations for users with the same targeting attributes are answered from the evaluation cache
+    with _local_client(
+        disable_automatic_event_logging=True, enable_evaluation_cache=True
+    ) as client:
+        variable = _report(benchmark, client.variable, _user(), "string-var", "")
+        assert not variable.isDefaulted
+        assert client.config_manager.evaluation_cache.hits > 0
+
+
+def test_benchmark_all_variables(benchmark):
+    with _local_client() as client:
+        variables = _report(benchmark, client.all_variables, _user())
+        assert len(variables) == FEATURE_COUNT * 5
+
+
+def test_benchmark_track(benchmark):
+    # events are flushed to the stand-in events API as the queue fills, as they would be in production
+    with _local_client() as client:
+        event = DevCycleEvent(type="customEvent", target="benchmark", value=1)
+        _report(benchmark, client.track, _user(), event)
+
+
+def _bucketing() -> LocalBucketing:
+    local_bucketing = LocalBucketing("dvc_server_" + str(uuid.uuid4()))
+    local_bucketing.set_platform_data(json.dumps(default_platform_data().to_json()))
+    local_bucketing.init_event_queue(str(uuid.uuid4()), "{}")
+    return local_bucketing
+
+
+def test_benchmark_store_config(benchmark):
+    local_bucketing = _bucketing()
+    config = json.dumps(scaled_config_json(FEATURE_COUNT))
+    start = time.perf_counter()
+    _report(benchmark, local_bucketing.store_config, config)
+    benchmark.extra_info["config_bytes"] = len(config)
+    benchmark.extra_info["total_seconds"] = time.perf_counter() - start
+
+
+def test_benchmark_flush_event_queue(benchmark):
+    local_bucketing = _bucketing()
+    local_bucketing.store_config(json.dumps(scaled_config_json(FEATURE_COUNT)))
+    user_json = json.dumps(_user().to_json())
+    event_json = json.dumps(
+        DevCycleEvent(type="customEvent", target="benchmark").to_json()
+    )
+
+    sent: List[str] = []
+
+    def flush_event_queue():
+        payloads = local_bucketing.flush_event_queue()
+        sent.extend(payload.payloadId for payload in payloads)
+        return payloads
+
+    def queue_events():
+        # mark the previous round's payloads as sent, so they are removed from the queue
+        for payload_id in sent:
+            local_bucketing.on_event_payload_success(payload_id)
+        sent.clear()
+        for _ in range(100):
+            local_bucketing.queue_event(user_json, event_json)
+
+    payloads = _report(benchmark, flush_event_queue, setup=queue_events)
+    assert payloads[0].eventCount == 100
+
+
+def _flush_payloads_json() -> str:
+    # The JSON the WASM module exports when flushing its queue, for 1000 events from 100 users
+    local_bucketing = _bucketing()
+    local_bucketing.store_config(json.dumps(scaled_config_json(FEATURE_COUNT)))
+    event_json = json.dumps(
+        DevCycleEvent(type="customEvent", target="benchmark").to_json()
+    )
+    for i in range(1000):
+        user = DevCycleUser(user_id=f"benchmark_user_{i % 100}", country="CA")
+        local_bucketing.queue_event(json.dumps(user.to_json()), event_json)
+    payloads = local_bucketing.flush_event_queue_raw()
+    return json.dumps(
+        [
+            {
+                "payloadId": payload.payloadId,
+                "records": [json.loads(record) for record in payload.records],
+                "eventCount": payload.eventCount,
+            }
+            for payload in payloads
+        ]
+    )
+
+
+def test_benchmark_parse_flush_payloads_raw(benchmark):
+    benchmark.group = "parse_flush_payloads"
+    payloads = _report(
+        benchmark, RawFlushPayload.list_from_json, _flush_payloads_json()
+    )
+    assert sum(payload.eventCount for payload in payloads) == 1000
+
+
+def test_benchmark_parse_flush_payloads_plain(benchmark):
+    benchmark.group = "parse_flush_payloads"
+
+    # Decoding the payloads and serializing each record again, which raw mode avoids
+    def parse(data: str) -> List[List[str]]:
+        return [
+            [json.dumps(record) for record in payload["records"]]
+            for payload in json.loads(data)
+        ]
+
+    payloads = _report(benchmark, parse, _flush_payloads_json())
+    assert sum(len(records) for records in payloads) == 100
+
+
+def test_benchmark_create_dvcuser_pb(benchmark):
+    user = _user()
+    user_pb = _report(benchmark, create_dvcuser_pb, user)
+    assert user_pb.user_id == "benchmark_user"
+
+
+def test_benchmark_store_generated_config(benchmark):
+    local_bucketing = _bucketing()
+    config = json.dumps(generate_config(ConfigSpec(features=FEATURE_COUNT)))
+    _report(benchmark, local_bucketing.store_config, config)
+    benchmark.extra_info["config_bytes"] = len(config)
+
+
+def test_benchmark_generated_traffic(benchmark):
+    spec = ConfigSpec(features=FEATURE_COUNT)
+    config = generate_config(spec)
+    default_values = {"Boolean": False, "String": "", "Number": 0, "JSON": {}}
+    variable_defaults = {
+        variable["key"]: default_values[variable["type"]]
+        for variable in config["variables"]
+    }
+    traffic = generate_traffic(config, generate_users(1000, spec))
+
+    with _local_client(config) as client:
+
+        def evaluate():
+            user, key = next(traffic)
+            return client.variable(user, key, variable_defaults[key])
+
+        _report(benchmark, evaluate)
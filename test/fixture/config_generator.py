@@ -0,0 +1,335 @@
+"""
+Generates synthetic server configs (the config/v2/server schema served by the config CDN), matching user
+populations and variable traffic, for measuring how the SDK scales with config size.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+from devcycle_python_sdk.models.user import DevCycleUser
+
+VARIABLE_TYPES = ["Boolean", "String", "Number", "JSON"]
+FEATURE_TYPES = ["release", "experiment", "permission", "ops"]
+ROLLOUT_TYPES = ["schedule", "gradual", "stepped"]
+COUNTRIES = ["CA", "US", "GB", "FR", "DE", "JP", "BR", "IN"]
+PLATFORMS = ["iOS", "Android", "web", "python"]
+
+
+@dataclass
+class ConfigSpec:
+    """
+    The shape of a generated config. Every feature has one target per audience it uses, followed by a target
+    for all users, so most users are bucketed into most features.
+
+    custom_data_keys are shared between the audience filters and the generated users, with String, Number and
+    Boolean keys in turn. rollout_fraction of the targets get a rollout, cycling through the rollout types.
+
+    The first unconditional_features features instead have a single target serving one variation to all users,
+    so their variables don't depend on the user.
+    """
+
+    features: int = 100
+    variables_per_feature: int = 4
+    variations_per_feature: int = 2
+    audiences: int = 20
+    filters_per_audience: int = 3
+    targets_per_feature: int = 2
+    custom_data_keys: int = 10
+    custom_data_values: int = 20
+    rollout_fraction: float = 0.25
+    unconditional_features: int = 0
+    seed: int = 0
+
+
+class _Ids:
+    def __init__(self) -> None:
+        self._next = 0
+
+    def new(self) -> str:
+        self._next += 1
+        return f"{self._next:024x}"
+
+
+def _date(days: float) -> str:
+    when = datetime.now(timezone.utc) + timedelta(days=days)
+    return when.isoformat().replace("+00:00", "Z")
+
+
+def _custom_data_key(index: int) -> Tuple[str, str]:
+    key_type = ["String", "Number", "Boolean"][index % 3]
+    return f"data-key-{index}", key_type
+
+
+def _custom_data_value(rng: random.Random, key_type: str, spec: ConfigSpec) -> Any:
+    if key_type == "String":
+        return f"value-{rng.randrange(spec.custom_data_values)}"
+    elif key_type == "Number":
+        return rng.randrange(spec.custom_data_values * 5)
+    return rng.random() < 0.5
+
+
+def _filter(rng: random.Random, spec: ConfigSpec) -> dict:
+    kind = rng.random()
+    if kind < 0.15:
+        return {
+            "type": "user",
+            "subType": "country",
+            "comparator": "=",
+            "values": rng.sample(COUNTRIES, 3),
+            "filters": [],
+        }
+    elif kind < 0.25:
+        return {
+            "type": "user",
+            "subType": "email",
+            "comparator": "contain",
+            "values": [f"@domain-{rng.randrange(5)}.com"],
+            "filters": [],
+        }
+
+    data_key, key_type = _custom_data_key(rng.randrange(spec.custom_data_keys))
+    custom_filter: Dict[str, Any] = {
+        "type": "user",
+        "subType": "customData",
+        "dataKey": data_key,
+        "dataKeyType": key_type,
+        "filters": [],
+    }
+    if key_type == "String":
+        values = {_custom_data_value(rng, key_type, spec) for _ in range(5)}
+        custom_filter.update(comparator="=", values=sorted(values))
+    elif key_type == "Number":
+        custom_filter.update(
+            comparator=rng.choice([">", "<"]),
+            values=[_custom_data_value(rng, key_type, spec)],
+        )
+    else:
+        custom_filter.update(comparator="=", values=[True])
+    return custom_filter
+
+
+def _audience_filters(rng: random.Random, spec: ConfigSpec) -> dict:
+    return {
+        "filters": [_filter(rng, spec) for _ in range(spec.filters_per_audience)],
+        "operator": rng.choice(["and", "or"]),
+    }
+
+
+def _rollout(index: int) -> dict:
+    rollout_type = ROLLOUT_TYPES[index % len(ROLLOUT_TYPES)]
+    if rollout_type == "schedule":
+        return {"type": "schedule", "startDate": _date(-1)}
+    elif rollout_type == "gradual":
+        return {
+            "type": "gradual",
+            "startDate": _date(-1),
+            "startPercentage": 0.25,
+            "stages": [{"type": "linear", "date": _date(1), "percentage": 1}],
+        }
+    return {
+        "type": "stepped",
+        "startDate": _date(-2),
+        "startPercentage": 0.25,
+        "stages": [
+            {"type": "discrete", "date": _date(-1), "percentage": 0.5},
+            {"type": "discrete", "date": _date(1), "percentage": 1},
+        ],
+    }
+
+
+def _distribution(rng: random.Random, variation_ids: List[str]) -> List[dict]:
+    weights = [rng.random() + 0.1 for _ in variation_ids]
+    total = sum(weights)
+    percentages = [round(weight / total, 4) for weight in weights]
+    # the percentages must add up to exactly 1
+    percentages[-1] = round(1 - sum(percentages[:-1]), 4)
+    return [
+        {"_variation": variation_id, "percentage": percentage}
+        for variation_id, percentage in zip(variation_ids, percentages)
+    ]
+
+
+def _variable_value(rng: random.Random, variable_type: str, variation: int) -> Any:
+    if variable_type == "Boolean":
+        return variation % 2 == 0
+    elif variable_type == "String":
+        return f"variation-{variation}-{rng.randrange(1000)}"
+    elif variable_type == "Number":
+        return rng.randrange(100000) / 100
+    return {"variation": variation, "enabled": variation % 2 == 0, "limit": variation}
+
+
+def generate_config(spec: ConfigSpec) -> dict:
+    """
+    Generates a server config with the shape given by spec. The same spec always generates the same config,
+    apart from rollout dates, which are relative to now.
+    """
+    rng = random.Random(spec.seed)
+    ids = _Ids()
+
+    audiences = {
+        ids.new(): {"filters": _audience_filters(rng, spec)}
+        for _ in range(spec.audiences)
+    }
+    audience_ids = list(audiences)
+
+    features = []
+    variables = []
+    target_index = 0
+    for feature_index in range(spec.features):
+        feature_variables = []
+        for variable_index in range(spec.variables_per_feature):
+            variable = {
+                "_id": ids.new(),
+                "key": f"var-{feature_index}-{variable_index}",
+                "type": VARIABLE_TYPES[variable_index % len(VARIABLE_TYPES)],
+            }
+            feature_variables.append(variable)
+        variables.extend(feature_variables)
+
+        variations: List[Dict[str, Any]] = []
+        for variation_index in range(spec.variations_per_feature):
+            variations.append(
+                {
+                    "_id": ids.new(),
+                    "key": f"variation-{variation_index}",
+                    "name": f"Variation {variation_index}",
+                    "variables": [
+                        {
+                            "_var": variable["_id"],
+                            "value": _variable_value(
+                                rng, variable["type"], variation_index
+                            ),
+                        }
+                        for variable in feature_variables
+                    ],
+                }
+            )
+        variation_ids = [variation["_id"] for variation in variations]
+
+        targets: List[Dict[str, Any]] = []
+        unconditional = feature_index < spec.unconditional_features
+        for _ in range(0 if unconditional else spec.targets_per_feature):
+            if audience_ids and rng.random() < 0.5:
+                # reference one or two of the shared audiences
+                audience_filters = {
+                    "filters": [
+                        {
+                            "type": "audienceMatch",
+                            "comparator": "=",
+                            "_audiences": rng.sample(
+                                audience_ids, min(2, len(audience_ids))
+                            ),
+                            "values": [],
+                            "filters": [],
+                        }
+                    ],
+                    "operator": "and",
+                }
+            else:
+                audience_filters = _audience_filters(rng, spec)
+            targets.append(
+                {
+                    "_id": ids.new(),
+                    "_audience": {"_id": ids.new(), "filters": audience_filters},
+                }
+            )
+        targets.append(
+            {
+                "_id": ids.new(),
+                "_audience": {
+                    "_id": ids.new(),
+                    "filters": {
+                        "filters": [{"type": "all", "values": [], "filters": []}],
+                        "operator": "and",
+                    },
+                },
+            }
+        )
+        for target in targets:
+            if unconditional:
+                served = variation_ids[feature_index % len(variation_ids)]
+                target["distribution"] = [{"_variation": served, "percentage": 1}]
+                continue
+            target["distribution"] = _distribution(rng, variation_ids)
+            if rng.random() < spec.rollout_fraction:
+                target["rollout"] = _rollout(target_index)
+            target_index += 1
+
+        features.append(
+            {
+                "_id": ids.new(),
+                "key": f"feature-{feature_index}",
+                "type": FEATURE_TYPES[feature_index % len(FEATURE_TYPES)],
+                "variations": variations,
+                "configuration": {
+                    "_id": ids.new(),
+                    "targets": targets,
+                    "forcedUsers": {},
+                },
+            }
+        )
+
+    return {
+        "project": {
+            "_id": ids.new(),
+            "key": "generated-project",
+            "a0_organization": "org_generated",
+            "settings": {
+                "edgeDB": {"enabled": False},
+                "optIn": {"enabled": False, "colors": {}},
+            },
+        },
+        "environment": {"_id": ids.new(), "key": "production"},
+        "features": features,
+        "variables": variables,
+        "audiences": audiences,
+    }
+
+
+def generate_users(count: int, spec: ConfigSpec) -> List[DevCycleUser]:
+    """
+    Generates users whose attributes are drawn from the same values as the audience filters of a config
+    generated from spec, so some fall into each audience
+    """
+    rng = random.Random(spec.seed + 1)
+    users = []
+    for index in range(count):
+        custom_data = {}
+        for key_index in range(spec.custom_data_keys):
+            # most users have most keys set
+            if rng.random() < 0.8:
+                data_key, key_type = _custom_data_key(key_index)
+                custom_data[data_key] = _custom_data_value(rng, key_type, spec)
+        users.append(
+            DevCycleUser(
+                user_id=f"user-{index}",
+                email=f"user-{index}@domain-{rng.randrange(5)}.com",
+                country=rng.choice(COUNTRIES),
+                appVersion=f"{rng.randrange(1, 4)}.{rng.randrange(10)}.0",
+                deviceModel=rng.choice(PLATFORMS),
+                customData=custom_data,
+            )
+        )
+    return users
+
+
+def variable_keys(config: dict) -> List[str]:
+    return [variable["key"] for variable in config["variables"]]
+
+
+def generate_traffic(
+    config: dict, users: List[DevCycleUser], seed: int = 0, skew: float = 1.2
+) -> Iterator[Tuple[DevCycleUser, str]]:
+    """
+    Yields an endless stream of (user, variable key) evaluations. Variable popularity follows a Zipf distribution
+    with exponent skew, so a few variables get most of the traffic, as they do in production.
+    """
+    rng = random.Random(seed)
+    keys = variable_keys(config)
+    weights = [1.0 / (rank + 1) ** skew for rank in range(len(keys))]
+    while True:
+        for key in rng.choices(keys, weights=weights, k=1000):
+            yield rng.choice(users), key
@@ -1,3 +1,4 @@
+import copy
 import os
 import json
 
@@ -55,3 +56,49 @@ def bucketed_config_minimal() -> str:
     )
     with open(config_filename, "r", encoding="utf-8") as f:
         return f.read()
+
+
+def scaled_config_json(feature_count: int) -> dict:
+    """
+    The small config with its feature repeated feature_count times. The first copy keeps the original keys, the
+    others have their variable keys suffixed with their index and new ids.
+    """
+    config = small_config_json()
+    template = config["features"][0]
+    variables = {variable["_id"]: variable for variable in config["variables"]}
+    next_id = [0]
+
+    def new_id() -> str:
+        next_id[0] += 1
+        return f"{next_id[0]:024x}"
+
+    for index in range(1, feature_count):
+        feature = copy.deepcopy(template)
+        feature["_id"] = new_id()
+        feature["key"] = f"{template['key']}-{index}"
+        feature["configuration"]["_id"] = new_id()
+        for target in feature["configuration"]["targets"]:
+            target["_id"] = new_id()
+
+        variable_ids = {}
+        for variable_id, variable in variables.items():
+            variable_ids[variable_id] = new_id()
+            config["variables"].append(
+                {
+                    **variable,
+                    "_id": variable_ids[variable_id],
+                    "key": f"{variable['key']}-{index}",
+                }
+            )
+
+        variation_ids = {}
+        for variation in feature["variations"]:
+            variation_ids[variation["_id"]] = variation["_id"] = new_id()
+            for variation_variable in variation["variables"]:
+                variation_variable["_var"] = variable_ids[variation_variable["_var"]]
+        for target in feature["configuration"]["targets"]:
+            for distribution in target["distribution"]:
+                distribution["_variation"] = variation_ids[distribution["_variation"]]
+
+        config["features"].append(feature)
+    return config
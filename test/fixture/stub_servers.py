@@ -0,0 +1,772 @@
+"""
+Local stand-ins for the DevCycle services: the config CDN, the SSE stream, the Events API and the Bucketing API.
+Each can add latency and fail a fraction of requests, and counts the requests it serves, so the SDK's API clients
+can be driven under load without the real services. To run all four for a local load test:
+
+    python -m test.fixture.stub_servers --latency-ms 20 --error-rate 0.01
+"""
+
+import argparse
+import email.utils
+import gzip
+import hashlib
+import json
+import logging
+import queue
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:
+    h2 = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# A route handler receives the request path and decoded body and returns a status code and JSON response body.
+# A route path ending in "/*" matches any final path segment.
+RouteHandler = Callable[[str, bytes], Tuple[int, Any]]
+
+# Only the headers of the first requests are kept, so long load tests don't grow without bound
+_MAX_RECORDED_HEADERS = 1000
+
+
+class StubResponse(NamedTuple):
+    status: int
+    body: bytes
+    headers: Dict[str, str]
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # Large enough that many clients connecting at once aren't reset
+    request_queue_size = 128
+
+
+class StubServer:
+    """
+    A local stand-in for one of the DevCycle services, served from a background thread on a localhost port,
+    chosen at random unless port is given. Subclasses register route handlers for the endpoints they implement.
+    Use as a context manager to start and stop the server.
+
+    Every request is delayed by latency_ms plus a random jitter of up to latency_jitter_ms, and error_rate of the
+    requests are answered with a 500 error instead of being routed. These can be changed while the server runs.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        latency_jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        port: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.routes: Dict[Tuple[str, str], RouteHandler] = {}
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.connection_count = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.injected_error_count = 0
+        self.status_counts: Counter = Counter()
+        self.request_headers: List[Dict[str, str]] = []
+        self._started_at = time.monotonic()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def setup(self):
+                # Called once per accepted connection, which may serve several keep-alive requests
+                with stub._lock:
+                    stub.connection_count += 1
+                super().setup()
+
+            def do_GET(self):  # noqa: N802
+                stub._handle(self, "GET")
+
+            def do_POST(self):  # noqa: N802
+                stub._handle(self, "POST")
+
+        self._server = _StubHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "StubServer":
+        self._started_at = time.monotonic()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the counters, and the requests served per second since the server started or the
+        counters were reset
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at
+            return {
+                "requests": self.request_count,
+                "connections": self.connection_count,
+                "bytes_received": self.bytes_received,
+                "bytes_sent": self.bytes_sent,
+                "injected_errors": self.injected_error_count,
+                "status_counts": dict(self.status_counts),
+                "requests_per_second": self.request_count / elapsed if elapsed else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        """
+        Resets the counters, for example after a load test has warmed up
+        """
+        with self._lock:
+            self.request_count = 0
+            self.connection_count = 0
+            self.bytes_received = 0
+            self.bytes_sent = 0
+            self.injected_error_count = 0
+            self.status_counts.clear()
+            self.request_headers.clear()
+            self._started_at = time.monotonic()
+
+    def _handle(self, request: BaseHTTPRequestHandler, method: str) -> None:
+        length = int(request.headers.get("Content-Length") or 0)
+        raw_body = request.rfile.read(length) if length else b""
+        response = self._dispatch(
+            method, request.path, dict(request.headers.items()), raw_body
+        )
+        _write_response(request, response)
+
+    def _dispatch(
+        self, method: str, raw_path: str, headers: Dict[str, str], raw_body: bytes
+    ) -> StubResponse:
+        """
+        Counts a request, applies the latency and error rate, and routes it
+        """
+        path = raw_path.split("?", 1)[0]
+        response = self._admit(headers, raw_body)
+        if response is None:
+            response = self._route(method, path, headers, raw_body)
+        self._record_response(response)
+        return response
+
+    def _admit(
+        self, headers: Dict[str, str], raw_body: bytes
+    ) -> Optional[StubResponse]:
+        """
+        Counts a request and waits out the latency. Returns an error response if the request should fail.
+        """
+        with self._lock:
+            self.request_count += 1
+            self.bytes_received += len(raw_body)
+            if len(self.request_headers) < _MAX_RECORDED_HEADERS:
+                self.request_headers.append(headers)
+            delay = self.latency_ms
+            if self.latency_jitter_ms:
+                delay += self._random.uniform(0, self.latency_jitter_ms)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.injected_error_count += 1
+
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if fail:
+            return _json_response(500, {"message": "Injected error"})
+        return None
+
+    def _record_response(self, response: StubResponse) -> None:
+        with self._lock:
+            self.status_counts[response.status] += 1
+            self.bytes_sent += len(response.body)
+
+    def _route(
+        self, method: str, path: str, headers: Dict[str, str], raw_body: bytes
+    ) -> StubResponse:
+        handler = self.routes.get((method, path)) or self.routes.get(
+            (method, path.rsplit("/", 1)[0] + "/*")
+        )
+        if handler is None:
+            return _json_response(404, {"message": "Not Found"})
+        body = _decode_body(raw_body, _header(headers, "Content-Encoding"))
+        status, response = handler(path, body)
+        return _json_response(status, response)
+
+
+class H2StubServer:
+    """
+    Serves the routes of a StubServer over cleartext HTTP/2 with prior knowledge (h2c), so HTTP/2 clients can be
+    tested against the same stand-in services. Requests are counted by the wrapped server and connections by this
+    one. Each connection is read on its own thread and its requests are answered concurrently from a worker pool.
+    Response bodies must fit in the default 64KB flow control window.
+    """
+
+    def __init__(self, stub: StubServer, workers: int = 16) -> None:
+        if h2 is None:
+            raise ImportError("H2StubServer requires the 'h2' package")
+        self.stub = stub
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._exit = threading.Event()
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(128)
+        self._listener.settimeout(0.05)
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._listener.getsockname()[1]}"
+
+    def start(self) -> "H2StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._exit.set()
+        self._thread.join()
+        self._listener.close()
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _accept(self) -> None:
+        while not self._exit.is_set():
+            try:
+                sock, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            with self._lock:
+                self.connection_count += 1
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock: socket.socket) -> None:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        # h2 connections aren't thread safe, so reads and responses take turns
+        send_lock = threading.Lock()
+        streams: Dict[int, Tuple[Dict[str, str], bytearray]] = {}
+        with send_lock:
+            conn.initiate_connection()
+            sock.sendall(conn.data_to_send())
+
+        try:
+            while not self._exit.is_set():
+                data = sock.recv(65536)
+                if not data:
+                    break
+                with send_lock:
+                    for event in conn.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            streams[event.stream_id] = (
+                                {
+                                    _header_str(name): _header_str(value)
+                                    for name, value in event.headers
+                                },
+                                bytearray(),
+                            )
+                        elif isinstance(event, h2.events.DataReceived):
+                            streams[event.stream_id][1].extend(event.data)
+                            conn.acknowledge_received_data(
+                                event.flow_controlled_length, event.stream_id
+                            )
+                        elif isinstance(event, h2.events.StreamEnded):
+                            headers, body = streams.pop(event.stream_id)
+                            self._executor.submit(
+                                self._respond,
+                                sock,
+                                conn,
+                                send_lock,
+                                event.stream_id,
+                                headers,
+                                bytes(body),
+                            )
+                    sock.sendall(conn.data_to_send())
+        except OSError:
+            pass
+        finally:
+            sock.close()
+
+    def _respond(
+        self,
+        sock: socket.socket,
+        conn: "h2.connection.H2Connection",
+        send_lock: threading.Lock,
+        stream_id: int,
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> None:
+        # Title case the header names, the way the HTTP/1.1 server reports them
+        request_headers = {
+            "-".join(part.capitalize() for part in name.split("-")): value
+            for name, value in headers.items()
+            if not name.startswith(":")
+        }
+        try:
+            response = self.stub._dispatch(
+                headers[":method"], headers[":path"], request_headers, body
+            )
+        except Exception as e:
+            # Answer rather than leaving the stream open, which would hang the client
+            response = _json_response(500, {"message": str(e)})
+
+        with send_lock:
+            try:
+                conn.send_headers(
+                    stream_id,
+                    [(":status", str(response.status))]
+                    + [
+                        (name.lower(), value)
+                        for name, value in response.headers.items()
+                    ]
+                    + [("content-length", str(len(response.body)))],
+                )
+                frame_size = conn.max_outbound_frame_size
+                for start in range(0, len(response.body), frame_size):
+                    conn.send_data(stream_id, response.body[start : start + frame_size])
+                conn.end_stream(stream_id)
+                sock.sendall(conn.data_to_send())
+            except Exception:
+                # The client reset the stream or closed the connection
+                pass
+
+
+class ConfigCDNStubServer(StubServer):
+    """
+    Stand-in for the DevCycle config CDN. Serves config at /config/v2/server/{key}.json, for any key unless
+    sdk_key is given, with an ETag and Last-Modified header. Requests with a matching If-None-Match header are
+    answered with 304 Not Modified.
+
+    If an SSEStubServer is given, configs without an "sse" section are served pointing at it, and
+    publish_config notifies its clients of each new config.
+    """
+
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        sdk_key: Optional[str] = None,
+        sse: Optional["SSEStubServer"] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.sdk_key = sdk_key
+        self.sse = sse
+        self.not_modified_count = 0
+        self.set_config(config if config is not None else {})
+
+    def set_config(self, config: dict) -> None:
+        """
+        Replaces the config served, with a new ETag and Last-Modified time
+        """
+        if self.sse is not None and "sse" not in config:
+            config = dict(config, sse={"hostname": self.sse.url, "path": self.sse.path})
+        body = json.dumps(config).encode("utf-8")
+        last_modified_ms = int(time.time() * 1000)
+        with self._lock:
+            self.config = config
+            self._config_body = body
+            self.etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            self.last_modified_ms = last_modified_ms
+            self.last_modified = email.utils.formatdate(
+                last_modified_ms / 1000.0, usegmt=True
+            )
+
+    def publish_config(self, config: dict) -> int:
+        """
+        Replaces the config served and sends a refetchConfig message to the SSE server's clients
+
+        :return: The number of SSE clients notified
+        """
+        self.set_config(config)
+        if self.sse is None:
+            return 0
+        return self.sse.publish_refetch_config(self.last_modified_ms, self.etag)
+
+    def _route(
+        self, method: str, path: str, headers: Dict[str, str], raw_body: bytes
+    ) -> StubResponse:
+        prefix = "/config/v2/server/"
+        if method != "GET" or not path.startswith(prefix) or not path.endswith(".json"):
+            return super()._route(method, path, headers, raw_body)
+
+        key = path[len(prefix) : -len(".json")]
+        if self.sdk_key is not None and key != self.sdk_key:
+            return _json_response(403, {"message": "Invalid SDK key"})
+
+        with self._lock:
+            body, etag, last_modified = (
+                self._config_body,
+                self.etag,
+                self.last_modified,
+            )
+            not_modified = _header(headers, "If-None-Match") == etag
+            if not_modified:
+                self.not_modified_count += 1
+
+        response_headers = {"ETag": etag, "Last-Modified": last_modified}
+        if not_modified:
+            return StubResponse(304, b"", response_headers)
+        response_headers["Content-Type"] = "application/json"
+        return StubResponse(200, body, response_headers)
+
+
+class SSEStubServer(StubServer):
+    """
+    Stand-in for the DevCycle realtime updates stream. Clients connect to path with a GET request and are kept
+    connected, receiving the messages published to them and a keep-alive comment every keepalive_interval
+    seconds. Messages are wrapped the way the real stream wraps them, with the DevCycle message JSON encoded in
+    the "data" field.
+    """
+
+    def __init__(
+        self,
+        path: str = "/event-stream",
+        keepalive_interval: float = 15.0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.path = path
+        self.keepalive_interval = keepalive_interval
+        self.messages_sent = 0
+        self._clients: List["queue.Queue[Optional[bytes]]"] = []
+        self._clients_changed = threading.Condition(self._lock)
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def wait_for_clients(self, count: int, timeout: float) -> bool:
+        """
+        Waits until at least count clients are connected, returning False if timeout seconds pass first
+        """
+        with self._clients_changed:
+            return self._clients_changed.wait_for(
+                lambda: len(self._clients) >= count, timeout
+            )
+
+    def publish(self, message: dict) -> int:
+        """
+        Sends a DevCycle message, like {"type": "refetchConfig", "lastModified": ...}, to every connected client
+
+        :return: The number of clients the message was sent to
+        """
+        event = json.dumps({"data": json.dumps(message)})
+        data = f"data: {event}\n\n".encode("utf-8")
+        with self._lock:
+            for client in self._clients:
+                client.put(data)
+            self.messages_sent += len(self._clients)
+            return len(self._clients)
+
+    def publish_refetch_config(
+        self, last_modified_ms: int, etag: Optional[str] = None
+    ) -> int:
+        message: Dict[str, Any] = {
+            "type": "refetchConfig",
+            "lastModified": last_modified_ms,
+        }
+        if etag is not None:
+            message["etag"] = etag
+        return self.publish(message)
+
+    def disconnect_clients(self) -> None:
+        """
+        Closes every client's stream, so reconnects can be tested
+        """
+        with self._lock:
+            for client in self._clients:
+                client.put(None)
+
+    def stop(self) -> None:
+        self.disconnect_clients()
+        super().stop()
+
+    def _handle(self, request: BaseHTTPRequestHandler, method: str) -> None:
+        if method != "GET" or request.path.split("?", 1)[0] != self.path:
+            super()._handle(request, method)
+            return
+
+        error = self._admit(dict(request.headers.items()), b"")
+        if error is not None:
+            self._record_response(error)
+            _write_response(request, error)
+            return
+
+        client: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        request.send_response(200)
+        request.send_header("Content-Type", "text/event-stream")
+        request.send_header("Cache-Control", "no-cache")
+        # Sent in chunks, as SSE clients read chunked streams a chunk at a time
+        request.send_header("Transfer-Encoding", "chunked")
+        request.end_headers()
+        request.close_connection = True
+        with self._clients_changed:
+            self._clients.append(client)
+            self.status_counts[200] += 1
+            self._clients_changed.notify_all()
+
+        try:
+            while True:
+                try:
+                    data = client.get(timeout=self.keepalive_interval)
+                except queue.Empty:
+                    data = b":\n\n"
+                if data is None:
+                    request.wfile.write(b"0\r\n\r\n")
+                    break
+                request.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                with self._lock:
+                    self.bytes_sent += len(data)
+        except OSError:
+            # The client disconnected
+            pass
+        finally:
+            with self._clients_changed:
+                self._clients.remove(client)
+                self._clients_changed.notify_all()
+
+
+class EventsStubServer(StubServer):
+    """
+    Stand-in for the DevCycle Events API. Accepts gzip and zstd encoded batches and keeps the decoded batches
+    it has received.
+    """
+
+    def __init__(self, status_code: int = 201, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.status_code = status_code
+        self.batches: List[dict] = []
+        self.routes[("POST", "/v1/events/batch")] = self._batch
+
+    def _batch(self, path: str, body: bytes) -> Tuple[int, Any]:
+        if self.status_code >= 400:
+            return self.status_code, {"message": "Error"}
+
+        payload = json.loads(body)
+        with self._lock:
+            self.batches.append(payload)
+        return self.status_code, {
+            "message": f"Successfully received {len(payload['batch'])} event batches."
+        }
+
+
+class BucketingStubServer(StubServer):
+    """
+    Stand-in for the DevCycle Bucketing API. Serves the given variables and features to every user, and keeps
+    the track requests it has received. The first fail_requests requests are answered with a 500 error.
+    """
+
+    def __init__(
+        self,
+        variables: Optional[Dict[str, dict]] = None,
+        features: Optional[Dict[str, dict]] = None,
+        fail_requests: int = 0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.variables = variables if variables is not None else {}
+        self.features = features if features is not None else {}
+        self.fail_requests = fail_requests
+        self.tracked: List[dict] = []
+        self.routes[("POST", "/v1/variables/*")] = self._variable
+        self.routes[("POST", "/v1/variables")] = self._all_variables
+        self.routes[("POST", "/v1/features")] = self._all_features
+        self.routes[("POST", "/v1/track")] = self._track
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            if self.fail_requests > 0:
+                self.fail_requests -= 1
+                return True
+            return False
+
+    def _variable(self, path: str, body: bytes) -> Tuple[int, Any]:
+        if self._should_fail():
+            return 500, {"message": "Error"}
+        key = path.rsplit("/", 1)[1]
+        if key not in self.variables:
+            return 404, {"message": "Variable not found"}
+        return 200, self.variables[key]
+
+    def _all_variables(self, path: str, body: bytes) -> Tuple[int, Any]:
+        if self._should_fail():
+            return 500, {"message": "Error"}
+        return 200, self.variables
+
+    def _all_features(self, path: str, body: bytes) -> Tuple[int, Any]:
+        if self._should_fail():
+            return 500, {"message": "Error"}
+        return 200, self.features
+
+    def _track(self, path: str, body: bytes) -> Tuple[int, Any]:
+        if self._should_fail():
+            return 500, {"message": "Error"}
+        payload = json.loads(body)
+        with self._lock:
+            self.tracked.append(payload)
+        return 201, {"message": "Successfully received 1 event batches."}
+
+
+def _json_response(status: int, body: Any) -> StubResponse:
+    return StubResponse(
+        status, json.dumps(body).encode("utf-8"), {"Content-Type": "application/json"}
+    )
+
+
+def _write_response(request: BaseHTTPRequestHandler, response: StubResponse) -> None:
+    request.send_response(response.status)
+    for name, value in response.headers.items():
+        request.send_header(name, value)
+    request.send_header("Content-Length", str(len(response.body)))
+    request.end_headers()
+    request.wfile.write(response.body)
+
+
+def _header(headers: Dict[str, str], name: str) -> Optional[str]:
+    # HTTP/1.1 header names keep the case they were sent with
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _header_str(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _decode_body(body: bytes, content_encoding: Optional[str]) -> bytes:
+    if content_encoding == "gzip":
+        return gzip.decompress(body)
+    elif content_encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompress(body)
+    return body
+
+
+def _served_variables(config: dict) -> Dict[str, dict]:
+    # Every user gets the first variation's value of each variable
+    values = {}
+    for feature in config["features"]:
+        for variable in feature["variations"][0]["variables"]:
+            values[variable["_var"]] = variable["value"]
+    return {
+        variable["key"]: {
+            "_id": variable["_id"],
+            "key": variable["key"],
+            "type": variable["type"],
+            "value": values.get(variable["_id"]),
+        }
+        for variable in config["variables"]
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from test.fixture.config_generator import ConfigSpec, generate_config
+
+    parser = argparse.ArgumentParser(
+        description="Runs local stand-ins for the DevCycle services until interrupted"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=0,
+        help="serve the config CDN, SSE, Events API and Bucketing API on this port and the next three",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--features", type=int, default=100, help="features in the generated config"
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=10.0,
+        help="seconds between printing the request counters",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    def port(offset: int) -> int:
+        return args.port + offset if args.port else 0
+
+    faults = {
+        "latency_ms": args.latency_ms,
+        "latency_jitter_ms": args.latency_jitter_ms,
+        "error_rate": args.error_rate,
+    }
+    config = generate_config(ConfigSpec(features=args.features))
+    sse = SSEStubServer(port=port(1), **faults)
+    servers: Dict[str, StubServer] = {
+        "config_cdn_uri": ConfigCDNStubServer(config, sse=sse, port=port(0), **faults),
+        "sse": sse,
+        "events_api_uri": EventsStubServer(port=port(2), **faults),
+        "bucketing_api_uri": BucketingStubServer(
+            variables=_served_variables(config), port=port(3), **faults
+        ),
+    }
+    for name, server in servers.items():
+        server.start()
+        logger.info(f"{name}: {server.url}")
+
+    try:
+        while True:
+            time.sleep(args.stats_interval)
+            for name, server in servers.items():
+                logger.info(f"{name}: {json.dumps(server.stats())}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers.values():
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import json
+import threading
+import time
+import unittest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import ld_eventsource.actions
+
+from devcycle_python_sdk import (
+    DevCycleCloudOptions,
+    DevCycleLocalClient,
+    DevCycleLocalOptions,
+)
+from devcycle_python_sdk.api.bucketing_client import BucketingAPIClient
+from devcycle_python_sdk.api.config_client import ConfigAPIClient
+from devcycle_python_sdk.api.event_client import EventAPIClient
+from devcycle_python_sdk.exceptions import APIClientError, APIClientUnauthorizedError
+from devcycle_python_sdk.managers.sse_manager import SSEManager
+from devcycle_python_sdk.models.event import (
+    EventType,
+    RequestEvent,
+    UserEventsBatchRecord,
+)
+from devcycle_python_sdk.models.user import DevCycleUser
+from test.fixture.data import small_config_json
+from test.fixture.stub_servers import (
+    BucketingStubServer,
+    ConfigCDNStubServer,
+    EventsStubServer,
+    SSEStubServer,
+)
+
+VARIABLES = {
+    "string-var": {
+        "_id": "variable_id",
+        "key": "string-var",
+        "type": "String",
+        "value": "variable value",
+    }
+}
+
+
+class ConfigCDNStubServerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sdk_key = "dvc_server_" + str(uuid.uuid4())
+        self.server = ConfigCDNStubServer({"version": 1}, sdk_key=self.sdk_key).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _client(self, sdk_key=None) -> ConfigAPIClient:
+        options = DevCycleLocalOptions(
+            config_cdn_uri=self.server.url, config_retry_delay_ms=0
+        )
+        return ConfigAPIClient(sdk_key or self.sdk_key, options)
+
+    def test_get_config_not_modified(self):
+        client = self._client()
+        config, etag, last_modified = client.get_config()
+        self.assertEqual(config, {"version": 1})
+        self.assertEqual(etag, self.server.etag)
+        self.assertEqual(last_modified, self.server.last_modified)
+
+        config, new_etag, _ = client.get_config(config_etag=etag)
+        self.assertIsNone(config)
+        self.assertEqual(new_etag, etag)
+        self.assertEqual(self.server.not_modified_count, 1)
+        self.assertEqual(self.server.status_counts, {200: 1, 304: 1})
+
+    def test_get_config_changed(self):
+        client = self._client()
+        _, etag, _ = client.get_config()
+        self.server.set_config({"version": 2})
+
+        config, new_etag, _ = client.get_config(config_etag=etag)
+        self.assertEqual(config, {"version": 2})
+        self.assertNotEqual(new_etag, etag)
+
+    def test_get_config_wrong_sdk_key(self):
+        with self.assertRaises(APIClientUnauthorizedError):
+            self._client("dvc_server_other").get_config()
+
+    def test_error_rate(self):
+        self.server.error_rate = 1.0
+        with self.assertRaises(APIClientError):
+            self._client().get_config()
+        self.assertEqual(self.server.injected_error_count, 2)
+        self.assertEqual(self.server.status_counts, {500: 2})
+
+    def test_latency(self):
+        self.server.latency_ms = 100
+        start = time.monotonic()
+        self._client().get_config()
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_stats(self):
+        client = self._client()
+        for _ in range(5):
+            client.get_config()
+
+        stats = self.server.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["status_counts"], {200: 5})
+        self.assertEqual(stats["bytes_sent"], 5 * len(json.dumps({"version": 1})))
+        self.assertGreater(stats["requests_per_second"], 0)
+
+        self.server.reset_stats()
+        self.assertEqual(self.server.stats()["requests"], 0)
+
+
+class SSEStubServerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = SSEStubServer().start()
+        self.messages: List[dict] = []
+        self.received = threading.Event()
+
+        def handle_message(event: ld_eventsource.actions.Event):
+            self.messages.append(json.loads(json.loads(event.data)["data"]))
+            self.received.set()
+
+        self.manager = SSEManager(
+            lambda state: None, lambda error: None, handle_message
+        )
+
+    def tearDown(self) -> None:
+        self.manager.client.close()
+        self.server.stop()
+        self.manager.read_thread.join(5)
+
+    def test_publish_refetch_config(self):
+        self.manager.update(
+            {"sse": {"hostname": self.server.url, "path": self.server.path}}
+        )
+        self.assertTrue(self.server.wait_for_clients(1, 5))
+
+        self.assertEqual(self.server.publish_refetch_config(1700000000000, '"1"'), 1)
+        self.assertTrue(self.received.wait(5))
+        self.assertEqual(
+            self.messages,
+            [{"type": "refetchConfig", "lastModified": 1700000000000, "etag": '"1"'}],
+        )
+        self.assertEqual(self.server.messages_sent, 1)
+
+
+class StubServerLoadTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.user = DevCycleUser(user_id="test-user")
+
+    def test_bucketing_api_under_load(self):
+        with BucketingStubServer(
+            variables=VARIABLES, latency_ms=5, error_rate=0.2, seed=1
+        ) as server:
+            client = BucketingAPIClient(
+                "dvc_server_" + str(uuid.uuid4()),
+                DevCycleCloudOptions(bucketing_api_uri=server.url, retry_delay=0),
+            )
+            try:
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    results = list(
+                        executor.map(
+                            lambda _: client.variable("string-var", self.user),
+                            range(100),
+                        )
+                    )
+            finally:
+                client.close()
+
+        # Injected errors are retried, so every request gets the variable
+        self.assertTrue(all(result.value == "variable value" for result in results))
+        stats = server.stats()
+        self.assertEqual(stats["status_counts"][200], 100)
+        self.assertEqual(stats["status_counts"][500], stats["injected_errors"])
+        self.assertGreater(stats["injected_errors"], 0)
+
+    def test_events_api_errors(self):
+        with EventsStubServer(error_rate=1.0) as server:
+            client = EventAPIClient(
+                "dvc_server_" + str(uuid.uuid4()),
+                DevCycleLocalOptions(events_api_uri=server.url, event_retry_delay_ms=0),
+            )
+            batch = [
+                UserEventsBatchRecord(
+                    user=self.user,
+                    events=[
+                        RequestEvent(
+                            type=EventType.CustomEvent,
+                            user_id=self.user.user_id,
+                            date="2023-01-01T00:00:00.000Z",
+                            clientDate="2023-01-01T00:00:00.000Z",
+                        )
+                    ],
+                )
+            ]
+            with self.assertRaises(APIClientError):
+                client.publish_events(batch)
+        self.assertEqual(server.batches, [])
+        self.assertGreater(server.injected_error_count, 0)
+
+
+class RealtimeUpdatesTest(unittest.TestCase):
+    def test_local_client_refetches_published_config(self):
+        sdk_key = "dvc_server_" + str(uuid.uuid4())
+        config = small_config_json()
+        with SSEStubServer() as sse, EventsStubServer() as events_api:
+            cdn = ConfigCDNStubServer(config, sdk_key=sdk_key, sse=sse).start()
+            client = DevCycleLocalClient(
+                sdk_key,
+                DevCycleLocalOptions(
+                    config_cdn_uri=cdn.url,
+                    events_api_uri=events_api.url,
+                    config_polling_interval_ms=60 * 60 * 1000,
+                    event_flush_interval_ms=60 * 60 * 1000,
+                ),
+            )
+            try:
+                self.assertTrue(client.config_manager.wait_for_initialization(10))
+                self.assertTrue(sse.wait_for_clients(1, 10))
+
+                updated = small_config_json()
+                updated["project"]["key"] = "updated-project"
+                # The Last-Modified header has a resolution of one second
+                time.sleep(1)
+                self.assertEqual(cdn.publish_config(updated), 1)
+
+                deadline = time.monotonic() + 10
+                while time.monotonic() < deadline:
+                    metadata = client.config_manager.get_config_metadata()
+                    if metadata and metadata.project.key == "updated-project":
+                        break
+                    time.sleep(0.05)
+                self.assertIsNotNone(metadata)
+                self.assertEqual(metadata.project.key, "updated-project")
+            finally:
+                client.close()
+                cdn.stop()
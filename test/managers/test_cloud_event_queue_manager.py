@@ -0,0 +1,228 @@
+import logging
+import threading
+import time
+import unittest
+import uuid
+
+from devcycle_python_sdk import DevCycleCloudClient, DevCycleCloudOptions
+from devcycle_python_sdk.api.bucketing_client import BucketingAPIClient
+from devcycle_python_sdk.managers.cloud_event_queue_manager import (
+    CloudEventQueueManager,
+)
+from devcycle_python_sdk.metrics import MetricsRegistry
+from devcycle_python_sdk.models.event import DevCycleEvent
+from devcycle_python_sdk.models.user import DevCycleUser
+from test.fixture.stub_servers import BucketingStubServer
+
+logger = logging.getLogger(__name__)
+
+
+class CloudEventQueueManagerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = BucketingStubServer()
+        self.server.start()
+        self.options = DevCycleCloudOptions(
+            bucketing_api_uri=self.server.url,
+            retry_delay=0,
+            enable_background_tracking=True,
+            event_flush_interval_ms=60000,
+            event_request_chunk_size=10,
+            max_event_queue_size=20,
+        )
+        self.bucketing_api = BucketingAPIClient(
+            "dvc_server_" + str(uuid.uuid4()), self.options
+        )
+        self.manager = None
+
+    def tearDown(self) -> None:
+        if self.manager is not None:
+            self.manager.close()
+        self.server.stop()
+
+    def _event(self, index: int = 0) -> DevCycleEvent:
+        return DevCycleEvent(type="customEvent", target=f"target-{index}", value=index)
+
+    def _tracked_events(self) -> int:
+        return sum(len(request["events"]) for request in self.server.tracked)
+
+    def test_events_grouped_by_user(self):
+        self.manager = CloudEventQueueManager(self.options, self.bucketing_api)
+        for i in range(3):
+            self.manager.queue_event(DevCycleUser(user_id="a"), self._event(i))
+        for i in range(2):
+            self.manager.queue_event(DevCycleUser(user_id="b"), self._event(i))
+        self.assertEqual(self.manager.queue_size(), 5)
+        self.assertEqual(self.server.request_count, 0)
+
+        self.manager.close()
+        self.assertEqual(len(self.server.tracked), 2)
+        events_by_user = {
+            request["user"]["user_id"]: [event["target"] for event in request["events"]]
+            for request in self.server.tracked
+        }
+        self.assertEqual(
+            events_by_user,
+            {"a": ["target-0", "target-1", "target-2"], "b": ["target-0", "target-1"]},
+        )
+
+    def test_flush_when_batch_is_full(self):
+        self.manager = CloudEventQueueManager(self.options, self.bucketing_api)
+        for i in range(10):
+            self.manager.queue_event(DevCycleUser(user_id="a"), self._event(i))
+
+        deadline = time.monotonic() + 2
+        while self._tracked_events() < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self._tracked_events(), 10)
+
+    def test_flush_interval(self):
+        self.options.event_flush_interval_ms = 50
+        self.manager = CloudEventQueueManager(self.options, self.bucketing_api)
+        self.manager.queue_event(DevCycleUser(user_id="a"), self._event())
+
+        deadline = time.monotonic() + 2
+        while self._tracked_events() < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self._tracked_events(), 1)
+
+    def test_queue_full(self):
+        # block the first flush in the server so the queue can fill up behind it
+        release = threading.Event()
+        track_route = self.server.routes[("POST", "/v1/track")]
+
+        def gated_track(path, body):
+            release.wait(2)
+            return track_route(path, body)
+
+        self.server.routes[("POST", "/v1/track")] = gated_track
+        self.manager = CloudEventQueueManager(self.options, self.bucketing_api)
+
+        user = DevCycleUser(user_id="a")
+        for i in range(10):
+            self.manager.queue_event(user, self._event(i))
+        deadline = time.monotonic() + 2
+        while self.server.request_count < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        for i in range(25):
+            self.manager.queue_event(user, self._event(i))
+        self.assertEqual(self.manager.metrics()["dropped_events"], 5)
+
+        release.set()
+        self.manager.close()
+        self.assertEqual(self._tracked_events(), 30)
+        for request in self.server.tracked:
+            self.assertLessEqual(len(request["events"]), 10)
+
+    def test_failed_batch_requeued(self):
+        self.options.request_retries = 0
+        registry = MetricsRegistry()
+        self.manager = CloudEventQueueManager(
+            self.options, self.bucketing_api, registry
+        )
+        for i in range(3):
+            self.manager.queue_event(DevCycleUser(user_id="a"), self._event(i))
+        self.manager.queue_event(DevCycleUser(user_id="b"), self._event())
+
+        self.server.fail_requests = 1
+        self.assertEqual(self.manager._flush_events(), 0)
+        # the first request failed, so neither user's events were sent
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(self.manager.queue_size(), 4)
+        self.assertEqual(registry.snapshot()["devcycle_cloud_events_requeued"], 4)
+
+        self.manager.queue_event(DevCycleUser(user_id="a"), self._event(3))
+        self.assertEqual(self.manager._flush_events(), 5)
+        events_by_user = {
+            request["user"]["user_id"]: [event["target"] for event in request["events"]]
+            for request in self.server.tracked
+        }
+        self.assertEqual(
+            events_by_user,
+            {
+                "a": ["target-0", "target-1", "target-2", "target-3"],
+                "b": ["target-0"],
+            },
+        )
+        self.assertEqual(registry.snapshot()["devcycle_cloud_events_dropped"], 0)
+
+    def test_failed_batch_dropped_when_queue_full(self):
+        self.options.request_retries = 0
+        registry = MetricsRegistry()
+        self.manager = CloudEventQueueManager(
+            self.options, self.bucketing_api, registry
+        )
+        user = DevCycleUser(user_id="a")
+        for i in range(5):
+            self.manager.queue_event(user, self._event(i))
+
+        # fill the queue while the failing request is in flight
+        track_route = self.server.routes[("POST", "/v1/track")]
+
+        def fill_queue_then_fail(path, body):
+            for i in range(18):
+                self.manager.queue_event(user, self._event(100 + i))
+            return 500, {"message": "Error"}
+
+        self.server.routes[("POST", "/v1/track")] = fill_queue_then_fail
+        self.manager._flush_events()
+        self.server.routes[("POST", "/v1/track")] = track_route
+
+        # the oldest failed events go back to the front of the queue, the rest are dropped
+        self.assertEqual(self.manager.queue_size(), 20)
+        self.assertEqual(registry.snapshot()["devcycle_cloud_events_requeued"], 2)
+        self.assertEqual(registry.snapshot()["devcycle_cloud_events_dropped"], 3)
+        self.assertEqual(self.manager.metrics()["dropped_events"], 3)
+
+        self.manager.close()
+        targets = [
+            event["target"]
+            for request in self.server.tracked
+            for event in request["events"]
+        ]
+        self.assertEqual(targets[:3], ["target-0", "target-1", "target-100"])
+
+    def test_rejected_batch_dropped(self):
+        registry = MetricsRegistry()
+        self.manager = CloudEventQueueManager(
+            self.options, self.bucketing_api, registry
+        )
+        self.manager.queue_event(DevCycleUser(user_id="a"), self._event())
+
+        self.server.routes[("POST", "/v1/track")] = lambda path, body: (
+            400,
+            {"message": "Invalid event"},
+        )
+        self.manager._flush_events()
+        # a rejected batch is not retried
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(self.manager.queue_size(), 0)
+        self.assertEqual(registry.snapshot()["devcycle_cloud_events_requeued"], 0)
+        self.assertEqual(registry.snapshot()["devcycle_cloud_events_dropped"], 1)
+
+    def test_close_drops_failed_batch(self):
+        self.options.request_retries = 0
+        registry = MetricsRegistry()
+        self.manager = CloudEventQueueManager(
+            self.options, self.bucketing_api, registry
+        )
+        self.manager.queue_event(DevCycleUser(user_id="a"), self._event())
+        # the background thread's last flush and the flush when closing both fail
+        self.server.fail_requests = 2
+        self.manager.close()
+        self.manager = None
+        self.assertEqual(registry.snapshot()["devcycle_cloud_events_dropped"], 1)
+        self.assertEqual(self.server.tracked, [])
+
+    def test_cloud_client_background_tracking(self):
+        client = DevCycleCloudClient("dvc_server_" + str(uuid.uuid4()), self.options)
+        client.track(DevCycleUser(user_id="a"), self._event())
+        self.assertEqual(self.server.request_count, 0)
+
+        client.close()
+        self.assertEqual(self._tracked_events(), 1)
+        self.assertEqual(self.server.tracked[0]["events"][0]["type"], "customEvent")
+
+
+if __name__ == "__main__":
+    unittest.main()
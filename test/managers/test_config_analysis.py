@@ -0,0 +1,340 @@
+import copy
+import json
+import logging
+import unittest
+import uuid
+
+from devcycle_python_sdk.api.local_bucketing import LocalBucketing
+from devcycle_python_sdk.managers.config_analysis import (
+    VariableInputs,
+    unconditional_variables,
+    variable_inputs,
+    variable_keys,
+)
+from devcycle_python_sdk.models.platform_data import default_platform_data
+from devcycle_python_sdk.models.user import DevCycleUser
+from test.fixture.config_generator import ConfigSpec, generate_config, generate_users
+from test.fixture.data import small_config_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VALUES = {"Boolean": False, "String": "default", "Number": 0, "JSON": {}}
+
+
+def _all_users_config() -> dict:
+    # The small config without its email target, so every user gets the all users target
+    config = small_config_json()
+    config["features"][0]["configuration"]["targets"].pop(0)
+    return config
+
+
+class ConfigAnalysisTest(unittest.TestCase):
+    def assert_matches_wasm(self, config: dict, users) -> None:
+        local_bucketing = LocalBucketing("dvc_server_testkey")
+        local_bucketing.store_config(json.dumps(config))
+        local_bucketing.set_platform_data(json.dumps(default_platform_data().to_json()))
+        local_bucketing.init_event_queue(str(uuid.uuid4()), "{}")
+
+        variables = unconditional_variables(config)
+        self.assertTrue(variables)
+        for user in users:
+            for key, unconditional in variables.items():
+                default_value = DEFAULT_VALUES[unconditional.type]
+                expected, feature_id = local_bucketing.get_variable_for_user_protobuf(
+                    user, key, default_value
+                )
+                self.assertEqual(unconditional.variable(default_value), expected)
+                self.assertEqual(unconditional.feature_id, feature_id)
+
+    def test_variable_keys(self):
+        self.assertEqual(
+            variable_keys(small_config_json()),
+            {"a-cool-new-feature", "string-var", "json-var", "num-var", "float-var"},
+        )
+        self.assertEqual(variable_keys({}), frozenset())
+
+    def test_targeted_variables(self):
+        # the first target depends on the user's email
+        self.assertEqual(unconditional_variables(small_config_json()), {})
+
+    def test_all_users_variables(self):
+        config = _all_users_config()
+        self.assertEqual(
+            set(unconditional_variables(config)), variable_keys(small_config_json())
+        )
+        users = [
+            DevCycleUser(user_id="1234"),
+            DevCycleUser(user_id="5678", email="giveMeVariationOff@email.com"),
+            DevCycleUser(user_id="9012", customData={"plan": "pro"}, country="CA"),
+        ]
+        self.assert_matches_wasm(config, users)
+
+    def test_generated_config(self):
+        spec = ConfigSpec(features=20, unconditional_features=5)
+        config = generate_config(spec)
+        variables = unconditional_variables(config)
+        self.assertEqual(len(variables), 5 * spec.variables_per_feature)
+        self.assertTrue(all(key.startswith("var-") for key in variables))
+        self.assert_matches_wasm(config, generate_users(20, spec))
+
+    def test_conditional_features(self):
+        def variables_after(change) -> set:
+            config = _all_users_config()
+            change(config["features"][0])
+            return set(unconditional_variables(config))
+
+        def forced_users(feature):
+            feature["configuration"]["forcedUsers"] = {"1234": "variation"}
+
+        def rollout(feature):
+            feature["configuration"]["targets"][0]["rollout"] = {
+                "type": "schedule",
+                "startDate": "2020-01-01T00:00:00.000Z",
+            }
+
+        def split_distribution(feature):
+            feature["configuration"]["targets"][0]["distribution"] = [
+                {"_variation": variation["_id"], "percentage": 0.5}
+                for variation in feature["variations"]
+            ]
+
+        def unknown_field(feature):
+            feature["settings"] = {"optInEnabled": True}
+
+        def user_filter(feature):
+            feature["configuration"]["targets"][0]["_audience"]["filters"][
+                "filters"
+            ].append({"type": "user", "subType": "country", "values": ["CA"]})
+
+        for change in [
+            forced_users,
+            rollout,
+            split_distribution,
+            unknown_field,
+            user_filter,
+        ]:
+            self.assertEqual(variables_after(change), set(), msg=change.__name__)
+
+    def test_variable_in_several_features(self):
+        config = _all_users_config()
+        feature = copy.deepcopy(config["features"][0])
+        feature["_id"] = "62fbf6566f1ba302829f9e99"
+        feature["variations"][0]["variables"] = feature["variations"][0]["variables"][
+            :1
+        ]
+        feature["variations"][1]["variables"] = feature["variations"][1]["variables"][
+            :1
+        ]
+        config["features"].append(feature)
+        self.assertNotIn("a-cool-new-feature", unconditional_variables(config))
+        self.assertIn("string-var", unconditional_variables(config))
+
+    def test_malformed_config(self):
+        self.assertEqual(unconditional_variables({"features": [{"key": "x"}]}), {})
+        self.assertEqual(unconditional_variables({"variables": "x"}), {})
+        self.assertEqual(variable_inputs({"features": [{"key": "x"}]}), {})
+        self.assertEqual(variable_inputs({"variables": "x"}), {})
+
+
+class VariableInputsTest(unittest.TestCase):
+    def test_small_config(self):
+        inputs = variable_inputs(small_config_json())
+        self.assertEqual(set(inputs), variable_keys(small_config_json()))
+        num_var = inputs["num-var"]
+        # every target serves a single variation, so bucketing doesn't depend on the user_id
+        self.assertEqual(num_var.user_attributes, ("email",))
+        self.assertEqual(num_var.custom_data_keys, ())
+        self.assertEqual(
+            num_var.target_values,
+            {
+                "63125321d31c601f992288bb": {"62fbf6566f1ba302829f9e38": 67890},
+                "63125321d31c601f992288bc": {"62fbf6566f1ba302829f9e39": 12345},
+            },
+        )
+
+    def test_user_key(self):
+        inputs = VariableInputs(
+            user_attributes=("country", "email"),
+            custom_data_keys=("plan",),
+            target_values={},
+        )
+        user = DevCycleUser(
+            user_id="1234",
+            email="a@b.com",
+            country="CA",
+            appVersion="1.0.0",
+            customData={"plan": "pro", "other": 1},
+        )
+        other_user = DevCycleUser(
+            user_id="5678",
+            email="a@b.com",
+            country="CA",
+            customData={"plan": "pro"},
+        )
+        self.assertEqual(inputs.user_key(user), inputs.user_key(other_user))
+
+        for changed in [
+            DevCycleUser(user_id="1234", email="a@b.com", customData={"plan": "pro"}),
+            DevCycleUser(user_id="1234", email="a@b.com", country="CA"),
+            DevCycleUser(
+                user_id="1234",
+                email="a@b.com",
+                country="CA",
+                privateCustomData={"plan": "pro"},
+            ),
+            DevCycleUser(
+                user_id="1234",
+                email="a@b.com",
+                country="CA",
+                customData={"plan": None},
+            ),
+        ]:
+            self.assertNotEqual(inputs.user_key(user), inputs.user_key(changed))
+
+        # equal values of different types don't match the same filters
+        self.assertNotEqual(
+            inputs.user_key(DevCycleUser(user_id="1", customData={"plan": 1})),
+            inputs.user_key(DevCycleUser(user_id="1", customData={"plan": True})),
+        )
+
+    def test_variation_id(self):
+        inputs = VariableInputs(
+            user_attributes=(),
+            custom_data_keys=(),
+            target_values={"target": {"on": 1, "off": 0}, "same": {"a": 1, "b": 1}},
+        )
+        self.assertEqual(inputs.variation_id("target", 1), "on")
+        self.assertEqual(inputs.variation_id("target", 0), "off")
+        self.assertIsNone(inputs.variation_id("target", 2))
+        self.assertIsNone(inputs.variation_id("same", 1))
+        self.assertIsNone(inputs.variation_id("unknown", 1))
+        self.assertIsNone(inputs.variation_id(None, 1))
+
+    def test_filter_inputs(self):
+        config = small_config_json()
+        feature = config["features"][0]
+        targets = feature["configuration"]["targets"]
+        targets[0]["_audience"]["filters"]["filters"].append(
+            {
+                "type": "audienceMatch",
+                "comparator": "=",
+                "_audiences": ["audience-1"],
+            }
+        )
+        config["audiences"] = {
+            "audience-1": {
+                "_id": "audience-1",
+                "filters": {
+                    "operator": "and",
+                    "filters": [
+                        {
+                            "type": "user",
+                            "subType": "customData",
+                            "dataKey": "plan",
+                            "dataKeyType": "String",
+                            "comparator": "=",
+                            "values": ["pro"],
+                        },
+                        {
+                            "type": "audienceMatch",
+                            "comparator": "=",
+                            "_audiences": ["audience-1"],
+                        },
+                    ],
+                },
+            }
+        }
+        targets[1]["distribution"] = [
+            {"_variation": variation["_id"], "percentage": 0.5}
+            for variation in feature["variations"]
+        ]
+
+        inputs = variable_inputs(config)["string-var"]
+        self.assertEqual(inputs.user_attributes, ("email", "user_id"))
+        self.assertEqual(inputs.custom_data_keys, ("plan",))
+        self.assertEqual(
+            inputs.target_values["63125321d31c601f992288bc"],
+            {
+                "62fbf6566f1ba302829f9e39": "variationOn",
+                "62fbf6566f1ba302829f9e38": "variationOff",
+            },
+        )
+
+    def test_uncacheable_variables(self):
+        def inputs_after(change) -> set:
+            config = small_config_json()
+            change(config["features"][0])
+            return set(variable_inputs(config))
+
+        def rollout(feature):
+            feature["configuration"]["targets"][1]["rollout"] = {
+                "type": "schedule",
+                "startDate": "2020-01-01T00:00:00.000Z",
+            }
+
+        def unknown_filter(feature):
+            feature["configuration"]["targets"][1]["_audience"]["filters"][
+                "filters"
+            ].append({"type": "optIn", "values": []})
+
+        def unknown_audience(feature):
+            feature["configuration"]["targets"][1]["_audience"]["filters"][
+                "filters"
+            ].append({"type": "audienceMatch", "_audiences": ["missing"]})
+
+        for change in [rollout, unknown_filter, unknown_audience]:
+            self.assertEqual(inputs_after(change), set(), msg=change.__name__)
+
+    def test_generated_config_matches_wasm(self):
+        # Users that only differ in attributes that aren't inputs of a variable get the same evaluation
+        spec = ConfigSpec(features=20)
+        config = generate_config(spec)
+        inputs = variable_inputs(config)
+        self.assertTrue(inputs)
+        self.assertLess(len(inputs), len(config["variables"]))
+
+        local_bucketing = LocalBucketing("dvc_server_testkey")
+        local_bucketing.store_config(json.dumps(config))
+        local_bucketing.set_platform_data(json.dumps(default_platform_data().to_json()))
+        local_bucketing.init_event_queue(str(uuid.uuid4()), "{}")
+        types = {variable["key"]: variable["type"] for variable in config["variables"]}
+
+        for index, user in enumerate(generate_users(30, spec)):
+            for key, variable_inputs_ in inputs.items():
+                other_user = DevCycleUser(
+                    user_id=f"other-{index}",
+                    email=f"other-{index}@example.com",
+                    country="ZZ",
+                    appVersion="9.9.9",
+                    deviceModel="other",
+                    customData={"unused-key": index},
+                )
+                for name in variable_inputs_.user_attributes:
+                    setattr(other_user, name, getattr(user, name))
+                for data_key in variable_inputs_.custom_data_keys:
+                    if user.customData and data_key in user.customData:
+                        other_user.customData[data_key] = user.customData[data_key]
+                self.assertEqual(
+                    variable_inputs_.user_key(user),
+                    variable_inputs_.user_key(other_user),
+                )
+
+                default_value = DEFAULT_VALUES[types[key]]
+                expected = local_bucketing.get_variable_for_user_protobuf(
+                    user, key, default_value
+                )
+                actual = local_bucketing.get_variable_for_user_protobuf(
+                    other_user, key, default_value
+                )
+                self.assertEqual(expected, actual, msg=key)
+                if expected[0] is not None:
+                    self.assertIsNotNone(
+                        variable_inputs_.variation_id(
+                            expected[0].eval.target_id, expected[0].value
+                        ),
+                        msg=key,
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -153,6 +153,50 @@ class EnvironmentConfigManagerTest(unittest.TestCase):
         self.assertDictEqual(config_manager._config, self.test_config_json)
         self.test_local_bucketing.store_config.assert_not_called()
 
+    @patch("devcycle_python_sdk.api.config_client.ConfigAPIClient.get_config")
+    def test_has_variable(self, mock_get_config):
+        mock_get_config.return_value = (
+            self.test_config_json,
+            self.test_etag,
+            self.test_lastmodified,
+        )
+        self.test_options.config_polling_interval_ms = 200
+        config_manager = EnvironmentConfigManager(
+            self.sdk_key, self.test_options, self.test_local_bucketing
+        )
+        time.sleep(0.1)
+        config_manager.close()
+
+        self.assertTrue(config_manager.has_variable("string-var"))
+        self.assertFalse(config_manager.has_variable("unknown-var"))
+
+        # the index follows config updates
+        new_config = json.loads(self.test_config_string)
+        new_config["variables"].append(
+            {"_id": "64b7f5d6a1b2c3d4e5f60718", "key": "new-var", "type": "String"}
+        )
+        new_config["variables"] = [
+            variable
+            for variable in new_config["variables"]
+            if variable["key"] != "string-var"
+        ]
+        mock_get_config.return_value = (new_config, str(uuid.uuid4()), None)
+        config_manager._get_config()
+        self.assertTrue(config_manager.has_variable("new-var"))
+        self.assertFalse(config_manager.has_variable("string-var"))
+
+    def test_has_variable_before_config(self):
+        with patch(
+            "devcycle_python_sdk.api.config_client.ConfigAPIClient.get_config",
+            return_value=(None, None, None),
+        ):
+            config_manager = EnvironmentConfigManager(
+                self.sdk_key, self.test_options, self.test_local_bucketing
+            )
+            config_manager.close()
+        # without a config, every variable is evaluated
+        self.assertTrue(config_manager.has_variable("unknown-var"))
+
 
 class SSEReconnectionBackoffTest(unittest.TestCase):
     """Tests for SSE exponential backoff reconnection behavior"""
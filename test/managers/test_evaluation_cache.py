@@ -0,0 +1,146 @@
+import logging
+import unittest
+
+from devcycle_python_sdk.managers.config_analysis import VariableInputs
+from devcycle_python_sdk.managers.evaluation_cache import EvaluationCache
+from devcycle_python_sdk.metrics import MetricsRegistry
+from devcycle_python_sdk.models.eval_reason import EvalReason, EvalReasons
+from devcycle_python_sdk.models.user import DevCycleUser
+from devcycle_python_sdk.models.variable import Variable
+
+logger = logging.getLogger(__name__)
+
+
+def _variable(value, target_id="target") -> Variable:
+    return Variable(
+        _id=None,
+        key="json-var",
+        type="JSON",
+        value=value,
+        isDefaulted=False,
+        defaultValue={},
+        eval=EvalReason(
+            reason=EvalReasons.TARGETING_MATCH, details="Email", target_id=target_id
+        ),
+    )
+
+
+class EvaluationCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.inputs = {
+            "json-var": VariableInputs(
+                user_attributes=("email",),
+                custom_data_keys=("plan",),
+                target_values={
+                    "target": {"on": {"on": True}, "off": {"on": False}},
+                    "same": {"a": {}, "b": {}},
+                },
+            )
+        }
+        self.cache = EvaluationCache(self.inputs, 2)
+
+    def test_key(self):
+        user = DevCycleUser(user_id="1", email="a@b.com", country="CA")
+        other_user = DevCycleUser(user_id="2", email="a@b.com", country="US")
+        self.assertIsNotNone(self.cache.key(user, "json-var", "JSON"))
+        self.assertEqual(
+            self.cache.key(user, "json-var", "JSON"),
+            self.cache.key(other_user, "json-var", "JSON"),
+        )
+        self.assertNotEqual(
+            self.cache.key(user, "json-var", "JSON"),
+            self.cache.key(user, "json-var", "String"),
+        )
+        self.assertIsNone(self.cache.key(user, "other-var", "JSON"))
+
+        # custom data values that can't be hashed aren't cached
+        unhashable_user = DevCycleUser(user_id="1", customData={"plan": ["pro"]})
+        self.assertIsNone(self.cache.key(unhashable_user, "json-var", "JSON"))
+
+    def test_get_and_put(self):
+        user = DevCycleUser(user_id="1", email="a@b.com")
+        cache_key = self.cache.key(user, "json-var", "JSON")
+        self.assertIsNone(self.cache.get(cache_key))
+
+        self.cache.put(cache_key, _variable({"on": True}), "feature")
+        entry = self.cache.get(cache_key)
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.feature_id, "feature")
+        self.assertEqual(entry.variation_id, "on")
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+        # each evaluation gets its own copy, with its own default value
+        variable = entry.variable_for({"default": True})
+        self.assertEqual(variable.value, {"on": True})
+        self.assertEqual(variable.defaultValue, {"default": True})
+        variable.value["on"] = False
+        variable.eval.details = "changed"
+        self.assertEqual(entry.variable_for({}).value, {"on": True})
+        self.assertEqual(entry.variable_for({}).eval.details, "Email")
+
+    def test_put_eval_reason(self):
+        cache_key = self.cache.key(DevCycleUser(user_id="1"), "json-var", "JSON")
+        self.cache.put(cache_key, _variable({"on": True}), "feature")
+        self.assertEqual(
+            self.cache.get(cache_key).eval_reason, EvalReasons.TARGETING_MATCH
+        )
+
+        # evaluation events for cache hits are counted under the evaluation's reason
+        split = _variable({"on": True})
+        split.eval.reason = EvalReasons.SPLIT
+        self.cache.put(cache_key, split, "feature")
+        self.assertEqual(self.cache.get(cache_key).eval_reason, EvalReasons.SPLIT)
+
+    def test_put_not_served(self):
+        cache_key = self.cache.key(DevCycleUser(user_id="1"), "json-var", "JSON")
+        self.cache.put(cache_key, None, None)
+        entry = self.cache.get(cache_key)
+        self.assertIsNotNone(entry)
+        self.assertIsNone(entry.variable_for({}))
+
+    def test_put_unknown_variation(self):
+        # results whose variation can't be determined aren't cached, as their events can't be queued
+        cache_key = self.cache.key(DevCycleUser(user_id="1"), "json-var", "JSON")
+        self.cache.put(cache_key, _variable({}, target_id="same"), "feature")
+        self.cache.put(cache_key, _variable({"on": None}), "feature")
+        self.assertEqual(len(self.cache), 0)
+
+    def test_eviction(self):
+        keys = [
+            self.cache.key(DevCycleUser(user_id="1", email=email), "json-var", "JSON")
+            for email in ["a@b.com", "c@d.com", "e@f.com"]
+        ]
+        self.cache.put(keys[0], None, None)
+        self.cache.put(keys[1], None, None)
+        # the first entry is now the most recently used
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.cache.put(keys[2], None, None)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def test_metrics(self):
+        registry = MetricsRegistry()
+        hits = registry.counter("hits", "")
+        misses = registry.counter("misses", "")
+        cache = EvaluationCache(self.inputs, 10, hits, misses)
+        cache_key = cache.key(DevCycleUser(user_id="1"), "json-var", "JSON")
+        cache.get(cache_key)
+        cache.put(cache_key, None, None)
+        cache.get(cache_key)
+        cache.get(cache_key)
+        self.assertEqual(hits.value, 2)
+        self.assertEqual(misses.value, 1)
+
+        # an empty copy shares the counters
+        empty = cache.empty_copy()
+        self.assertEqual(len(empty), 0)
+        empty.get(cache_key)
+        self.assertEqual(misses.value, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,7 @@
+import json
 import logging
+import os
+import tempfile
 import time
 import uuid
 import unittest
@@ -11,14 +14,22 @@ from devcycle_python_sdk.managers.event_queue_manager import (
 )
 from devcycle_python_sdk.models.event import (
     FlushPayload,
+    RawFlushPayload,
     UserEventsBatchRecord,
     RequestEvent,
     DevCycleEvent,
     EventType,
 )
+from devcycle_python_sdk.metrics import MetricsRegistry
 from devcycle_python_sdk.models.user import DevCycleUser
 
-from devcycle_python_sdk.exceptions import APIClientError, APIClientUnauthorizedError
+from devcycle_python_sdk.exceptions import (
+    APIClientBadRequestError,
+    APIClientError,
+    APIClientUnauthorizedError,
+    EventBatchPartiallySentError,
+)
+from devcycle_python_sdk.util.json_fragments import split_json_array
 
 logger = logging.getLogger(__name__)
 
@@ -198,6 +209,219 @@ class EventQueueManagerTest(unittest.TestCase):
         mock_publish_events.assert_called_once()
         self.test_local_bucketing.on_event_payload_success.assert_called_once()
 
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_raw_events")
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_events")
+    def test_flush_events_raw(self, mock_publish_events, mock_publish_raw_events):
+        raw_payload = RawFlushPayload(
+            payloadId="123",
+            records=['{"user": {"user_id": "999-000-111"}, "events": []}'],
+            eventCount=1,
+        )
+        self.test_local_bucketing.flush_event_queue_raw.return_value = [raw_payload]
+        self.test_options_no_thread.enable_raw_event_payloads = True
+
+        manager = EventQueueManager(
+            self.sdk_key,
+            self.client_uuid,
+            self.test_options_no_thread,
+            self.test_local_bucketing,
+        )
+        result = manager._flush_events()
+
+        self.assertEqual(result, 1)
+        self.test_local_bucketing.flush_event_queue.assert_not_called()
+        mock_publish_events.assert_not_called()
+        mock_publish_raw_events.assert_called_once_with(raw_payload.records)
+        self.test_local_bucketing.on_event_payload_success.assert_called_once_with(
+            "123"
+        )
+
+    def _spool_manager(self) -> EventQueueManager:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.test_options_no_thread.event_spool_path = os.path.join(
+            temp_dir.name, "events.spool"
+        )
+        self.test_options_no_thread.event_retry_delay_ms = 0
+        manager = EventQueueManager(
+            self.sdk_key,
+            self.client_uuid,
+            self.test_options_no_thread,
+            self.test_local_bucketing,
+        )
+        assert manager._event_spool is not None
+        self.addCleanup(manager._event_spool.close)
+        # no background thread is started for these options, allow the spool to be drained from the test instead
+        manager._exit.clear()
+        return manager
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_events")
+    def test_publish_event_payload_retryable_error_spools_payload(
+        self, mock_publish_events
+    ):
+        mock_publish_events.side_effect = APIClientError("Some retryable error")
+        manager = self._spool_manager()
+
+        manager._publish_event_payload(self.test_payload)
+
+        # the spool takes ownership of the events, so they are purged from the WASM queue
+        self.test_local_bucketing.on_event_payload_success.assert_called_once_with(
+            self.test_payload.payloadId
+        )
+        self.test_local_bucketing.on_event_payload_failure.assert_not_called()
+        spooled = json.loads(manager._event_spool.peek())
+        self.assertEqual(
+            spooled, [record.to_json() for record in self.test_payload.records]
+        )
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_events")
+    def test_publish_event_payload_bad_request_not_spooled(self, mock_publish_events):
+        mock_publish_events.side_effect = APIClientBadRequestError("Bad request")
+        manager = self._spool_manager()
+
+        manager._publish_event_payload(self.test_payload)
+
+        self.test_local_bucketing.on_event_payload_failure.assert_called_with(
+            self.test_payload.payloadId, True
+        )
+        self.assertTrue(manager._event_spool.is_empty())
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_raw_events")
+    def test_drain_event_spool(self, mock_publish_raw_events):
+        manager = self._spool_manager()
+        manager._event_spool.append(b'[{"user": {"user_id": "a"}, "events": []}]')
+        manager._event_spool.append(b'[{"user": {"user_id": "b"}, "events": []}]')
+
+        self.assertEqual(manager._drain_event_spool(), 2)
+
+        self.assertEqual(mock_publish_raw_events.call_count, 2)
+        mock_publish_raw_events.assert_called_with(
+            ['{"user": {"user_id": "b"}, "events": []}']
+        )
+        self.assertTrue(manager._event_spool.is_empty())
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_raw_events")
+    def test_drain_event_spool_backs_off_on_failure(self, mock_publish_raw_events):
+        mock_publish_raw_events.side_effect = APIClientError("Server error")
+        manager = self._spool_manager()
+        manager._max_spool_drain_interval = 60.0
+        manager._event_spool.append(b"[]")
+
+        self.assertEqual(manager._drain_event_spool(), 0)
+        self.assertFalse(manager._event_spool.is_empty())
+        self.assertEqual(manager._spool_drain_attempts, 1)
+
+        # a second drain is skipped until the backoff has elapsed
+        manager._next_spool_drain_time = time.monotonic() + 60.0
+        self.assertEqual(manager._drain_event_spool(), 0)
+        mock_publish_raw_events.assert_called_once()
+
+        mock_publish_raw_events.side_effect = None
+        manager._next_spool_drain_time = 0.0
+        self.assertEqual(manager._drain_event_spool(), 1)
+        self.assertTrue(manager._event_spool.is_empty())
+        self.assertEqual(manager._spool_drain_attempts, 0)
+
+    def _partial_payload(self) -> RawFlushPayload:
+        records = [
+            json.dumps({"user": {"user_id": user_id}, "events": [{}] * 2})
+            for user_id in ("a", "b", "c")
+        ]
+        return RawFlushPayload(payloadId="123", records=records, eventCount=6)
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_raw_events")
+    def test_publish_event_payload_partially_sent(self, mock_publish_raw_events):
+        payload = self._partial_payload()
+        mock_publish_raw_events.side_effect = EventBatchPartiallySentError(
+            APIClientError("Server error: HTTP 500"), payload.records[1:]
+        )
+        manager = EventQueueManager(
+            self.sdk_key,
+            self.client_uuid,
+            self.test_options_no_thread,
+            self.test_local_bucketing,
+        )
+        manager._publish_event_payload(payload)
+
+        # the WASM module would retry the whole payload, so the unsent records are retried from Python
+        self.test_local_bucketing.on_event_payload_success.assert_called_once_with(
+            "123"
+        )
+        self.test_local_bucketing.on_event_payload_failure.assert_not_called()
+        self.assertEqual(manager._unsent_event_count, 4)
+
+        # a retry that fails again keeps the records
+        mock_publish_raw_events.side_effect = APIClientError("Server error: HTTP 500")
+        self.assertEqual(manager._flush_events(), 0)
+        self.assertEqual(manager._unsent_event_count, 4)
+
+        mock_publish_raw_events.reset_mock(side_effect=True)
+        self.assertEqual(manager._flush_events(), 4)
+        mock_publish_raw_events.assert_called_once_with(payload.records[1:])
+        self.assertEqual(manager._unsent_event_count, 0)
+        self.assertEqual(len(manager._unsent_payloads), 0)
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_raw_events")
+    def test_publish_event_payload_partially_sent_spools_unsent(
+        self, mock_publish_raw_events
+    ):
+        payload = self._partial_payload()
+        mock_publish_raw_events.side_effect = EventBatchPartiallySentError(
+            APIClientError("Server error: HTTP 500"), payload.records[2:]
+        )
+        manager = self._spool_manager()
+        manager._publish_event_payload(payload)
+
+        assert manager._event_spool is not None
+        self.assertEqual(
+            split_json_array(manager._event_spool.peek().decode("utf-8"))[0],
+            payload.records[2:],
+        )
+        self.assertEqual(len(manager._unsent_payloads), 0)
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_raw_events")
+    def test_publish_event_payload_partially_rejected(self, mock_publish_raw_events):
+        payload = self._partial_payload()
+        mock_publish_raw_events.side_effect = EventBatchPartiallySentError(
+            APIClientBadRequestError("Bad request: HTTP 400"), payload.records[1:]
+        )
+        metrics = MetricsRegistry()
+        manager = EventQueueManager(
+            self.sdk_key,
+            self.client_uuid,
+            self.test_options_no_thread,
+            self.test_local_bucketing,
+            metrics,
+        )
+        manager._publish_event_payload(payload)
+
+        # records rejected by the Events API are dropped, not retried
+        self.assertEqual(len(manager._unsent_payloads), 0)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["devcycle_events_dropped"], 4)
+        self.assertEqual(snapshot["devcycle_events_published"], 2)
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_raw_events")
+    def test_drain_event_spool_partially_sent(self, mock_publish_raw_events):
+        payload = self._partial_payload()
+        manager = self._spool_manager()
+        assert manager._event_spool is not None
+        manager._event_spool.append(
+            ("[" + ", ".join(payload.records) + "]").encode("utf-8")
+        )
+        mock_publish_raw_events.side_effect = EventBatchPartiallySentError(
+            APIClientError("Server error: HTTP 500"), payload.records[1:]
+        )
+
+        self.assertEqual(manager._drain_event_spool(), 0)
+        # the spooled entry is replaced by the records that weren't sent
+        self.assertEqual(
+            split_json_array(manager._event_spool.peek().decode("utf-8"))[0],
+            payload.records[1:],
+        )
+        manager._event_spool.pop()
+        self.assertTrue(manager._event_spool.is_empty())
+
     def test_queue_event_bad_data(self):
         manager = EventQueueManager(
             self.sdk_key,
@@ -269,6 +493,114 @@ class EventQueueManagerTest(unittest.TestCase):
             manager._check_queue_status()
         self.test_local_bucketing.flush_event_queue.assert_called_once()
 
+    def test_check_queue_status_adaptive(self):
+        self.test_options_no_thread.flush_event_queue_size = 5
+        self.test_options_no_thread.max_event_queue_size = 100
+        self.test_options_no_thread.enable_adaptive_event_flushing = True
+
+        manager = EventQueueManager(
+            self.sdk_key,
+            self.client_uuid,
+            self.test_options_no_thread,
+            self.test_local_bucketing,
+        )
+
+        # over the count watermark, the flush is handed to the flush thread
+        self.test_local_bucketing.get_event_queue_size.return_value = 6
+        manager._check_queue_status()
+        self.test_local_bucketing.flush_event_queue.assert_not_called()
+        assert manager._flush_scheduler is not None
+        self.assertEqual(manager._flush_scheduler.wait(), "count")
+
+        # a full queue is still flushed on the caller's thread to avoid dropping events
+        self.test_local_bucketing.get_event_queue_size.return_value = 100
+        with self.assertRaises(QueueFullError):
+            manager._check_queue_status()
+        self.test_local_bucketing.flush_event_queue.assert_called_once()
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_events")
+    def test_adaptive_flush_on_bytes_watermark(self, mock_publish_events):
+        self.test_local_bucketing.get_event_queue_size.return_value = 1
+        self.test_local_bucketing.flush_event_queue.return_value = [self.test_payload]
+        self.test_options.enable_adaptive_event_flushing = True
+        self.test_options.event_flush_watermark_bytes = 10
+        self.test_options.event_flush_max_latency_ms = 60000
+
+        manager = EventQueueManager(
+            self.sdk_key, self.client_uuid, self.test_options, self.test_local_bucketing
+        )
+        manager.queue_event(
+            DevCycleUser(user_id="test"), DevCycleEvent(type=EventType.CustomEvent)
+        )
+
+        for _ in range(50):
+            if mock_publish_events.called:
+                break
+            time.sleep(0.01)
+        manager.close()
+
+        mock_publish_events.assert_called()
+        metrics = manager.flush_scheduler_metrics()
+        assert metrics is not None
+        self.assertEqual(metrics["flushes"]["bytes"], 1)
+        self.assertFalse(manager.is_alive())
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_events")
+    def test_adaptive_flush_backs_off_on_server_error(self, mock_publish_events):
+        mock_publish_events.side_effect = APIClientError("Server error: HTTP 500")
+        self.test_options_no_thread.enable_adaptive_event_flushing = True
+
+        manager = EventQueueManager(
+            self.sdk_key,
+            self.client_uuid,
+            self.test_options_no_thread,
+            self.test_local_bucketing,
+        )
+        manager._publish_event_payload(self.test_payload)
+
+        metrics = manager.flush_scheduler_metrics()
+        assert metrics is not None
+        self.assertEqual(metrics["consecutive_failures"], 1)
+        self.assertGreater(metrics["backoff_remaining_seconds"], 0)
+
+    @patch("devcycle_python_sdk.api.event_client.EventAPIClient.publish_events")
+    def test_adaptive_flush_after_evaluation(self, mock_publish_events):
+        self.test_local_bucketing.get_event_queue_size.return_value = 1
+        self.test_local_bucketing.flush_event_queue.return_value = [self.test_payload]
+        self.test_options.enable_adaptive_event_flushing = True
+        self.test_options.event_flush_max_latency_ms = 50
+        metrics = MetricsRegistry()
+
+        manager = EventQueueManager(
+            self.sdk_key,
+            self.client_uuid,
+            self.test_options,
+            self.test_local_bucketing,
+            metrics,
+        )
+        # nothing is flushed until an evaluation queues an event inside the WASM module
+        time.sleep(0.1)
+        mock_publish_events.assert_not_called()
+        manager.record_evaluation_event()
+
+        for _ in range(50):
+            if mock_publish_events.called:
+                break
+            time.sleep(0.01)
+        manager.close()
+
+        mock_publish_events.assert_called()
+        self.assertEqual(metrics.snapshot()["devcycle_event_flushes_deadline"], 1)
+
+    def test_flush_scheduler_metrics_disabled(self):
+        manager = EventQueueManager(
+            self.sdk_key,
+            self.client_uuid,
+            self.test_options_no_thread,
+            self.test_local_bucketing,
+        )
+        self.assertIsNone(manager.flush_scheduler_metrics())
+
     def test_queue_aggregate_event_bad_data(self):
         manager = EventQueueManager(
             self.sdk_key,
@@ -0,0 +1,110 @@
+import logging
+import os
+import tempfile
+import unittest
+
+from devcycle_python_sdk.managers.event_spool import EventSpool
+
+logger = logging.getLogger(__name__)
+
+
+class EventSpoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "events.spool")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_append_peek_pop(self):
+        spool = EventSpool(self.path, 4096)
+        self.assertTrue(spool.is_empty())
+        self.assertIsNone(spool.peek())
+
+        self.assertTrue(spool.append(b"[1]"))
+        self.assertTrue(spool.append(b"[2, 3]"))
+        self.assertFalse(spool.is_empty())
+
+        self.assertEqual(spool.peek(), b"[1]")
+        # peek doesn't consume the entry
+        self.assertEqual(spool.peek(), b"[1]")
+        spool.pop()
+        self.assertEqual(spool.peek(), b"[2, 3]")
+        spool.pop()
+
+        self.assertTrue(spool.is_empty())
+        self.assertEqual(spool.size(), 0)
+        spool.close()
+
+    def test_preallocates_file(self):
+        spool = EventSpool(self.path, 4096)
+        self.assertEqual(os.path.getsize(self.path), 4096)
+        spool.close()
+
+    def test_persists_across_reopen(self):
+        spool = EventSpool(self.path, 4096)
+        spool.append(b"[1]")
+        spool.append(b"[2]")
+        spool.pop()
+        spool.close()
+
+        reopened = EventSpool(self.path, 4096)
+        self.assertEqual(reopened.peek(), b"[2]")
+        reopened.pop()
+        self.assertIsNone(reopened.peek())
+        reopened.close()
+
+    def test_append_rejected_when_budget_exceeded(self):
+        spool = EventSpool(self.path, 128)
+        self.assertTrue(spool.append(b"x" * 64))
+        self.assertFalse(spool.append(b"y" * 64))
+
+        # the rejected payload doesn't affect the existing entries
+        self.assertEqual(spool.peek(), b"x" * 64)
+        spool.close()
+
+    def test_append_compacts_sent_entries(self):
+        spool = EventSpool(self.path, 128)
+        self.assertTrue(spool.append(b"a" * 30))
+        self.assertTrue(spool.append(b"b" * 30))
+        spool.pop()
+
+        # only fits once the space used by the sent entry is reclaimed
+        self.assertTrue(spool.append(b"c" * 40))
+        self.assertEqual(spool.peek(), b"b" * 30)
+        spool.pop()
+        self.assertEqual(spool.peek(), b"c" * 40)
+        spool.close()
+
+    def test_invalid_file_is_discarded(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a spool file" * 100)
+
+        spool = EventSpool(self.path, 4096)
+        self.assertTrue(spool.is_empty())
+        self.assertTrue(spool.append(b"[1]"))
+        self.assertEqual(spool.peek(), b"[1]")
+        spool.close()
+
+    def test_corrupted_entry_is_discarded(self):
+        spool = EventSpool(self.path, 4096)
+        spool.append(b"[1]")
+        spool.close()
+
+        with open(self.path, "r+b") as f:
+            # the first entry's payload starts after the 32 byte file header and 8 byte entry header
+            f.seek(40)
+            f.write(b"X")
+
+        reopened = EventSpool(self.path, 4096)
+        self.assertIsNone(reopened.peek())
+        self.assertTrue(reopened.is_empty())
+        reopened.close()
+
+    def test_max_bytes_too_small(self):
+        with self.assertRaises(ValueError):
+            EventSpool(self.path, 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import logging
+import time
+import unittest
+from typing import Optional
+
+from devcycle_python_sdk import DevCycleLocalOptions
+from devcycle_python_sdk.managers.flush_scheduler import FlushReason, FlushScheduler
+from devcycle_python_sdk.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def _wait_for_flush(scheduler: FlushScheduler) -> Optional[str]:
+    # The first event after a flush wakes the waiting thread to start the deadline, so wait() can return early
+    for _ in range(10):
+        reason = scheduler.wait()
+        if reason is not None:
+            return reason
+    return None
+
+
+class FlushSchedulerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.options = DevCycleLocalOptions(
+            enable_adaptive_event_flushing=True,
+            event_flush_watermark_bytes=100,
+            event_flush_max_latency_ms=50,
+            event_retry_delay_ms=200,
+        )
+
+    def test_bytes_watermark(self):
+        scheduler = FlushScheduler(self.options)
+        scheduler.record_event(60)
+        scheduler.record_event(60)
+
+        self.assertEqual(scheduler.wait(), FlushReason.BYTES)
+        scheduler.begin_flush()
+        scheduler.on_flush(FlushReason.BYTES, 2)
+
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics["flushes"][FlushReason.BYTES], 1)
+        self.assertEqual(metrics["last_flush_reason"], FlushReason.BYTES)
+        self.assertEqual(metrics["pending_bytes"], 0)
+
+    def test_requested_flush(self):
+        scheduler = FlushScheduler(self.options)
+        scheduler.request_flush(FlushReason.COUNT)
+        # the first requested reason is kept until the flush happens
+        scheduler.request_flush(FlushReason.BYTES)
+
+        self.assertEqual(scheduler.wait(), FlushReason.COUNT)
+
+    def test_deadline(self):
+        scheduler = FlushScheduler(self.options)
+        start = time.monotonic()
+        scheduler.record_event(10)
+
+        self.assertEqual(_wait_for_flush(scheduler), FlushReason.DEADLINE)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+        scheduler.begin_flush()
+        scheduler.on_flush(FlushReason.DEADLINE, 0)
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics["flushes"][FlushReason.DEADLINE], 0)
+        self.assertEqual(metrics["empty_deadlines"], 1)
+
+    def test_deadline_starts_at_first_event(self):
+        scheduler = FlushScheduler(self.options)
+        scheduler.begin_flush()
+        scheduler.on_flush(FlushReason.BYTES, 1)
+
+        # no deadline is running while nothing is queued
+        time.sleep(0.06)
+        scheduler.wake()
+        self.assertIsNone(scheduler.wait())
+
+        start = time.monotonic()
+        scheduler.record_pending_event()
+        # later events don't move the deadline
+        time.sleep(0.02)
+        scheduler.record_pending_event()
+        self.assertEqual(_wait_for_flush(scheduler), FlushReason.DEADLINE)
+        waited = time.monotonic() - start
+        self.assertGreaterEqual(waited, 0.04)
+        self.assertLess(waited, 0.065)
+
+    def test_failure_retries_after_backoff(self):
+        scheduler = FlushScheduler(self.options)
+        scheduler.begin_flush()
+        scheduler.on_publish_failure()
+
+        # the failed payloads are flushed again once the backoff has elapsed
+        start = time.monotonic()
+        self.assertEqual(_wait_for_flush(scheduler), FlushReason.DEADLINE)
+        self.assertGreater(time.monotonic() - start, 0.05)
+
+    def test_registry_metrics(self):
+        registry = MetricsRegistry()
+        scheduler = FlushScheduler(self.options, registry)
+        scheduler.record_event(60)
+        scheduler.record_event(60)
+        self.assertEqual(scheduler.wait(), FlushReason.BYTES)
+        scheduler.begin_flush()
+        scheduler.on_flush(FlushReason.BYTES, 2)
+        scheduler.on_publish_failure()
+        scheduler.request_flush(FlushReason.COUNT)
+        scheduler.wake()
+        self.assertIsNone(scheduler.wait())
+
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot["devcycle_event_flushes_bytes"], 1)
+        self.assertEqual(snapshot["devcycle_event_flushes_count"], 0)
+        self.assertEqual(snapshot["devcycle_event_flushes_deferred"], 1)
+        self.assertEqual(snapshot["devcycle_event_publish_consecutive_failures"], 1)
+        self.assertGreater(snapshot["devcycle_event_flush_backoff_seconds"], 0)
+        self.assertEqual(snapshot["devcycle_event_flush_pending_bytes"], 0)
+
+    def test_wake(self):
+        self.options.event_flush_max_latency_ms = 60000
+        scheduler = FlushScheduler(self.options)
+        scheduler.wake()
+        self.assertIsNone(scheduler.wait())
+
+    def test_backoff_after_failure(self):
+        scheduler = FlushScheduler(self.options)
+        scheduler.on_publish_failure()
+        scheduler.request_flush(FlushReason.COUNT)
+        scheduler.wake()
+
+        # the requested flush is deferred while backing off
+        self.assertIsNone(scheduler.wait())
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics["deferred_flushes"], 1)
+        self.assertEqual(metrics["consecutive_failures"], 1)
+        self.assertGreater(metrics["backoff_remaining_seconds"], 0)
+
+        # once the backoff has elapsed the flush goes ahead
+        self.assertEqual(scheduler.wait(), FlushReason.COUNT)
+
+        scheduler.on_publish_success()
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics["consecutive_failures"], 0)
+        self.assertEqual(metrics["backoff_remaining_seconds"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
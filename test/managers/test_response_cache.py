@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+import unittest
+
+from devcycle_python_sdk.managers.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = ResponseCache(ttl_ms=50, stale_ms=200, max_users=2)
+        self.fetch_count = 0
+
+    def tearDown(self) -> None:
+        self.cache.close()
+
+    def fetch(self) -> dict:
+        self.fetch_count += 1
+        return {"value": self.fetch_count}
+
+    def _is_fresh(self, fingerprint):
+        return self.cache.get_fresh_item(fingerprint, "key", "value")[0]
+
+    def test_fresh_hit(self):
+        self.assertEqual(
+            self.cache.get_or_fetch("user", "key", self.fetch), {"value": 1}
+        )
+        self.assertEqual(
+            self.cache.get_or_fetch("user", "key", self.fetch), {"value": 1}
+        )
+        self.assertEqual(self.fetch_count, 1)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_values_are_copied(self):
+        value = self.cache.get_or_fetch("user", "key", self.fetch)
+        value["value"] = "changed"
+        self.assertEqual(
+            self.cache.get_or_fetch("user", "key", self.fetch), {"value": 1}
+        )
+        self.assertEqual(self.cache.get_fresh_item("user", "key", "value"), (True, 1))
+
+    def test_get_fresh_item(self):
+        self.assertEqual(self.cache.get_fresh_item("user", "all", "a"), (False, None))
+
+        items = {"a": {"value": 1}, "b": {"value": 2}}
+        self.cache.set("user", "all", items)
+        found, item = self.cache.get_fresh_item("user", "all", "a")
+        self.assertTrue(found)
+        self.assertEqual(item, {"value": 1})
+        # only the item is copied
+        assert item is not None
+        self.assertIsNot(item, items["a"])
+        self.assertEqual(self.cache.get_fresh_item("user", "all", "c"), (True, None))
+
+        time.sleep(0.08)
+        self.assertEqual(self.cache.get_fresh_item("user", "all", "a"), (False, None))
+
+    def test_stale_while_revalidate(self):
+        self.cache.get_or_fetch("user", "key", self.fetch)
+        time.sleep(0.08)
+
+        release = threading.Event()
+        refreshed = threading.Event()
+
+        def slow_fetch():
+            release.wait(1)
+            result = self.fetch()
+            refreshed.set()
+            return result
+
+        # the stale value is returned and refreshed in the background
+        self.assertEqual(
+            self.cache.get_or_fetch("user", "key", slow_fetch), {"value": 1}
+        )
+        self.assertFalse(self._is_fresh("user"))
+        release.set()
+        self.assertTrue(refreshed.wait(1))
+
+        deadline = time.monotonic() + 1
+        while not self._is_fresh("user") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(
+            self.cache.get_or_fetch("user", "key", self.fetch), {"value": 2}
+        )
+        self.assertEqual(self.cache.stats()["stale_hits"], 1)
+
+    def test_refresh_error_keeps_stale_value(self):
+        self.cache.get_or_fetch("user", "key", self.fetch)
+        time.sleep(0.08)
+
+        def failing_fetch():
+            raise Exception("request failed")
+
+        self.assertEqual(
+            self.cache.get_or_fetch("user", "key", failing_fetch), {"value": 1}
+        )
+        deadline = time.monotonic() + 1
+        while self.cache.stats()["refresh_errors"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.cache.stats()["refresh_errors"], 1)
+        self.assertEqual(
+            self.cache.get_or_fetch("user", "key", failing_fetch), {"value": 1}
+        )
+
+    def test_expired_entry_is_fetched(self):
+        self.cache.get_or_fetch("user", "key", self.fetch)
+        time.sleep(0.3)
+        self.assertEqual(
+            self.cache.get_or_fetch("user", "key", self.fetch), {"value": 2}
+        )
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_least_recently_used_user_is_evicted(self):
+        self.cache.get_or_fetch("user1", "key", self.fetch)
+        self.cache.get_or_fetch("user2", "key", self.fetch)
+        # user1 is used again, so user2 is evicted by user3
+        self.cache.get_or_fetch("user1", "key", self.fetch)
+        self.cache.get_or_fetch("user3", "key", self.fetch)
+
+        self.assertEqual(self.cache.stats()["users"], 2)
+        self.assertTrue(self._is_fresh("user1"))
+        self.assertFalse(self._is_fresh("user2"))
+        self.assertTrue(self._is_fresh("user3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
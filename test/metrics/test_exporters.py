@@ -0,0 +1,74 @@
+import logging
+import unittest
+
+from prometheus_client import CollectorRegistry, generate_latest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from devcycle_python_sdk.metrics import MetricsRegistry
+from devcycle_python_sdk.metrics.opentelemetry import instrument_meter
+from devcycle_python_sdk.metrics.prometheus import register_prometheus_collector
+
+logger = logging.getLogger(__name__)
+
+
+def _registry() -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.counter("devcycle_events_published", "Events sent").inc(3)
+    registry.gauge("devcycle_event_queue_depth", "Queue depth", lambda: 7)
+    registry.gauge("devcycle_config_age_seconds", "Config age", lambda: None)
+    registry.histogram(
+        "devcycle_variable_evaluation_seconds", "Evaluation time", buckets=[0.001]
+    ).observe(0.0005)
+    return registry
+
+
+class PrometheusExporterTest(unittest.TestCase):
+    def test_collect(self):
+        prometheus_registry = CollectorRegistry()
+        register_prometheus_collector(_registry(), prometheus_registry)
+
+        output = generate_latest(prometheus_registry).decode("utf-8")
+        self.assertIn("devcycle_events_published_total 3.0", output)
+        self.assertIn("devcycle_event_queue_depth 7.0", output)
+        # gauges without a value are left out
+        self.assertNotIn("devcycle_config_age_seconds", output)
+        self.assertIn(
+            'devcycle_variable_evaluation_seconds_bucket{le="0.001"} 1.0', output
+        )
+        self.assertIn(
+            'devcycle_variable_evaluation_seconds_bucket{le="+Inf"} 1.0', output
+        )
+        self.assertIn("devcycle_variable_evaluation_seconds_count 1.0", output)
+
+
+class OpenTelemetryExporterTest(unittest.TestCase):
+    def test_instrument_meter(self):
+        registry = _registry()
+        reader = InMemoryMetricReader()
+        provider = MeterProvider(metric_readers=[reader])
+        instrument_meter(registry, provider.get_meter("test"))
+
+        # histogram values are recorded from when the meter was instrumented
+        registry.histogram(
+            "devcycle_variable_evaluation_seconds", "Evaluation time"
+        ).observe(0.002)
+
+        data = reader.get_metrics_data()
+        points = {
+            metric.name: metric.data.data_points[0]
+            for resource_metrics in data.resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+            if metric.data.data_points
+        }
+        self.assertEqual(points["devcycle_events_published"].value, 3)
+        self.assertEqual(points["devcycle_event_queue_depth"].value, 7)
+        self.assertNotIn("devcycle_config_age_seconds", points)
+        self.assertEqual(points["devcycle_variable_evaluation_seconds"].count, 1)
+        self.assertEqual(points["devcycle_variable_evaluation_seconds"].sum, 0.002)
+        provider.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
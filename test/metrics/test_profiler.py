@@ -0,0 +1,60 @@
+import logging
+import unittest
+
+from devcycle_python_sdk.metrics import MetricsRegistry
+from devcycle_python_sdk.metrics.profiler import (
+    PHASES,
+    EvaluationProfiler,
+    PhaseTimer,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationProfilerTest(unittest.TestCase):
+    def test_phase_timer(self):
+        timer = PhaseTimer()
+        timer.mark("wasm")
+        timer.mark("decode")
+        timer.mark("wasm")
+        self.assertEqual(list(timer.phases), ["wasm", "decode"])
+        self.assertTrue(all(seconds >= 0 for seconds in timer.phases.values()))
+
+    def test_sample_rate(self):
+        self.assertIsNotNone(EvaluationProfiler(1.0).sample())
+        sampled = [EvaluationProfiler(0.1).sample() for _ in range(1000)]
+        self.assertLess(sum(timer is not None for timer in sampled), 200)
+
+    def test_breakdown(self):
+        profiler = EvaluationProfiler(1.0)
+        for _ in range(4):
+            timer = PhaseTimer()
+            timer.phases = {"protobuf_build": 0.000002, "wasm": 0.000008}
+            profiler.record(timer)
+
+        breakdown = profiler.breakdown()
+        self.assertEqual(breakdown["sampled_evaluations"], 4)
+        self.assertEqual(list(breakdown["phases"]), list(PHASES) + ["total"])
+
+        wasm = breakdown["phases"]["wasm"]
+        self.assertEqual(wasm["count"], 4)
+        self.assertAlmostEqual(wasm["mean_us"], 8)
+        self.assertAlmostEqual(wasm["p50_us"], 10)
+        self.assertAlmostEqual(wasm["share"], 0.8)
+        self.assertAlmostEqual(breakdown["phases"]["protobuf_build"]["p99_us"], 2.5)
+        self.assertEqual(breakdown["phases"]["lock_wait"]["count"], 0)
+        self.assertAlmostEqual(breakdown["phases"]["total"]["mean_us"], 10)
+
+    def test_metrics_registry(self):
+        registry = MetricsRegistry()
+        profiler = EvaluationProfiler(1.0, registry)
+        timer = PhaseTimer()
+        timer.phases = {"wasm": 0.00001}
+        profiler.record(timer)
+        self.assertEqual(
+            registry.snapshot()["devcycle_variable_phase_wasm_seconds"]["count"], 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
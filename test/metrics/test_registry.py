@@ -0,0 +1,99 @@
+import logging
+import threading
+import unittest
+
+from devcycle_python_sdk.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = MetricsRegistry()
+
+    def test_counter(self):
+        counter = self.registry.counter("requests", "Requests sent")
+        counter.inc()
+        counter.inc(4)
+        self.assertEqual(counter.value, 5)
+        # getting a metric again returns the same one
+        self.assertIs(self.registry.counter("requests", "Requests sent"), counter)
+
+    def test_counter_threads(self):
+        counter = self.registry.counter("requests", "Requests sent")
+
+        def increment():
+            for _ in range(1000):
+                counter.inc()
+
+        threads = [threading.Thread(target=increment) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.value, 8000)
+
+    def test_gauge(self):
+        gauge = self.registry.gauge("depth", "Queue depth")
+        self.assertIsNone(gauge.value)
+        gauge.set(3)
+        self.assertEqual(gauge.value, 3)
+
+        depth = [7]
+        callback_gauge = self.registry.gauge(
+            "callback_depth", "Queue depth", lambda: depth[0]
+        )
+        self.assertEqual(callback_gauge.value, 7)
+        depth[0] = 2
+        self.assertEqual(callback_gauge.value, 2)
+
+    def test_histogram(self):
+        histogram = self.registry.histogram(
+            "latency", "Latency", buckets=[0.01, 0.1, 1]
+        )
+        for value in [0.005, 0.01, 0.05, 0.5, 5]:
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 5)
+        self.assertAlmostEqual(snapshot["sum"], 5.565)
+        # bucket counts are cumulative, and a value equal to a bound falls in that bucket
+        self.assertEqual(
+            snapshot["buckets"],
+            [(0.01, 2), (0.1, 3), (1, 4), (float("inf"), 5)],
+        )
+
+    def test_histogram_time(self):
+        histogram = self.registry.histogram("latency", "Latency")
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.snapshot()["count"], 1)
+
+    def test_histogram_listener(self):
+        histogram = self.registry.histogram("latency", "Latency")
+        observed = []
+        histogram.add_listener(observed.append)
+        histogram.observe(0.25)
+        self.assertEqual(observed, [0.25])
+
+    def test_snapshot(self):
+        self.registry.counter("requests", "Requests sent").inc()
+        self.registry.gauge("depth", "Queue depth", lambda: 4)
+        self.registry.histogram("latency", "Latency", buckets=[1]).observe(0.5)
+
+        self.assertEqual(
+            self.registry.snapshot(),
+            {
+                "requests": 1,
+                "depth": 4,
+                "latency": {
+                    "count": 1,
+                    "sum": 0.5,
+                    "buckets": [(1, 1), (float("inf"), 1)],
+                },
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import json
 import logging
 import unittest
 
@@ -272,6 +273,50 @@ class DevCycleUserTest(unittest.TestCase):
                 custom_data, "list_data", ["one", "two", "three"]
             )
 
+    def test_cached_encoding(self):
+        user = DevCycleUser(user_id="1234", customData={"plan": "free"})
+        calls = []
+
+        def encode(u):
+            calls.append(u)
+            return len(calls)
+
+        self.assertEqual(user.cached_encoding("test", encode), 1)
+        self.assertEqual(user.cached_encoding("test", encode), 1)
+
+        user.email = "test@example.com"
+        self.assertEqual(user.cached_encoding("test", encode), 2)
+
+        user.customData["plan"] = "pro"
+        self.assertEqual(user.cached_encoding("test", encode), 3)
+
+        # equal values of a different type encode differently
+        user.customData["seats"] = 1
+        self.assertEqual(user.cached_encoding("test", encode), 4)
+        user.customData["seats"] = True
+        self.assertEqual(user.cached_encoding("test", encode), 5)
+
+        user.privateCustomData = {"ip": "127.0.0.1"}
+        self.assertEqual(user.cached_encoding("test", encode), 6)
+        self.assertEqual(user.cached_encoding("test", encode), 6)
+
+    def test_to_json_cached(self):
+        user = DevCycleUser(user_id="1234", customData={"plan": "free"})
+        self.assertEqual(user.to_json_str(), json.dumps(user.to_json()))
+
+        # changes to the returned dict don't affect the user's encoding
+        user_json = user.to_json()
+        user_json["email"] = "test@example.com"
+        self.assertNotIn("email", user.to_json())
+
+        user.country = "CA"
+        user.customData["plan"] = "pro"
+        self.assertEqual(user.to_json()["country"], "CA")
+        self.assertEqual(json.loads(user.to_json_str())["customData"]["plan"], "pro")
+
+        # the cache isn't part of the user's fields
+        self.assertEqual(user, DevCycleUser.from_json(user.to_json()))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,84 @@
+import logging
+import unittest
+
+import devcycle_python_sdk.protobuf.variableForUserParams_pb2 as pb2
+from devcycle_python_sdk.models.user import DevCycleUser
+from devcycle_python_sdk.protobuf.utils import (
+    VariableForUserParamsTemplate,
+    create_dvcuser_pb,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _serialize(sdk_key, user, key, variable_type):
+    return pb2.VariableForUserParams_PB(
+        sdkKey=sdk_key,
+        variableKey=key,
+        variableType=variable_type,
+        user=create_dvcuser_pb(user),
+        shouldTrackEvent=True,
+    ).SerializeToString()
+
+
+class VariableForUserParamsTemplateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.template = VariableForUserParamsTemplate("dvc_server_key")
+
+    def test_serialize_matches_protobuf(self):
+        users = [
+            DevCycleUser(user_id="1234"),
+            DevCycleUser(
+                user_id="é-user",
+                email="test@example.com",
+                country="CA",
+                appBuild=12.5,
+                customData={"plan": "pro", "seats": 10, "beta": True},
+                privateCustomData={"ip": "127.0.0.1"},
+            ),
+        ]
+        keys = ["a", "string-var", "ключ", "k" * 300]
+        for user in users:
+            for key in keys:
+                for variable_type in pb2.VariableType_PB.values():
+                    self.assertEqual(
+                        self.template.serialize(user, key, variable_type),
+                        _serialize("dvc_server_key", user, key, variable_type),
+                    )
+
+    def test_user_changes_are_reencoded(self):
+        user = DevCycleUser(user_id="1234", customData={"plan": "free"})
+        self.template.serialize(user, "key", pb2.String)
+
+        user.customData["plan"] = "pro"
+        self.assertEqual(
+            self.template.serialize(user, "key", pb2.String),
+            _serialize("dvc_server_key", user, "key", pb2.String),
+        )
+
+        user.email = "test@example.com"
+        self.assertEqual(
+            self.template.serialize(user, "key", pb2.String),
+            _serialize("dvc_server_key", user, "key", pb2.String),
+        )
+
+        other = DevCycleUser(user_id="5678")
+        self.assertEqual(
+            self.template.serialize(other, "key", pb2.String),
+            _serialize("dvc_server_key", other, "key", pb2.String),
+        )
+
+    def test_user_encoding_reused(self):
+        user = DevCycleUser(user_id="1234")
+        other = DevCycleUser(user_id="5678")
+        first = self.template.user_field(user)
+        self.template.user_field(other)
+        self.assertIs(self.template.user_field(user), first)
+
+        # the encoding is cached on the user, so other templates reuse it
+        template = VariableForUserParamsTemplate("other_key")
+        self.assertIs(template.user_field(user), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
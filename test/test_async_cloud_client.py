@@ -0,0 +1,216 @@
+import logging
+import time
+import unittest
+import uuid
+from typing import Dict
+
+from devcycle_python_sdk import DevCycleAsyncCloudClient, DevCycleCloudOptions
+from devcycle_python_sdk.exceptions import CloudClientUnauthorizedError
+from devcycle_python_sdk.models.eval_hook import EvalHook
+from devcycle_python_sdk.models.event import DevCycleEvent
+from devcycle_python_sdk.models.user import DevCycleUser
+from test.fixture.stub_servers import BucketingStubServer
+
+logger = logging.getLogger(__name__)
+
+VARIABLES: Dict[str, dict] = {
+    "string-var": {
+        "_id": "string_var_id",
+        "key": "string-var",
+        "type": "String",
+        "value": "variationOn",
+        "eval": {"reason": "TARGETING_MATCH", "details": "All Users"},
+    },
+    "num-var": {
+        "_id": "num_var_id",
+        "key": "num-var",
+        "type": "Number",
+        "value": 12,
+    },
+}
+
+FEATURES: Dict[str, dict] = {
+    "a-feature": {
+        "_id": "feature_id",
+        "key": "a-feature",
+        "type": "release",
+        "_variation": "variation_id",
+        "variationKey": "variation-on",
+        "variationName": "Variation On",
+    }
+}
+
+
+class DevCycleAsyncCloudClientTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.server = BucketingStubServer(variables=VARIABLES, features=FEATURES)
+        self.server.start()
+        self.sdk_key = "dvc_server_" + str(uuid.uuid4())
+        self.options = DevCycleCloudOptions(
+            bucketing_api_uri=self.server.url, retry_delay=0
+        )
+        self.test_client = DevCycleAsyncCloudClient(self.sdk_key, self.options)
+        self.test_user = DevCycleUser(user_id="test_user_id")
+
+    async def asyncTearDown(self) -> None:
+        await self.test_client.close()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_create_client_invalid_sdk_key(self):
+        with self.assertRaises(ValueError):
+            DevCycleAsyncCloudClient(None, None)
+
+        with self.assertRaises(ValueError):
+            DevCycleAsyncCloudClient("no prefix in key", None)
+
+    async def test_variable(self):
+        variable = await self.test_client.variable(
+            self.test_user, "string-var", "default"
+        )
+        self.assertEqual(variable.value, "variationOn")
+        self.assertFalse(variable.isDefaulted)
+        self.assertEqual(variable.defaultValue, "default")
+        self.assertEqual(variable.eval.reason, "TARGETING_MATCH")
+
+        self.assertEqual(
+            await self.test_client.variable_value(self.test_user, "num-var", 0), 12
+        )
+        self.assertEqual(
+            self.server.request_headers[0].get("Authorization"), self.sdk_key
+        )
+
+    async def test_variable_not_found(self):
+        variable = await self.test_client.variable(
+            self.test_user, "missing-var", "default"
+        )
+        self.assertEqual(variable.value, "default")
+        self.assertTrue(variable.isDefaulted)
+        self.assertEqual(variable.eval.details, "Error")
+
+    async def test_variable_type_mismatch(self):
+        variable = await self.test_client.variable(self.test_user, "num-var", "abc")
+        self.assertEqual(variable.value, "abc")
+        self.assertTrue(variable.isDefaulted)
+        self.assertEqual(variable.eval.details, "Variable Type Mismatch")
+
+    async def test_variable_retries(self):
+        self.server.fail_requests = 2
+        variable = await self.test_client.variable(
+            self.test_user, "string-var", "default"
+        )
+        self.assertEqual(variable.value, "variationOn")
+        self.assertEqual(self.server.request_count, 3)
+
+    async def test_variable_retries_exceeded(self):
+        self.options.request_retries = 1
+        self.server.fail_requests = 2
+        variable = await self.test_client.variable(
+            self.test_user, "string-var", "default"
+        )
+        self.assertEqual(variable.value, "default")
+        self.assertTrue(variable.isDefaulted)
+        self.assertEqual(self.server.request_count, 2)
+
+    async def test_variable_deadline(self):
+        self.options.request_deadline_ms = 100
+        self.options.retry_delay = 1000
+        self.server.fail_requests = 10
+        start = time.monotonic()
+        variable = await self.test_client.variable(
+            self.test_user, "string-var", "default"
+        )
+        self.assertEqual(variable.value, "default")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(self.server.request_count, 1)
+
+    async def test_variable_unauthorized(self):
+        self.server.routes[("POST", "/v1/variables/*")] = lambda path, body: (
+            401,
+            {"message": "Unauthorized"},
+        )
+        with self.assertRaises(CloudClientUnauthorizedError):
+            await self.test_client.variable(self.test_user, "string-var", "default")
+
+    async def test_all_variables(self):
+        variables = await self.test_client.all_variables(self.test_user)
+        self.assertEqual(set(variables.keys()), {"string-var", "num-var"})
+        self.assertEqual(variables["num-var"].value, 12)
+
+    async def test_all_features(self):
+        features = await self.test_client.all_features(self.test_user)
+        self.assertEqual(features["a-feature"].variationKey, "variation-on")
+
+    async def test_track(self):
+        await self.test_client.track(
+            self.test_user,
+            DevCycleEvent(type="customEvent", target="test_target", value=42),
+        )
+        self.assertEqual(len(self.server.tracked), 1)
+        self.assertEqual(self.server.tracked[0]["user"]["user_id"], "test_user_id")
+        self.assertEqual(self.server.tracked[0]["events"][0]["type"], "customEvent")
+
+        with self.assertRaises(ValueError):
+            await self.test_client.track(self.test_user, None)
+
+    async def test_hooks(self):
+        hook_called = {
+            "before": False,
+            "after": False,
+            "finally": False,
+            "error": False,
+        }
+
+        def before_hook(context):
+            hook_called["before"] = True
+            return context
+
+        def after_hook(context, variable, variable_metadata):
+            hook_called["after"] = True
+
+        def finally_hook(context, variable, variable_metadata):
+            hook_called["finally"] = True
+
+        def error_hook(context, error):
+            hook_called["error"] = True
+
+        self.test_client.add_hook(
+            EvalHook(before_hook, after_hook, finally_hook, error_hook)
+        )
+
+        variable = await self.test_client.variable(self.test_user, "num-var", 42)
+        self.assertEqual(variable.value, 12)
+        self.assertTrue(hook_called["before"])
+        self.assertTrue(hook_called["after"])
+        self.assertTrue(hook_called["finally"])
+        self.assertFalse(hook_called["error"])
+
+    async def test_hook_exceptions(self):
+        hook_called = {"after": False, "finally": False, "error": False}
+
+        def before_hook(context):
+            raise Exception("Before hook failed")
+
+        def after_hook(context, variable, variable_metadata):
+            hook_called["after"] = True
+
+        def finally_hook(context, variable, variable_metadata):
+            hook_called["finally"] = True
+
+        def error_hook(context, error):
+            hook_called["error"] = True
+
+        self.test_client.add_hook(
+            EvalHook(before_hook, after_hook, finally_hook, error_hook)
+        )
+
+        variable = await self.test_client.variable(self.test_user, "num-var", 42)
+        self.assertEqual(variable.value, 12)
+        self.assertFalse(hook_called["after"])
+        self.assertTrue(hook_called["finally"])
+        self.assertTrue(hook_called["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
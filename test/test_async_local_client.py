@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import threading
+import time
+import unittest
+from typing import List
+from unittest.mock import patch
+
+import responses
+
+from devcycle_python_sdk import DevCycleAsyncLocalClient, DevCycleLocalOptions
+from devcycle_python_sdk.models.eval_hook import EvalHook
+from devcycle_python_sdk.models.event import DevCycleEvent
+from devcycle_python_sdk.models.user import DevCycleUser
+from test.fixture.data import small_config_json
+
+logger = logging.getLogger(__name__)
+
+
+class DevCycleAsyncLocalClientTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.sdk_key = "dvc_server_949e4962-c624-4d20-a1ea-7f2501b2ba79"
+        responses.start()
+        responses.add(
+            responses.GET,
+            "http://localhost/config/v2/server/" + self.sdk_key + ".json",
+            headers={"ETag": "2f71454e-3279-4ca7-a8e7-802ce97bef43"},
+            json=small_config_json(),
+            status=200,
+        )
+
+        self.options = DevCycleLocalOptions(
+            config_polling_interval_ms=5000,
+            config_cdn_uri="http://localhost/",
+            disable_custom_event_logging=True,
+            disable_automatic_event_logging=True,
+            disable_realtime_updates=True,
+        )
+        self.test_user = DevCycleUser(user_id="test_user_id")
+        self.client = DevCycleAsyncLocalClient(self.sdk_key, self.options)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+
+    def tearDown(self) -> None:
+        responses.stop()
+        responses.reset()
+
+    def _record_eval_threads(self) -> List[str]:
+        thread_names: List[str] = []
+
+        def before_hook(context):
+            thread_names.append(threading.current_thread().name)
+            return context
+
+        self.client.add_hook(
+            EvalHook(
+                before_hook,
+                lambda *args: None,
+                lambda *args: None,
+                lambda *args: None,
+            )
+        )
+        return thread_names
+
+    async def test_wait_for_initialization(self):
+        self.assertTrue(await self.client.wait_for_initialization(5))
+        self.assertTrue(self.client.is_initialized())
+        self.assertEqual(self.client.get_sdk_platform(), "Local")
+
+    async def test_variable(self):
+        await self.client.wait_for_initialization(5)
+
+        variable = await self.client.variable(
+            self.test_user, "string-var", "default_value"
+        )
+        self.assertEqual(variable.value, "variationOn")
+        self.assertFalse(variable.isDefaulted)
+        self.assertEqual(
+            await self.client.variable_value(self.test_user, "num-var", 0), 12345
+        )
+        self.assertEqual(
+            await self.client.variable_value(self.test_user, "badKey", "default"),
+            "default",
+        )
+
+        with self.assertRaises(ValueError):
+            await self.client.variable(self.test_user, "", "default_value")
+
+    async def test_all_variables_and_features(self):
+        await self.client.wait_for_initialization(5)
+
+        variables = await self.client.all_variables(self.test_user)
+        self.assertIn("string-var", variables)
+        features = await self.client.all_features(self.test_user)
+        self.assertIn("a-cool-new-feature", features)
+
+    async def test_track(self):
+        await self.client.wait_for_initialization(5)
+        await self.client.track(
+            self.test_user, DevCycleEvent(type="customEvent", target="someTarget")
+        )
+
+        with self.assertRaises(ValueError):
+            await self.client.track(self.test_user, None)
+
+    async def test_track_runs_on_executor(self):
+        await self.client.wait_for_initialization(5)
+        thread_names: List[str] = []
+        queue_event = self.client.client.event_queue_manager.queue_event
+
+        def record_thread(user, event):
+            thread_names.append(threading.current_thread().name)
+            queue_event(user, event)
+
+        # a full queue is flushed by the caller, so events are never queued on the event loop
+        with patch.object(
+            self.client.client.event_queue_manager, "queue_event", record_thread
+        ):
+            await self.client.track(
+                self.test_user, DevCycleEvent(type="customEvent", target="someTarget")
+            )
+        self.assertEqual(len(thread_names), 1)
+        self.assertTrue(thread_names[0].startswith("devcycle-eval"))
+
+    async def test_wasm_evaluations_run_on_executor(self):
+        await self.client.wait_for_initialization(5)
+        thread_names = self._record_eval_threads()
+
+        # even while the bucketing library is free
+        await self.client.variable(self.test_user, "string-var", "default_value")
+        await self.client.all_variables(self.test_user)
+        self.assertEqual(len(thread_names), 1)
+        self.assertTrue(thread_names[0].startswith("devcycle-eval"))
+
+    async def test_cache_hits_run_inline(self):
+        await self.client.close()
+        self.options.enable_evaluation_cache = True
+        self.client = DevCycleAsyncLocalClient(self.sdk_key, self.options)
+        await self.client.wait_for_initialization(5)
+        thread_names = self._record_eval_threads()
+
+        first = await self.client.variable(self.test_user, "string-var", "default")
+        self.assertEqual(len(thread_names), 1)
+        self.assertTrue(thread_names[0].startswith("devcycle-eval"))
+
+        # cache hits never wait on the WASM lock, so they are answered on the loop even while it's held
+        with self.client.client.local_bucketing.wasm_lock:
+            second = await self.client.variable(self.test_user, "string-var", "default")
+        self.assertEqual(thread_names[1], threading.current_thread().name)
+        self.assertEqual(second, first)
+        cache = self.client.client.config_manager.evaluation_cache
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    async def test_variable_offloaded_when_bucketing_is_busy(self):
+        await self.client.wait_for_initialization(5)
+        thread_names = self._record_eval_threads()
+
+        # hold the WASM lock from another thread, as a config update would
+        wasm_lock = self.client.client.local_bucketing.wasm_lock
+        lock_held = threading.Event()
+
+        def hold_lock():
+            with wasm_lock:
+                lock_held.set()
+                time.sleep(0.3)
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        lock_held.wait()
+
+        max_gap = 0.0
+
+        async def ticker():
+            nonlocal max_gap
+            last = time.monotonic()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                max_gap = max(max_gap, now - last)
+                last = now
+
+        ticker_task = asyncio.create_task(ticker())
+        results = await asyncio.gather(
+            *[
+                self.client.variable_value(self.test_user, "num-var", 0)
+                for _ in range(20)
+            ]
+        )
+        ticker_task.cancel()
+        holder.join()
+
+        self.assertEqual(results, [12345] * 20)
+        self.assertTrue(all(name.startswith("devcycle-eval") for name in thread_names))
+        # the loop kept running while the evaluations waited for the lock
+        self.assertLess(max_gap, 0.15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,8 @@
+import contextvars
+import json
 import logging
+import threading
+import time as time_module
 import unittest
 import uuid
 
@@ -14,6 +18,8 @@ from devcycle_python_sdk.exceptions import (
     CloudClientUnauthorizedError,
     NotFoundError,
 )
+from devcycle_python_sdk.models.eval_reason import DefaultReasonDetails
+from test.fixture.stub_servers import BucketingStubServer
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +67,18 @@ class DevCycleCloudClientTest(unittest.TestCase):
         client = DevCycleCloudClient(sdk_key, option_with_data)
         self.assertIsNotNone(client)
 
+    def test_platform_data_keeps_cached_encoding(self):
+        user = self.test_client._add_platform_data_to_user(
+            DevCycleUser(user_id="test_user_id")
+        )
+        self.assertEqual(user.platform, "Python")
+        self.assertEqual(user.sdkType, "server")
+        encoded = user.to_json_str()
+
+        # adding the same platform data again doesn't clear the cached encoding
+        self.test_client._add_platform_data_to_user(user)
+        self.assertIs(user.to_json_str(), encoded)
+
     def test_variable_bad_user(self):
         with self.assertRaises(ValueError):
             self.test_client.variable(None, "strKey", "default_value")
@@ -405,6 +423,247 @@ class DevCycleCloudClientTest(unittest.TestCase):
         # Cloud client should have null config_metadata since it's not implemented
         self.assertIsNone(context_received.config_metadata)
 
+    @patch("devcycle_python_sdk.api.bucketing_client.BucketingAPIClient._send_request")
+    def test_coalesced_requests_run_hooks_per_caller(self, mock_send_request):
+        def slow_response(*args, **kwargs):
+            time_module.sleep(0.2)
+            return {"_id": "123", "key": "numKey", "type": "Number", "value": 999}
+
+        mock_send_request.side_effect = slow_response
+        self.test_client.options.enable_request_coalescing = True
+
+        hook_calls = {"before": 0, "after": 0, "finally": 0}
+        lock = threading.Lock()
+
+        def count(name):
+            with lock:
+                hook_calls[name] += 1
+
+        self.test_client.add_hook(
+            EvalHook(
+                lambda context: count("before"),
+                lambda context, variable, metadata: count("after"),
+                lambda context, variable, metadata: count("finally"),
+                lambda context, error: None,
+            )
+        )
+
+        values = []
+        threads = [
+            threading.Thread(
+                target=lambda: values.append(
+                    self.test_client.variable_value(
+                        DevCycleUser(user_id="test_user_id"), "numKey", 42
+                    )
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_send_request.call_count, 1)
+        self.assertEqual(values, [999] * 5)
+        self.assertEqual(hook_calls, {"before": 5, "after": 5, "finally": 5})
+
+
+class DevCycleCloudClientPrefetchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = BucketingStubServer(
+            variables={
+                "string-var": {
+                    "_id": "string_var_id",
+                    "key": "string-var",
+                    "type": "String",
+                    "value": "hello",
+                },
+                "num-var": {
+                    "_id": "num_var_id",
+                    "key": "num-var",
+                    "type": "Number",
+                    "value": 12,
+                },
+            }
+        )
+        self.server.start()
+        self.client = DevCycleCloudClient(
+            "dvc_server_" + str(uuid.uuid4()),
+            DevCycleCloudOptions(
+                bucketing_api_uri=self.server.url, retry_delay=0, request_retries=0
+            ),
+        )
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_one_request_per_user_in_scope(self):
+        with self.client.prefetch_scope():
+            self.assertEqual(
+                self.client.variable_value(
+                    DevCycleUser(user_id="a"), "string-var", "default"
+                ),
+                "hello",
+            )
+            self.assertEqual(
+                self.client.variable_value(DevCycleUser(user_id="a"), "num-var", 0), 12
+            )
+            self.assertIn(
+                "num-var", self.client.all_variables(DevCycleUser(user_id="a"))
+            )
+            self.assertEqual(self.server.request_count, 1)
+
+            self.client.variable_value(DevCycleUser(user_id="b"), "num-var", 0)
+            self.assertEqual(self.server.request_count, 2)
+
+    def test_defaults_in_scope(self):
+        user = DevCycleUser(user_id="a")
+        with self.client.prefetch_scope():
+            missing = self.client.variable(user, "missing-var", "default")
+            self.assertEqual(missing.value, "default")
+            self.assertTrue(missing.isDefaulted)
+            self.assertEqual(missing.eval.details, DefaultReasonDetails.ERROR)
+
+            mismatch = self.client.variable(user, "num-var", "default")
+            self.assertEqual(mismatch.value, "default")
+            self.assertEqual(mismatch.eval.details, DefaultReasonDetails.TYPE_MISMATCH)
+
+            # the prefetched variables are not changed by callers
+            variable = self.client.variable(user, "num-var", 0)
+            variable.value = 99
+            self.assertEqual(self.client.variable_value(user, "num-var", 0), 12)
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_missing_variable_same_in_and_outside_scope(self):
+        user = DevCycleUser(user_id="a")
+        outside = self.client.variable(user, "missing-var", "default")
+        with self.client.prefetch_scope():
+            inside = self.client.variable(user, "missing-var", "default")
+        self.assertEqual(inside, outside)
+        self.assertEqual(inside.eval.details, DefaultReasonDetails.ERROR)
+
+    def test_outside_scope(self):
+        user = DevCycleUser(user_id="a")
+        self.client.variable_value(user, "string-var", "default")
+        self.client.variable_value(user, "num-var", 0)
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_scopes_do_not_share_variables(self):
+        user = DevCycleUser(user_id="a")
+        with self.client.prefetch_scope():
+            self.assertEqual(self.client.variable_value(user, "num-var", 0), 12)
+
+        self.server.variables["num-var"]["value"] = 13
+        with self.client.prefetch_scope():
+            self.assertEqual(self.client.variable_value(user, "num-var", 0), 13)
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_other_users_not_blocked_by_fetch(self):
+        route = self.server.routes[("POST", "/v1/variables")]
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_route(path, body):
+            if json.loads(body)["user_id"] == "a":
+                started.set()
+                release.wait(2)
+            return route(path, body)
+
+        self.server.routes[("POST", "/v1/variables")] = slow_route
+
+        values = []
+
+        def lookup():
+            values.append(
+                self.client.variable_value(DevCycleUser(user_id="a"), "num-var", 0)
+            )
+
+        with self.client.prefetch_scope():
+            threads = [
+                threading.Thread(target=contextvars.copy_context().run, args=(lookup,))
+                for _ in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            self.assertTrue(started.wait(1))
+
+            # user a's fetch is still in flight
+            start = time_module.monotonic()
+            self.assertEqual(
+                self.client.variable_value(DevCycleUser(user_id="b"), "num-var", 0), 12
+            )
+            self.assertLess(time_module.monotonic() - start, 1)
+
+            release.set()
+            for thread in threads:
+                thread.join(1)
+        self.assertEqual(values, [12, 12])
+        # the lookups for user a share one request
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_fetch_error_in_scope(self):
+        self.server.fail_requests = 10
+        user = DevCycleUser(user_id="a")
+        with self.client.prefetch_scope():
+            for _ in range(3):
+                variable = self.client.variable(user, "num-var", 0)
+                self.assertEqual(variable.value, 0)
+                self.assertEqual(variable.eval.details, DefaultReasonDetails.ERROR)
+        # the failed fetch is not retried for every lookup in the scope
+        self.assertEqual(self.server.request_count, 1)
+
+
+class DevCycleCloudClientMetricsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = BucketingStubServer(
+            variables={
+                "num-var": {
+                    "_id": "num_var_id",
+                    "key": "num-var",
+                    "type": "Number",
+                    "value": 12,
+                },
+            }
+        )
+        self.server.start()
+        self.client = DevCycleCloudClient(
+            "dvc_server_" + str(uuid.uuid4()),
+            DevCycleCloudOptions(
+                bucketing_api_uri=self.server.url,
+                retry_delay=0,
+                request_retries=0,
+                enable_metrics=True,
+                enable_response_cache=True,
+                enable_circuit_breaker=True,
+                enable_request_coalescing=True,
+                enable_request_hedging=True,
+            ),
+        )
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_bucketing_api_metrics(self):
+        user = DevCycleUser(user_id="a")
+        self.client.variable_value(user, "num-var", 0)
+        self.client.variable_value(user, "num-var", 0)
+
+        metrics = self.client.metrics()
+        assert metrics is not None
+        self.assertEqual(metrics["devcycle_response_cache_hits"], 1)
+        self.assertEqual(metrics["devcycle_response_cache_misses"], 1)
+        self.assertEqual(metrics["devcycle_response_cache_stale_hits"], 0)
+        self.assertEqual(metrics["devcycle_response_cache_refresh_errors"], 0)
+        self.assertEqual(metrics["devcycle_response_cache_users"], 1)
+        self.assertEqual(metrics["devcycle_bucketing_circuit_state"], 0)
+        self.assertEqual(metrics["devcycle_bucketing_circuit_opened"], 0)
+        self.assertEqual(metrics["devcycle_bucketing_requests_coalesced"], 0)
+        self.assertEqual(metrics["devcycle_bucketing_requests_hedged"], 0)
+        self.assertEqual(metrics["devcycle_bucketing_hedge_wins"], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
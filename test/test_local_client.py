@@ -212,6 +212,148 @@ class DevCycleLocalClientTest(unittest.TestCase):
             self.assertEqual(result.eval.reason, "DEFAULT")
             self.assertEqual(result.eval.details, "User Not Targeted")
 
+    @responses.activate
+    def test_variable_unknown_key(self):
+        self.options.disable_automatic_event_logging = False
+        self.options.event_flush_interval_ms = 60000
+        self.setup_client()
+
+        with patch.object(
+            LocalBucketing, "get_variable_for_user_protobuf"
+        ) as mock_evaluate:
+            result = self.client.variable(self.test_user, "badKey", "default_value")
+            mock_evaluate.assert_not_called()
+        self.assertTrue(result.isDefaulted)
+        self.assertEqual(result.eval.details, "User Not Targeted")
+
+        # the defaulted event is still queued
+        payloads = self.client.local_bucketing.flush_event_queue()
+        events = [
+            event
+            for payload in payloads
+            for record in payload.records
+            for event in record.events
+        ]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].type, "aggVariableDefaulted")
+        self.assertEqual(events[0].target, "badKey")
+
+    @responses.activate
+    def test_variable_unconditional(self):
+        # without the email target, the feature is served the same way to every user
+        responses.reset()
+        config = small_config_json()
+        config["features"][0]["configuration"]["targets"].pop(0)
+        responses.add(
+            responses.GET,
+            "http://localhost/config/v2/server/" + self.sdk_key + ".json",
+            headers={"ETag": self.test_etag},
+            json=config,
+            status=200,
+        )
+        self.setup_client()
+
+        user = DevCycleUser(user_id="1234", email="giveMeVariationOff@email.com")
+        with patch.object(
+            LocalBucketing, "get_variable_for_user_protobuf"
+        ) as mock_evaluate:
+            result = self.client.variable(user, "num-var", 0)
+            mock_evaluate.assert_not_called()
+        self.assertFalse(result.isDefaulted)
+        self.assertEqual(result.value, 12345)
+        self.assertEqual(result.eval.reason, "TARGETING_MATCH")
+        self.assertEqual(result.eval.target_id, "63125321d31c601f992288bc")
+
+        # a default value of another type is left to the WASM module
+        result = self.client.variable(user, "num-var", "default")
+        self.assertTrue(result.isDefaulted)
+
+    def _queued_evaluations(self):
+        # evaluation counts by event type, variable and variation, across the WASM and SDK aggregate events
+        counts: dict = {}
+        for payload in self.client.local_bucketing.flush_event_queue():
+            for record in payload.records:
+                for event in record.events:
+                    count_key = (
+                        event.type,
+                        event.target,
+                        event.metaData.get("_variation"),
+                    )
+                    counts[count_key] = counts.get(count_key, 0) + event.value
+        return counts
+
+    @responses.activate
+    def test_variable_evaluation_cache(self):
+        self.options.enable_evaluation_cache = True
+        self.options.disable_automatic_event_logging = False
+        self.options.event_flush_interval_ms = 60000
+        self.setup_client()
+
+        local_bucketing = self.client.local_bucketing
+        # the small config only targets on email, so these users share cache entries
+        users = [
+            DevCycleUser(user_id="1234", email="giveMeVariationOff@email.com"),
+            DevCycleUser(user_id="5678", email="giveMeVariationOff@email.com"),
+            DevCycleUser(user_id="9012", email="other@email.com", country="CA"),
+            DevCycleUser(user_id="3456", email="other@email.com"),
+        ]
+        with patch.object(
+            local_bucketing,
+            "get_variable_for_user_protobuf",
+            wraps=local_bucketing.get_variable_for_user_protobuf,
+        ) as mock_evaluate:
+            results = [self.client.variable(user, "num-var", 0) for user in users]
+            self.assertEqual(mock_evaluate.call_count, 2)
+            # the default value's type is part of the key
+            defaulted = [
+                self.client.variable(user, "num-var", "default") for user in users
+            ]
+            self.assertEqual(mock_evaluate.call_count, 4)
+
+        self.assertEqual(
+            [result.value for result in results], [67890] * 2 + [12345] * 2
+        )
+        self.assertEqual(results[0], results[1])
+        self.assertIsNot(results[0], results[1])
+        self.assertEqual(results[2], results[3])
+        self.assertTrue(all(result.isDefaulted for result in defaulted))
+        self.assertEqual(defaulted[3].defaultValue, "default")
+        cache = self.client.config_manager.evaluation_cache
+        self.assertEqual(cache.hits, 4)
+        self.assertEqual(cache.misses, 4)
+
+        # cache hits queue the same events as evaluations by the WASM module
+        self.assertEqual(
+            self._queued_evaluations(),
+            {
+                ("aggVariableEvaluated", "num-var", "62fbf6566f1ba302829f9e38"): 2,
+                ("aggVariableEvaluated", "num-var", "62fbf6566f1ba302829f9e39"): 2,
+                ("aggVariableDefaulted", "num-var", "DEFAULT"): 4,
+            },
+        )
+
+    @responses.activate
+    def test_evaluation_cache_reset(self):
+        self.options.enable_evaluation_cache = True
+        self.setup_client()
+        user = DevCycleUser(user_id="1234")
+        self.client.variable(user, "num-var", 0)
+        cache = self.client.config_manager.evaluation_cache
+        self.assertEqual(len(cache), 1)
+
+        # client custom data may change the evaluations
+        self.client.set_client_custom_data({"plan": "pro"})
+        reset_cache = self.client.config_manager.evaluation_cache
+        self.assertIsNot(reset_cache, cache)
+        self.assertEqual(len(reset_cache), 0)
+
+        # so does a new config
+        self.client.variable(user, "num-var", 0)
+        self.client.config_manager._config_etag = None
+        self.client.config_manager._get_config()
+        self.assertIsNot(self.client.config_manager.evaluation_cache, reset_cache)
+        self.assertEqual(len(self.client.config_manager.evaluation_cache), 0)
+
     @responses.activate
     def test_variable_with_bucketing(self):
         self.setup_client()
@@ -293,6 +435,61 @@ class DevCycleLocalClientTest(unittest.TestCase):
         result = self.client.all_features(user)
         self.assertEqual(result, {})
 
+    @responses.activate
+    def test_metrics_disabled(self):
+        self.setup_client()
+        self.assertIsNone(self.client.metrics())
+
+    @responses.activate
+    def test_metrics(self):
+        self.options.enable_metrics = True
+        self.setup_client()
+
+        self.client.variable(self.test_user, "string-var", "default_value")
+        self.client.variable(self.test_user, "num-var", 0)
+
+        metrics = self.client.metrics()
+        self.assertEqual(metrics["devcycle_variable_evaluation_seconds"]["count"], 2)
+        self.assertGreater(metrics["devcycle_wasm_lock_wait_seconds"]["count"], 2)
+        self.assertEqual(metrics["devcycle_config_store_seconds"]["count"], 1)
+        self.assertEqual(metrics["devcycle_config_updates"], 1)
+        self.assertEqual(metrics["devcycle_config_fetch_errors"], 0)
+        self.assertGreaterEqual(metrics["devcycle_config_age_seconds"], 0)
+        self.assertEqual(metrics["devcycle_event_queue_depth"], 0)
+
+    @responses.activate
+    def test_evaluation_profile(self):
+        self.setup_client()
+        self.assertIsNone(self.client.evaluation_profile())
+        self.client.close()
+
+        self.options.enable_evaluation_profiling = True
+        self.options.evaluation_profiling_sample_rate = 1.0
+        self.setup_client()
+        for _ in range(5):
+            self.client.variable(self.test_user, "string-var", "default_value")
+
+        profile = self.client.evaluation_profile()
+        self.assertEqual(profile["sampled_evaluations"], 5)
+        for phase in [
+            "config_metadata",
+            "before_hooks",
+            "protobuf_build",
+            "lock_wait",
+            "wasm",
+            "decode",
+            "after_hooks",
+        ]:
+            self.assertEqual(profile["phases"][phase]["count"], 5, phase)
+        self.assertAlmostEqual(
+            sum(
+                phase["share"]
+                for name, phase in profile["phases"].items()
+                if name != "total"
+            ),
+            1.0,
+        )
+
     @responses.activate
     def test_all_variables(self):
         self.setup_client()
@@ -0,0 +1,70 @@
+import json
+import logging
+import unittest
+
+from devcycle_python_sdk.util.json_fragments import (
+    parse_json_array,
+    split_json_array,
+    split_json_object,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JSONFragmentsUtilTest(unittest.TestCase):
+    def test_split_json_array(self):
+        data = '[{"a": [1, 2]}, "b", 3.5 ,null, {"c": {"d": "]"}}]'
+        fragments, end = split_json_array(data)
+        self.assertEqual(
+            fragments, ['{"a": [1, 2]}', '"b"', "3.5", "null", '{"c": {"d": "]"}}']
+        )
+        self.assertEqual(end, len(data))
+
+    def test_split_json_array_empty(self):
+        self.assertEqual(split_json_array(" [ ] "), ([], 4))
+
+    def test_split_json_array_preserves_source_text(self):
+        data = '[{"name":"\\u00e9t\\u00e9", "n": 1.0}]'
+        fragments, _ = split_json_array(data)
+        self.assertEqual(fragments, ['{"name":"\\u00e9t\\u00e9", "n": 1.0}'])
+        self.assertEqual(json.loads(fragments[0])["name"], "été")
+
+    def test_split_json_array_invalid(self):
+        with self.assertRaises(ValueError):
+            split_json_array('{"a": 1}')
+
+        with self.assertRaises(ValueError):
+            split_json_array("[1, 2")
+
+    def test_split_json_object(self):
+        data = '{"records": [{"user": {}}], "payloadId": "abc", "eventCount": 2}'
+        fragments, end = split_json_object(data)
+        self.assertEqual(
+            fragments,
+            {"records": '[{"user": {}}]', "payloadId": '"abc"', "eventCount": "2"},
+        )
+        self.assertEqual(end, len(data))
+
+    def test_split_json_object_split_arrays(self):
+        data = '{"records": [{"user": {}}, {"a": "]"}], "payloadId": "abc"}'
+        fragments, end = split_json_object(data, split_arrays=("records",))
+        self.assertEqual(
+            fragments,
+            {"records": ['{"user": {}}', '{"a": "]"}'], "payloadId": '"abc"'},
+        )
+        self.assertEqual(end, len(data))
+
+    def test_parse_json_array(self):
+        data = '[{"a": [1]}, {"a": []}]'
+        elements, end = parse_json_array(
+            data, lambda d, i: split_json_object(d, i, split_arrays=("a",))
+        )
+        self.assertEqual(elements, [{"a": ["1"]}, {"a": []}])
+        self.assertEqual(end, len(data))
+
+    def test_split_json_object_empty(self):
+        self.assertEqual(split_json_object("{}"), ({}, 2))
+
+    def test_split_json_object_invalid(self):
+        with self.assertRaises(ValueError):
+            split_json_object('{"a" 1}')